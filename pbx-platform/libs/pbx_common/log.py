@@ -0,0 +1,203 @@
+from __future__ import annotations
+
+import atexit
+import contextvars
+import json
+import logging
+import logging.handlers
+import queue
+import sys
+import time
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from typing import Any, Iterator, Optional
+
+# 비동기 로깅 공통 모듈
+#
+# 호출 측(이벤트 루프)은 QueueHandler로 레코드를 큐에 넣기만 하고,
+# 포맷/stdout 쓰기는 QueueListener 백그라운드 스레드가 한다.
+# 큐는 상한이 없는 SimpleQueue -> put이 블로킹되지 않는다.
+
+# 콜 단위 상관관계 ID (asyncio task마다 컨텍스트가 복사되므로 샤드/핸들러별로 독립)
+call_id_var: contextvars.ContextVar[Optional[str]] = contextvars.ContextVar("call_id", default=None)
+channel_id_var: contextvars.ContextVar[Optional[str]] = contextvars.ContextVar("channel_id", default=None)
+
+# LogRecord 기본 속성 (이 외의 속성은 extra로 넘긴 구조화 필드로 보고 JSON에 포함)
+_RESERVED = frozenset(vars(logging.LogRecord("", 0, "", 0, "", (), None))) | {"message", "asctime"}
+
+_listener: Optional[logging.handlers.QueueListener] = None
+
+
+def bind(call_id: Any = None, channel_id: Any = None) -> None:
+    """현재 컨텍스트(task)에 상관관계 ID 설정 (None인 값은 유지)"""
+    if call_id is not None:
+        call_id_var.set(str(call_id))
+    if channel_id is not None:
+        channel_id_var.set(str(channel_id))
+
+
+@contextmanager
+def log_context(call_id: Any = None, channel_id: Any = None) -> Iterator[None]:
+    """
+    블록 안에서만 상관관계 ID 설정 (None도 그대로 설정)
+    블록 안에서 bind()로 바꾼 값도 블록을 나가면 원래대로 돌아간다.
+    """
+    call_token = call_id_var.set(str(call_id) if call_id is not None else None)
+    channel_token = channel_id_var.set(str(channel_id) if channel_id is not None else None)
+    try:
+        yield
+    finally:
+        channel_id_var.reset(channel_token)
+        call_id_var.reset(call_token)
+
+
+class CorrelationFilter(logging.Filter):
+    """레코드에 call_id / channel_id 부착 (호출 측 스레드/컨텍스트에서 실행되어야 함)"""
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if getattr(record, "call_id", None) is None:
+            record.call_id = call_id_var.get()
+        if getattr(record, "channel_id", None) is None:
+            record.channel_id = channel_id_var.get()
+        return True
+
+
+class SamplingFilter(logging.Filter):
+    """
+    호출 위치(파일:줄)별 토큰 버킷으로 고빈도 로그를 샘플링
+    - INFO 이하만 대상, WARNING 이상은 항상 통과
+    - 버려진 건수는 다음에 통과하는 레코드의 `sampled_out` 필드로 보고
+    - exempt에 지정한 로거(와 하위 로거)는 샘플링하지 않음 (요청마다 한 줄인 access 로그 등)
+    """
+
+    def __init__(self, rate: float = 50.0, burst: int = 100, exempt: tuple[str, ...] = ()):
+        super().__init__()
+        self.rate = rate
+        self.burst = float(burst)
+        self.exempt = tuple(exempt)
+        self._buckets: dict[tuple[str, int], list[float]] = {}   # key -> [tokens, last, dropped]
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if self.rate <= 0 or record.levelno >= logging.WARNING:
+            return True
+        if self.exempt and any(record.name == n or record.name.startswith(n + ".") for n in self.exempt):
+            return True
+        key = (record.pathname, record.lineno)
+        now = time.monotonic()
+        b = self._buckets.get(key)
+        if b is None:
+            b = self._buckets[key] = [self.burst, now, 0]
+        b[0] = min(self.burst, b[0] + (now - b[1]) * self.rate)
+        b[1] = now
+        if b[0] < 1.0:
+            b[2] += 1
+            return False
+        b[0] -= 1.0
+        if b[2]:
+            record.sampled_out = int(b[2])
+            b[2] = 0
+        return True
+
+
+class JsonFormatter(logging.Formatter):
+    """한 줄 JSON (ts, level, logger, service, msg, call_id, channel_id, extra 필드, exc)"""
+
+    def __init__(self, service: str = ""):
+        super().__init__()
+        self.service = service
+
+    def format(self, record: logging.LogRecord) -> str:
+        out: dict[str, Any] = {
+            "ts": datetime.fromtimestamp(record.created, tz=timezone.utc).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "logger": record.name,
+        }
+        if self.service:
+            out["service"] = self.service
+        out["msg"] = record.getMessage()
+        for k, v in record.__dict__.items():
+            if k not in _RESERVED and v is not None:
+                out[k] = v
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            out["exc"] = record.exc_text
+        return json.dumps(out, ensure_ascii=False, default=str)
+
+
+class TextFormatter(logging.Formatter):
+    """개발용 텍스트 포맷 (상관관계 ID가 있으면 뒤에 붙인다)"""
+
+    def __init__(self):
+        super().__init__("%(asctime)s - %(levelname)s - %(message)s")
+
+    def format(self, record: logging.LogRecord) -> str:
+        line = super().format(record)
+        ids = [f"{k}={getattr(record, k)}" for k in ("call_id", "channel_id") if getattr(record, k, None)]
+        return f"{line} [{' '.join(ids)}]" if ids else line
+
+
+class _QueueHandler(logging.handlers.QueueHandler):
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # 기본 prepare는 메시지+traceback을 문자열 하나로 합친다 -> 구조 유지
+        # (args/exc_info는 스레드 경계를 넘기 전에 문자열로 확정)
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+
+def setup_logging(
+        service: str,
+        level: str = "INFO",
+        fmt: str = "json",
+        sample_rate: float = 50.0,
+        sample_burst: int = 100,
+        capture: tuple[str, ...] = (),
+        sample_exempt: tuple[str, ...] = (),
+) -> logging.handlers.QueueListener:
+    """
+    루트 로거를 QueueHandler 하나로 교체하고 stdout 리스너 스레드를 시작한다.
+    fmt: json / text, sample_rate: 호출 위치별 초당 허용 INFO 로그 수 (0이면 샘플링 안 함)
+    capture: 자체 핸들러를 가진 로거(uvicorn 등)도 같은 큐로 보내도록 핸들러 제거 후 전파
+    sample_exempt: 샘플링하지 않을 로거 이름 (uvicorn.access처럼 한 호출 위치에서 모든 요청을 남기는 로거)
+    """
+    global _listener
+    if _listener is not None:
+        return _listener
+
+    stream = logging.StreamHandler(sys.stdout)
+    stream.setFormatter(JsonFormatter(service) if fmt == "json" else TextFormatter())
+
+    q: queue.SimpleQueue = queue.SimpleQueue()
+    handler = _QueueHandler(q)
+    handler.addFilter(CorrelationFilter())
+    if sample_rate > 0:
+        handler.addFilter(SamplingFilter(sample_rate, sample_burst, exempt=sample_exempt))
+
+    root = logging.getLogger()
+    for h in list(root.handlers):
+        root.removeHandler(h)
+    root.addHandler(handler)
+    root.setLevel(level.upper())
+
+    for name in capture:
+        lg = logging.getLogger(name)
+        lg.handlers.clear()
+        lg.propagate = True
+
+    _listener = logging.handlers.QueueListener(q, stream, respect_handler_level=True)
+    _listener.start()
+    atexit.register(shutdown_logging)
+    return _listener
+
+
+def shutdown_logging() -> None:
+    """큐에 남은 레코드를 모두 쓰고 리스너 스레드 종료"""
+    global _listener
+    if _listener is None:
+        return
+    _listener.stop()
+    _listener = None
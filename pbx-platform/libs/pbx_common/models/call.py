@@ -2,7 +2,7 @@ import uuid
 from datetime import datetime
 from typing import Any, Optional
 
-from sqlalchemy import Integer, Text, BigInteger, Index, TIMESTAMP, func
+from sqlalchemy import DDL, ForeignKey, Integer, Text, BigInteger, Index, TIMESTAMP, event, func
 from sqlalchemy.dialects.postgresql import UUID as PG_UUID, JSONB
 from sqlalchemy.orm import Mapped, mapped_column
 
@@ -27,14 +27,27 @@ class Call(Base):
     hangup_cause: Mapped[Optional[int]] = mapped_column(Integer, nullable=True)
     hangup_reason: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
 
+    # 콜 종료 시 워커가 한 번 계산해 두는 지표 (리포트에서 call_events를 다시 훑지 않도록)
+    ring_ms: Mapped[Optional[int]] = mapped_column(Integer, nullable=True)      # 인입 -> 응답(미응답이면 종료)
+    talk_ms: Mapped[Optional[int]] = mapped_column(Integer, nullable=True)      # 응답 -> 종료 (미응답 0)
+    hangup_party: Mapped[Optional[str]] = mapped_column(Text, nullable=True)    # caller / callee / system
+
+    # 발신 번호로 찾은 고객 (수신 내선의 회사 기준, 못 찾으면 NULL)
+    customer_id: Mapped[Optional[int]] = mapped_column(Integer, ForeignKey("customer.id"), nullable=True)
+
     direction: Mapped[str] = mapped_column(Text, nullable=False, server_default="internal")
     status: Mapped[str] = mapped_column(Text, nullable=False, server_default="new")
 
-Index("idx_calls_created_at", Call.created_at)
+# 목록 keyset (created_at, id) 정렬/범위 조건을 한 인덱스로
+Index("idx_calls_created_at_id", Call.created_at, Call.id)
 Index("idx_calls_extens", Call.caller_exten, Call.callee_exten)
+Index("idx_calls_customer_id", Call.customer_id)
 
 class CallEvent(Base):
     __tablename__ = "call_events"
+    # created_at 기준 월별 range 파티션 (파티션 생성/보존 정책: services/api/manage_partitions.py)
+    # 파티션 테이블의 PK는 파티션 키를 포함해야 하므로 (id, created_at)
+    __table_args__ = {"postgresql_partition_by": "RANGE (created_at)"}
 
     id: Mapped[int] = mapped_column(BigInteger, primary_key=True, autoincrement=True)
 
@@ -44,10 +57,17 @@ class CallEvent(Base):
     channel_id: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
     bridge_id: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
     raw: Mapped[dict[str, Any]] = mapped_column(JSONB, nullable=False)
-    created_at: Mapped[datetime] = mapped_column(TIMESTAMP(timezone=True),nullable=False,server_default=func.now())
+    created_at: Mapped[datetime] = mapped_column(TIMESTAMP(timezone=True), primary_key=True, nullable=False, server_default=func.now())
 
 Index("idx_call_events_call_id", CallEvent.call_id)
-Index("idx_call_events_ts", CallEvent.ts)
-Index("idx_call_events_type", CallEvent.type)
-Index("idx_call_events_channel_id", CallEvent.channel_id)
+# 시간 컬럼은 적재 순서와 거의 일치 -> B-tree 대신 작은 BRIN
+Index("idx_call_events_ts_brin", CallEvent.ts, postgresql_using="brin")
+Index("idx_call_events_created_at_brin", CallEvent.created_at, postgresql_using="brin")
+
+# create_all로 만든 경우에도 적재가 가능하도록 DEFAULT 파티션을 같이 만든다
+event.listen(
+    CallEvent.__table__,
+    "after_create",
+    DDL("CREATE TABLE IF NOT EXISTS call_events_default PARTITION OF call_events DEFAULT"),
+)
 
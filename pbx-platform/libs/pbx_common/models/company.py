@@ -36,4 +36,5 @@ class Company(Base):
     queues: Mapped[list["Queue"]] = relationship("Queue", back_populates="company")
     
 Index("idx_company_name", Company.company_name)
+Index("idx_company_name_trgm", Company.company_name, postgresql_using="gin", postgresql_ops={"company_name": "gin_trgm_ops"})
 Index("idx_company_is_active", Company.is_active)
\ No newline at end of file
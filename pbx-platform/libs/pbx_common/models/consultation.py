@@ -66,6 +66,6 @@ Index("idx_consultations_call_id",     Consultation.call_id)
 Index("idx_consultations_agent_id",    Consultation.agent_id)
 Index("idx_consultations_company_id",  Consultation.company_id)
 Index("idx_consultations_status",      Consultation.status)
-Index("idx_consultations_created_at",  Consultation.created_at)
+Index("idx_consultations_created_at_id", Consultation.created_at, Consultation.id)
 Index("idx_consultations_original_id", Consultation.original_id)
 Index("idx_consultations_category_id", Consultation.category_id)
\ No newline at end of file
@@ -23,6 +23,8 @@ class Customer(Base):
     company_id: Mapped[Optional[int]] = mapped_column(Integer, ForeignKey("company.id"), nullable=False)
     name: Mapped[str] = mapped_column(Text, nullable=False)
     phone: Mapped[str] = mapped_column(Text, nullable=False)
+    # 조회 키: 숫자만 + 국가 코드 (pbx_common.utils.phone.normalize_phone), 번호로 볼 수 없으면 NULL
+    phone_norm: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
     email: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
     group: Mapped[CustomerGroup] = mapped_column(
         Enum(CustomerGroup, native_enum=False),
@@ -46,3 +48,21 @@ Index("idx_customer_name", Customer.name)
 Index("idx_customer_phone", Customer.phone)
 Index("idx_customer_group", Customer.group)
 Index("idx_customer_is_active", Customer.is_active)
+Index("idx_customer_company_id", Customer.company_id)
+# 활성 고객 최신순 keyset (created_at, id)
+Index(
+    "idx_customer_active_created_at_id",
+    Customer.created_at,
+    Customer.id,
+    postgresql_where=(Customer.is_active == True),
+)
+# 회사별 전화번호 -> 고객 1건 (활성 고객만, 비활성 고객은 같은 번호로 재등록 가능)
+Index(
+    "uq_customer_company_phone_norm",
+    Customer.company_id,
+    Customer.phone_norm,
+    unique=True,
+    postgresql_where=(Customer.is_active == True) & Customer.phone_norm.isnot(None),
+)
+Index("idx_customer_name_trgm", Customer.name, postgresql_using="gin", postgresql_ops={"name": "gin_trgm_ops"})
+# 숫자만 남긴 전화번호 trigram 인덱스(idx_customer_phone_digits_trgm)는 식 인덱스라 마이그레이션에서만 생성
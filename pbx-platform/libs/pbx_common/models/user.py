@@ -44,6 +44,8 @@ class User(Base):
     
     role: Mapped[UserRole] = mapped_column(Enum(UserRole, native_enum=False), nullable=False, server_default="A")
     is_active: Mapped[bool] = mapped_column(Boolean, nullable=False, server_default="true")
+    # 권한 할당이 바뀔 때마다 +1 (토큰의 pv 클레임과 다르면 재로그인 필요)
+    perm_version: Mapped[int] = mapped_column(Integer, nullable=False, server_default="0")
     
     created_at: Mapped[datetime] = mapped_column(TIMESTAMP(timezone=True), nullable=False, server_default=func.now())
     updated_at: Mapped[datetime] = mapped_column(TIMESTAMP(timezone=True), nullable=True, server_default=func.now(), onupdate=func.now())
@@ -57,6 +59,8 @@ Index("idx_user_account", User.account)
 Index("idx_user_exten", User.exten)
 Index("idx_user_is_active", User.is_active)
 Index("idx_user_role", User.role)
+# 회사별 사용자 목록 keyset (id 오름차순)
+Index("idx_user_company_id_id", User.company_id, User.id)
 
 
 class UserStatus(Base):
@@ -0,0 +1,34 @@
+import pytest
+
+from pbx_common.utils.phone import normalize_phone
+
+
+@pytest.mark.parametrize(
+    "phone, expected",
+    [
+        ("010-1234-5678", "821012345678"),
+        ("+82 10-1234-5678", "821012345678"),
+        ("0082-10-1234-5678", "821012345678"),
+        ("821012345678", "821012345678"),
+        ("02-123-4567", "8221234567"),
+        ("+82 2-123-4567", "8221234567"),
+    ],
+)
+def test_normalize_phone_mobile_and_landline(phone, expected):
+    assert normalize_phone(phone) == expected
+
+
+@pytest.mark.parametrize("phone", ["1588-1234", "15881234", "+82 1588-1234", "+8215881234", "0082-1588-1234", "8215881234"])
+def test_normalize_phone_representative_number_has_one_form(phone):
+    # 앞자리 0이 없는 대표번호도 표기와 관계없이 같은 키
+    assert normalize_phone(phone) == "8215881234"
+
+
+@pytest.mark.parametrize("phone", [None, "", "   ", "100", "1234-56"])
+def test_normalize_phone_rejects_short_numbers(phone):
+    assert normalize_phone(phone) is None
+
+
+def test_normalize_phone_keeps_foreign_numbers():
+    assert normalize_phone("+1 415-555-0100") == "14155550100"
+    assert normalize_phone("001-415-555-0100") == "14155550100"
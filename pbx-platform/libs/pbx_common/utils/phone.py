@@ -0,0 +1,47 @@
+import re
+from typing import Optional
+
+# 국내 번호의 국가 코드 (앞자리 0 -> 82)
+DEFAULT_COUNTRY_CODE = "82"
+
+# 이보다 짧은 번호(내선 등)는 고객 번호로 보지 않는다
+MIN_DIGITS = 7
+
+# 앞자리 0을 뺀 국내 번호의 최소 길이 (1588-1234, 2-123-4567 등)
+_MIN_NATIONAL_DIGITS = 8
+
+_NON_DIGITS = re.compile(r"[^0-9]")
+
+
+def normalize_phone(phone: Optional[str], country_code: str = DEFAULT_COUNTRY_CODE) -> Optional[str]:
+    """
+    전화번호 -> 국가 코드를 포함한 숫자열 (고객 조회 키)
+
+        010-1234-5678     -> 821012345678
+        +82 10-1234-5678  -> 821012345678
+        0082-10-1234-5678 -> 821012345678
+        821012345678      -> 821012345678  (+ 없이 국가 코드로 시작)
+        1588-1234         -> 8215881234    (앞자리 0이 없는 국내 번호도 국가 코드를 붙인다)
+        +82 1588-1234     -> 8215881234
+        100               -> None          (내선)
+    """
+    if not phone:
+        return None
+    text = phone.strip()
+    digits = _NON_DIGITS.sub("", text)
+    if len(digits) < MIN_DIGITS:
+        return None
+
+    # +82..., 0082... : 이미 국가 코드가 있는 국제 표기
+    if text.startswith("+"):
+        return digits
+    if digits.startswith("00"):
+        return digits[2:]
+    # 0으로 시작하는 국내 번호 -> 앞자리 0을 국가 코드로
+    if digits.startswith("0"):
+        return country_code + digits[1:]
+    # + 없이 국가 코드부터 온 번호 (국가 코드 + 국내 번호 8자리 이상)
+    if digits.startswith(country_code) and len(digits) >= len(country_code) + _MIN_NATIONAL_DIGITS:
+        return digits
+    # 앞자리 0이 없는 국내 번호 (1588-1234 같은 대표번호)
+    return country_code + digits
@@ -34,6 +34,13 @@ if not db_url:
 config.set_main_option("sqlalchemy.url", db_url)
 
 
+def include_object(object, name, type_, reflected, compare_to):
+    """autogenerate 제외: manage_partitions.py가 관리하는 call_events 파티션 테이블"""
+    if type_ == "table" and reflected and compare_to is None and name.startswith("call_events_"):
+        return False
+    return True
+
+
 def run_migrations_offline() -> None:
     """오프라인 모드: DB 연결 없이 SQL 스크립트만 생성"""
     url = config.get_main_option("sqlalchemy.url")
@@ -42,13 +49,18 @@ def run_migrations_offline() -> None:
         target_metadata=target_metadata,
         literal_binds=True,
         dialect_opts={"paramstyle": "named"},
+        include_object=include_object,
     )
     with context.begin_transaction():
         context.run_migrations()
 
 
 def do_run_migrations(connection: Connection) -> None:
-    context.configure(connection=connection, target_metadata=target_metadata)
+    context.configure(
+        connection=connection,
+        target_metadata=target_metadata,
+        include_object=include_object,
+    )
     with context.begin_transaction():
         context.run_migrations()
 
@@ -0,0 +1,37 @@
+"""add per-call metrics (ring_ms, talk_ms, hangup_party) to calls
+
+Revision ID: add_call_metrics
+Revises: partition_call_events
+Create Date: 2026-04-09
+"""
+from typing import Sequence, Union
+from alembic import op
+import sqlalchemy as sa
+
+revision: str = 'add_call_metrics'
+down_revision: Union[str, None] = 'partition_call_events'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column('calls', sa.Column('ring_ms',      sa.Integer(), nullable=True))
+    op.add_column('calls', sa.Column('talk_ms',      sa.Integer(), nullable=True))
+    op.add_column('calls', sa.Column('hangup_party', sa.Text(),    nullable=True))
+
+    # 기존 종료 콜은 시각 컬럼으로 채운다 (종료 주체는 알 수 없으므로 NULL 유지)
+    op.execute("""
+        UPDATE calls SET
+            ring_ms = GREATEST(0, (EXTRACT(EPOCH FROM (COALESCE(answered_at, ended_at) - started_at)) * 1000)::int),
+            talk_ms = CASE
+                WHEN answered_at IS NULL THEN 0
+                ELSE GREATEST(0, (EXTRACT(EPOCH FROM (ended_at - answered_at)) * 1000)::int)
+            END
+        WHERE ended_at IS NOT NULL AND started_at IS NOT NULL
+    """)
+
+
+def downgrade() -> None:
+    op.drop_column('calls', 'hangup_party')
+    op.drop_column('calls', 'talk_ms')
+    op.drop_column('calls', 'ring_ms')
@@ -0,0 +1,59 @@
+"""add customer.phone_norm (unique per company) and calls.customer_id
+
+Revision ID: add_customer_phone_norm
+Revises: add_customer_search_indexes
+Create Date: 2026-04-23
+"""
+from typing import Sequence, Union
+from alembic import op
+import sqlalchemy as sa
+
+revision: str = 'add_customer_phone_norm'
+down_revision: Union[str, None] = 'add_customer_search_indexes'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column('customer', sa.Column('phone_norm', sa.Text(), nullable=True))
+    op.add_column('calls', sa.Column('customer_id', sa.Integer(), sa.ForeignKey('customer.id'), nullable=True))
+    op.create_index('idx_calls_customer_id', 'calls', ['customer_id'])
+
+    # 기존 고객 채우기 - pbx_common.utils.phone.normalize_phone 과 같은 규칙
+    op.execute("""
+        UPDATE customer c SET phone_norm = CASE
+            WHEN length(d.digits) < 7 THEN NULL
+            WHEN btrim(c.phone) LIKE '+%' THEN d.digits
+            WHEN d.digits LIKE '00%' THEN substr(d.digits, 3)
+            WHEN d.digits LIKE '0%' THEN '82' || substr(d.digits, 2)
+            WHEN d.digits LIKE '82%' AND length(d.digits) >= 10 THEN d.digits
+            ELSE '82' || d.digits
+        END
+        FROM (SELECT id, regexp_replace(phone, '[^0-9]', '', 'g') AS digits FROM customer) d
+        WHERE d.id = c.id
+    """)
+
+    # 같은 회사에 같은 번호의 활성 고객이 여럿이면 가장 먼저 등록된 고객만 키를 가진다
+    op.execute("""
+        UPDATE customer SET phone_norm = NULL
+        WHERE id IN (
+            SELECT id FROM (
+                SELECT id, row_number() OVER (PARTITION BY company_id, phone_norm ORDER BY id) AS rn
+                FROM customer
+                WHERE is_active AND phone_norm IS NOT NULL
+            ) dup
+            WHERE dup.rn > 1
+        )
+    """)
+
+    op.create_index(
+        'uq_customer_company_phone_norm', 'customer', ['company_id', 'phone_norm'],
+        unique=True, postgresql_where=sa.text('is_active = true AND phone_norm IS NOT NULL'),
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('uq_customer_company_phone_norm', table_name='customer')
+    op.drop_index('idx_calls_customer_id', table_name='calls')
+    op.drop_column('calls', 'customer_id')
+    op.drop_column('customer', 'phone_norm')
@@ -0,0 +1,37 @@
+"""add pg_trgm indexes for customer search
+
+Revision ID: add_customer_search_indexes
+Revises: add_user_perm_version
+Create Date: 2026-04-20
+"""
+from typing import Sequence, Union
+from alembic import op
+import sqlalchemy as sa
+
+revision: str = 'add_customer_search_indexes'
+down_revision: Union[str, None] = 'add_user_perm_version'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+
+    # 이름 / 숫자만 남긴 전화번호 부분 일치 (ILIKE '%...%') + similarity 정렬
+    # 전화번호 식은 routes/customer.py 의 PHONE_DIGITS 와 같아야 한다
+    op.execute("CREATE INDEX IF NOT EXISTS idx_customer_name_trgm ON customer USING gin (name gin_trgm_ops)")
+    op.execute(
+        "CREATE INDEX IF NOT EXISTS idx_customer_phone_digits_trgm ON customer "
+        "USING gin (regexp_replace(phone, '[^0-9]', '', 'g') gin_trgm_ops)"
+    )
+    op.execute("CREATE INDEX IF NOT EXISTS idx_company_name_trgm ON company USING gin (company_name gin_trgm_ops)")
+
+    # 회사명 일치 -> company_id IN (...) 조건용
+    op.create_index('idx_customer_company_id', 'customer', ['company_id'])
+
+
+def downgrade() -> None:
+    op.drop_index('idx_customer_company_id', table_name='customer')
+    op.execute("DROP INDEX IF EXISTS idx_company_name_trgm")
+    op.execute("DROP INDEX IF EXISTS idx_customer_phone_digits_trgm")
+    op.execute("DROP INDEX IF EXISTS idx_customer_name_trgm")
@@ -0,0 +1,41 @@
+"""add (sort column, id) composite indexes for keyset pagination
+
+Revision ID: add_keyset_indexes
+Revises: add_customer_phone_norm
+Create Date: 2026-04-27
+"""
+from typing import Sequence, Union
+from alembic import op
+import sqlalchemy as sa
+
+revision: str = 'add_keyset_indexes'
+down_revision: Union[str, None] = 'add_customer_phone_norm'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # 목록 API: ORDER BY (created_at, id) DESC + WHERE (created_at, id) < (커서)
+    # 단일 created_at 인덱스는 복합 인덱스가 대신한다
+    op.create_index('idx_calls_created_at_id', 'calls', ['created_at', 'id'])
+    op.execute("DROP INDEX IF EXISTS idx_calls_created_at")
+
+    op.create_index('idx_consultations_created_at_id', 'consultations', ['created_at', 'id'])
+    op.execute("DROP INDEX IF EXISTS idx_consultations_created_at")
+
+    op.create_index(
+        'idx_customer_active_created_at_id', 'customer', ['created_at', 'id'],
+        postgresql_where=sa.text('is_active = true'),
+    )
+
+    # 사용자 목록: 회사 필터 + id 오름차순
+    op.create_index('idx_user_company_id_id', 'user', ['company_id', 'id'])
+
+
+def downgrade() -> None:
+    op.drop_index('idx_user_company_id_id', table_name='user')
+    op.drop_index('idx_customer_active_created_at_id', table_name='customer')
+    op.create_index('idx_consultations_created_at', 'consultations', ['created_at'])
+    op.drop_index('idx_consultations_created_at_id', table_name='consultations')
+    op.create_index('idx_calls_created_at', 'calls', ['created_at'])
+    op.drop_index('idx_calls_created_at_id', table_name='calls')
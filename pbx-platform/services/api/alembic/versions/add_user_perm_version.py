@@ -0,0 +1,23 @@
+"""add user.perm_version (permission claim version in access tokens)
+
+Revision ID: add_user_perm_version
+Revises: add_call_metrics
+Create Date: 2026-04-16
+"""
+from typing import Sequence, Union
+from alembic import op
+import sqlalchemy as sa
+
+revision: str = 'add_user_perm_version'
+down_revision: Union[str, None] = 'add_call_metrics'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # 권한 할당 시 +1 -> 이전 버전으로 발급된 토큰은 거부
+    op.add_column('user', sa.Column('perm_version', sa.Integer(), nullable=False, server_default='0'))
+
+
+def downgrade() -> None:
+    op.drop_column('user', 'perm_version')
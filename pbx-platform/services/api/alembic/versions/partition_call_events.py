@@ -0,0 +1,116 @@
+"""partition call_events by month (created_at) with BRIN time indexes
+
+Revision ID: partition_call_events
+Revises: add_consult_tables
+Create Date: 2026-04-02
+"""
+from datetime import date
+from typing import Sequence, Union
+from alembic import op
+import sqlalchemy as sa
+
+revision: str = 'partition_call_events'
+down_revision: Union[str, None] = 'add_consult_tables'
+branch_labels = None
+depends_on = None
+
+# 마이그레이션 시점 이후로 미리 만들어 둘 월 파티션 수
+# (이후로는 manage_partitions.py ensure 를 주기적으로 실행)
+MONTHS_AHEAD = 3
+
+_COLUMNS = "id, call_id, ts, type, channel_id, bridge_id, raw, created_at"
+
+
+def _add_months(d: date, n: int) -> date:
+    y, m = divmod(d.month - 1 + n, 12)
+    return date(d.year + y, m + 1, 1)
+
+
+def upgrade() -> None:
+    conn = op.get_bind()
+
+    # 1. 기존 테이블을 옆으로 치우고 인덱스/PK 이름을 비워둔다
+    op.execute("ALTER TABLE call_events RENAME TO call_events_legacy")
+    op.execute("ALTER INDEX call_events_pkey RENAME TO call_events_legacy_pkey")
+    for name in (
+        'idx_call_events_call_id',
+        'idx_call_events_ts',
+        'idx_call_events_type',
+        'idx_call_events_channel_id',
+    ):
+        op.execute(f"DROP INDEX IF EXISTS {name}")
+
+    # 2. 파티션 부모 테이블 (PK에 파티션 키 포함, id 시퀀스는 기존 것을 이어서 사용)
+    op.execute("""
+        CREATE TABLE call_events (
+            id          BIGINT NOT NULL DEFAULT nextval('call_events_id_seq'),
+            call_id     UUID,
+            ts          TIMESTAMPTZ,
+            type        TEXT,
+            channel_id  TEXT,
+            bridge_id   TEXT,
+            raw         JSONB NOT NULL,
+            created_at  TIMESTAMPTZ NOT NULL DEFAULT now(),
+            CONSTRAINT call_events_pkey PRIMARY KEY (id, created_at)
+        ) PARTITION BY RANGE (created_at)
+    """)
+    op.execute("ALTER SEQUENCE call_events_id_seq OWNED BY call_events.id")
+
+    # 3. 기존 데이터의 첫 달부터 MONTHS_AHEAD 개월 뒤까지 월 파티션 + DEFAULT 파티션
+    oldest = conn.execute(sa.text("SELECT min(created_at)::date FROM call_events_legacy")).scalar()
+    this_month = date.today().replace(day=1)
+    month = (oldest or this_month).replace(day=1)
+    last = _add_months(this_month, MONTHS_AHEAD)
+    while month <= last:
+        nxt = _add_months(month, 1)
+        op.execute(
+            f"CREATE TABLE call_events_p{month:%Y%m} PARTITION OF call_events "
+            f"FOR VALUES FROM ('{month.isoformat()}') TO ('{nxt.isoformat()}')"
+        )
+        month = nxt
+    op.execute("CREATE TABLE call_events_default PARTITION OF call_events DEFAULT")
+
+    # 4. 인덱스 (부모에 만들면 모든 파티션에 전파)
+    #    ts/created_at은 적재 순서와 거의 일치 -> B-tree 대신 BRIN
+    #    type/channel_id 단독 조회는 없으므로 B-tree를 다시 만들지 않는다
+    op.create_index('idx_call_events_call_id', 'call_events', ['call_id'])
+    op.create_index('idx_call_events_ts_brin', 'call_events', ['ts'], postgresql_using='brin')
+    op.create_index('idx_call_events_created_at_brin', 'call_events', ['created_at'], postgresql_using='brin')
+
+    # 5. 데이터 이관 후 기존 테이블 제거
+    op.execute(f"INSERT INTO call_events ({_COLUMNS}) SELECT {_COLUMNS} FROM call_events_legacy")
+    op.execute("DROP TABLE call_events_legacy")
+
+
+def downgrade() -> None:
+    op.execute("ALTER TABLE call_events RENAME TO call_events_partitioned")
+    op.execute("ALTER INDEX call_events_pkey RENAME TO call_events_partitioned_pkey")
+    for name in (
+        'idx_call_events_call_id',
+        'idx_call_events_ts_brin',
+        'idx_call_events_created_at_brin',
+    ):
+        op.execute(f"DROP INDEX IF EXISTS {name}")
+
+    op.execute("""
+        CREATE TABLE call_events (
+            id          BIGINT NOT NULL DEFAULT nextval('call_events_id_seq'),
+            call_id     UUID,
+            ts          TIMESTAMPTZ,
+            type        TEXT,
+            channel_id  TEXT,
+            bridge_id   TEXT,
+            raw         JSONB NOT NULL,
+            created_at  TIMESTAMPTZ NOT NULL DEFAULT now(),
+            CONSTRAINT call_events_pkey PRIMARY KEY (id)
+        )
+    """)
+    op.execute("ALTER SEQUENCE call_events_id_seq OWNED BY call_events.id")
+    op.execute(f"INSERT INTO call_events ({_COLUMNS}) SELECT {_COLUMNS} FROM call_events_partitioned")
+    # 파티션은 부모와 함께 삭제된다
+    op.execute("DROP TABLE call_events_partitioned")
+
+    op.create_index('idx_call_events_call_id',    'call_events', ['call_id'])
+    op.create_index('idx_call_events_ts',         'call_events', ['ts'])
+    op.create_index('idx_call_events_type',       'call_events', ['type'])
+    op.create_index('idx_call_events_channel_id', 'call_events', ['channel_id'])
@@ -18,6 +18,15 @@ class Settings(BaseSettings):
     api_title: str = "PBX API"
     api_version: str = "0.1.0"
 
+    # 인증 사용자 캐시 (요청마다 사용자/권한 조회를 하지 않도록)
+    principal_cache_ttl_sec: int = 30       # 다른 API 프로세스의 변경이 반영되는 최대 지연 (0이면 캐시 안 함)
+    principal_cache_size: int = 10000       # LRU 상한
+
+    # 로깅 (QueueHandler -> 백그라운드 리스너)
+    log_level: str = "INFO"
+    log_format: str = "json"    # json / text
+    log_sample_rate: int = 50   # 호출 위치별 초당 INFO 로그 상한 (0이면 샘플링 안 함)
+
     # 설정: .env  파일 위치 지정
     model_config = SettingsConfigDict(env_file="../../.env", env_file_encoding="utf-8", extra="ignore")
 
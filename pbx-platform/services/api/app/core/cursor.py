@@ -0,0 +1,60 @@
+import base64
+import json
+import uuid
+from datetime import datetime
+from typing import Any, Callable, List, Optional, Sequence, Tuple
+
+from fastapi import HTTPException, status
+from sqlalchemy import tuple_
+from sqlalchemy.sql.elements import ColumnElement
+
+
+# keyset 페이지네이션 커서: 마지막 행의 정렬 키 값들을 base64url(JSON)로 감싼 불투명 문자열
+
+def encode_cursor(*values: Any) -> str:
+    raw = [
+        v.isoformat() if isinstance(v, datetime) else str(v) if isinstance(v, uuid.UUID) else v
+        for v in values
+    ]
+    return base64.urlsafe_b64encode(json.dumps(raw, separators=(",", ":")).encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: Optional[str], *types: Callable[[Any], Any]) -> Optional[List[Any]]:
+    """
+    커서 -> 정렬 키 값 목록 (types 순서대로 변환, datetime은 ISO 문자열에서, UUID는 문자열에서 복원)
+    형식이 맞지 않으면 400
+    """
+    if not cursor:
+        return None
+    try:
+        raw = json.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+        if not isinstance(raw, list) or len(raw) != len(types):
+            raise ValueError(cursor)
+        return [
+            datetime.fromisoformat(v) if t is datetime else t(v)
+            for t, v in zip(types, raw)
+        ]
+    except (ValueError, TypeError):
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="유효하지 않은 커서입니다.")
+
+
+def paginate(rows: Sequence[Any], limit: int, key: Callable[[Any], Sequence[Any]]) -> Tuple[List[Any], Optional[str]]:
+    """
+    limit + 1건을 조회한 결과 -> (limit건, 다음 커서)
+    한 건 더 있으면 다음 페이지가 있는 것으로 보고 마지막 반환 행 기준 커서를 만든다.
+    """
+    items = list(rows[:limit])
+    if len(rows) <= limit:
+        return items, None
+    return items, encode_cursor(*key(items[-1]))
+
+
+def keyset_after(columns: Sequence[Any], after: Optional[Sequence[Any]], descending: bool = True) -> Optional[ColumnElement]:
+    """
+    커서 다음 행 조건: (정렬 컬럼, id) 행 비교
+    (created_at, id) < (:a, :b) 형태라 같은 순서의 복합 인덱스에서 범위 탐색으로 풀린다.
+    """
+    if after is None:
+        return None
+    left, right = tuple_(*columns), tuple_(*after)
+    return left < right if descending else left > right
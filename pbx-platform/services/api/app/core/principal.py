@@ -0,0 +1,196 @@
+import time
+from collections import OrderedDict
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy import select
+
+from pbx_common.models import User, UserRole, Permission
+from app.core.config import get_settings
+from app.db.session import AsyncSessionLocal
+
+
+# --- 권한 비트맵 (JWT pm 클레임) ---
+# 권한 코드 -> 비트 위치는 permissions.id (삭제는 비활성화뿐이라 id가 재사용되지 않음)
+
+def encode_permission_bits(permission_ids: Iterable[int]) -> str:
+    """권한 id 목록 -> 16진수 비트맵 문자열"""
+    bits = 0
+    for pid in permission_ids:
+        bits |= 1 << pid
+    return format(bits, "x")
+
+
+def decode_permission_bits(value: Optional[str]) -> Optional[int]:
+    if not isinstance(value, str):
+        return None
+    try:
+        return int(value, 16) if value else 0
+    except ValueError:
+        return None
+
+
+class PermissionCatalog:
+    """
+    권한 코드 -> 비트 마스크 (permissions 테이블 전체, TTL)
+    템플릿 변경 시 clear()로 다시 읽는다.
+    """
+
+    def __init__(self, ttl: float = 30.0):
+        self.ttl = ttl
+        self._ids: Dict[str, int] = {}
+        self._expires = 0.0
+
+    async def _ensure(self) -> None:
+        if self._expires >= time.monotonic():
+            return
+        async with AsyncSessionLocal() as db:
+            result = await db.execute(select(Permission.code, Permission.id))
+            self._ids = {code: pid for code, pid in result.all()}
+        self._expires = time.monotonic() + self.ttl
+
+    async def mask(self, codes: Iterable[str]) -> Tuple[int, bool]:
+        """(코드들의 비트 OR, 모든 코드가 존재하는지)"""
+        await self._ensure()
+        mask, known = 0, True
+        for code in codes:
+            pid = self._ids.get(code)
+            if pid is None:
+                known = False
+            else:
+                mask |= 1 << pid
+        return mask, known
+
+    async def codes(self, bits: int) -> List[str]:
+        """비트맵 -> 권한 코드 목록"""
+        await self._ensure()
+        return sorted(code for code, pid in self._ids.items() if bits >> pid & 1)
+
+    def clear(self) -> None:
+        self._expires = 0.0
+
+
+class Principal:
+    """인증된 사용자의 권한 판단에 필요한 최소 정보 (요청마다 User 행을 읽지 않기 위한 캐시 단위)"""
+
+    __slots__ = ("id", "is_active", "role", "company_id", "perm_version", "perm_bits")
+
+    def __init__(
+        self,
+        id: int,
+        is_active: bool,
+        role: UserRole,
+        company_id: Optional[int],
+        perm_version: int,
+        perm_bits: int = 0,
+    ):
+        self.id = id
+        self.is_active = is_active
+        self.role = role
+        self.company_id = company_id
+        self.perm_version = perm_version
+        # 토큰의 pm 클레임 (요청마다 with_bits로 채운다)
+        self.perm_bits = perm_bits
+
+    def with_bits(self, perm_bits: int) -> "Principal":
+        return Principal(self.id, self.is_active, self.role, self.company_id, self.perm_version, perm_bits)
+
+    async def has_permission(self, code: str) -> bool:
+        # SYSTEM_ADMIN은 모든 권한을 보유한것으로 간주함
+        if self.role == UserRole.S:
+            return True
+        mask, known = await permission_catalog.mask((code,))
+        return known and bool(self.perm_bits & mask)
+
+    def __repr__(self) -> str:
+        return f"Principal(id={self.id}, role={self.role}, company_id={self.company_id}, active={self.is_active})"
+
+
+class PrincipalCache:
+    """
+    user_id -> Principal (프로세스 내 TTL + LRU)
+
+    사용자/권한 변경 API가 invalidate()로 즉시 비우고,
+    다른 API 프로세스의 변경은 TTL이 지나면 반영된다.
+    조회 도중 invalidate가 일어나면 읽어온 값은 넣지 않는다 (epoch 비교).
+    """
+
+    def __init__(self, ttl: float = 30.0, max_size: int = 10000):
+        self.ttl = ttl
+        self.max_size = max_size
+        self._entries: "OrderedDict[int, tuple[Principal, float]]" = OrderedDict()
+        self.epoch = 0
+
+        # 메트릭
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, user_id: int) -> Optional[Principal]:
+        hit = self._entries.get(user_id)
+        if hit is None or hit[1] < time.monotonic():
+            self.misses += 1
+            return None
+        self._entries.move_to_end(user_id)
+        self.hits += 1
+        return hit[0]
+
+    def put(self, principal: Principal, epoch: int) -> None:
+        if self.ttl <= 0 or epoch != self.epoch:
+            return
+        self._entries[principal.id] = (principal, time.monotonic() + self.ttl)
+        self._entries.move_to_end(principal.id)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
+    def invalidate(self, *user_ids: int) -> None:
+        self.epoch += 1
+        for user_id in user_ids:
+            self._entries.pop(user_id, None)
+
+    def clear(self) -> None:
+        """전체 무효화"""
+        self.epoch += 1
+        self._entries.clear()
+
+    def stats(self) -> dict:
+        return {"size": len(self._entries), "hits": self.hits, "misses": self.misses}
+
+
+_settings = get_settings()
+principal_cache = PrincipalCache(ttl=_settings.principal_cache_ttl_sec, max_size=_settings.principal_cache_size)
+permission_catalog = PermissionCatalog(ttl=_settings.principal_cache_ttl_sec)
+
+
+async def load_principal(user_id: int) -> Optional[Principal]:
+    """캐시 우선, 없으면 사용자 행의 권한 판단 컬럼만 읽어 채운다 (권한 코드는 토큰에 있음)"""
+    principal = principal_cache.get(user_id)
+    if principal is not None:
+        return principal
+
+    epoch = principal_cache.epoch
+    async with AsyncSessionLocal() as db:
+        result = await db.execute(
+            select(User.id, User.is_active, User.role, User.company_id, User.perm_version)
+            .where(User.id == user_id)
+        )
+        row = result.first()
+
+    if row is None:
+        return None
+    principal = Principal(row[0], row[1], row[2], row[3], row[4])
+    principal_cache.put(principal, epoch)
+    return principal
+
+
+async def authenticate(payload: dict) -> Optional[Principal]:
+    """
+    JWT payload -> 요청 단위 Principal
+    토큰의 권한 버전(pv)이 현재 사용자 버전과 다르면 (권한 재할당 이후 발급 전 토큰) None
+    """
+    user_id = payload.get("id")
+    perm_bits = decode_permission_bits(payload.get("pm"))
+    if user_id is None or perm_bits is None:
+        return None
+    principal = await load_principal(user_id)
+    if principal is None or payload.get("pv") != principal.perm_version:
+        return None
+    return principal.with_bits(perm_bits)
@@ -1,20 +1,17 @@
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
-from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
 from typing import Optional, List
 
 from pbx_common.utils.security import decode_access_token 
-from pbx_common.models import User, UserRole, Permission, UserPermission
-from app.db.session import get_db
+from pbx_common.models import UserRole
+from app.core.principal import Principal, decode_permission_bits, load_principal, permission_catalog
 
 # 로그인 경로 설정
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/api/v1/auth/login")
 
 async def get_current_user(
     token: str = Depends(oauth2_scheme),
-    db: AsyncSession = Depends(get_db)
-) -> User:
+) -> Principal:
     
     # 1. 토큰 해석
     payload = decode_access_token(token)
@@ -34,8 +31,8 @@ async def get_current_user(
             detail="인증 정보를 찾을 수 없습니다.",
         )
 
-    # 3. DB에서 사용자 조회
-    user = await db.get(User, user_id)
+    # 3. 사용자 조회 (캐시 적중 시 DB 조회 없음)
+    user = await load_principal(user_id)
     
     if user is None:
         raise HTTPException(
@@ -43,14 +40,23 @@ async def get_current_user(
             detail="사용자를 찾을 수 없습니다.",
         )
     
-    # 4. 비활성화된 계정 체크
+    # 4. 권한 버전 체크 (권한이 다시 할당된 뒤에는 이전 토큰의 권한 비트맵을 쓰지 않는다)
+    perm_bits = decode_permission_bits(payload.get("pm"))
+    if perm_bits is None or payload.get("pv") != user.perm_version:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="권한이 변경되었습니다. 다시 로그인해주세요.",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+
+    # 5. 비활성화된 계정 체크
     if not user.is_active:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="비활성화된 계정입니다."
         )
         
-    return user
+    return user.with_bits(perm_bits)
 
 # 권한 체크 Functions
 def require_role(*allowed_roles: UserRole):
@@ -68,7 +74,7 @@ def require_role(*allowed_roles: UserRole):
             ...
     """
 
-    async def role_checker(current_user: User = Depends(get_current_user)) -> User:
+    async def role_checker(current_user: Principal = Depends(get_current_user)) -> Principal:
         if current_user.role not in allowed_roles:
             raise HTTPException(
                 status_code=status.HTTP_403_FORBIDDEN,
@@ -93,28 +99,15 @@ def require_permission(*permission_codes: str):
             ...
     """
     async def permission_checker(
-        current_user: User = Depends(get_current_user),
-        db: AsyncSession = Depends(get_db)
-    ) -> User:
+        current_user: Principal = Depends(get_current_user),
+    ) -> Principal:
         # SYSTEM_ADMIN은 모든 권한을 보유한것으로 간주함
         if current_user.role == UserRole.S:
             return current_user
         
-        # 사용자 권한 조회
-        result = await db.execute(
-            select(Permission.code)
-            .join(UserPermission, UserPermission.permission_id == Permission.id)
-            .where(
-                UserPermission.user_id == current_user.id,
-                UserPermission.is_active == True
-            )
-        )
-        user_permissions = set(result.scalars().all())
-        
-        # 필요한 권한을 모두 가지고 있는지 확인
-        required_permissions = set(permission_codes)
-        if not required_permissions.issubset(user_permissions):
-            missing = required_permissions - user_permissions
+        # 필요한 권한을 모두 가지고 있는지 확인 (토큰의 권한 비트맵과 비트 연산)
+        required, known = await permission_catalog.mask(permission_codes)
+        if not known or current_user.perm_bits & required != required:
             raise HTTPException(
                 status_code=status.HTTP_403_FORBIDDEN,
                 detail=f"해당 계정에 권한코드가 존재하지 않습니다."
@@ -134,27 +127,15 @@ def require_any_permission(*permission_codes: str):
             ...
     """
     async def permission_checker(
-        current_user: User = Depends(get_current_user),
-        db: AsyncSession = Depends(get_db)
-    ) -> User:
+        current_user: Principal = Depends(get_current_user),
+    ) -> Principal:
         # SYSTEM_ADMIN은 모든 권한을 보유한것으로 간주함
         if current_user.role == UserRole.S:
             return current_user
-        
-        # 사용자의 권한 조회
-        result = await db.execute(
-            select(Permission.code)
-            .join(UserPermission, UserPermission.permission_id == Permission.id)
-            .where(
-                UserPermission.user_id == current_user.id,
-                UserPermission.is_active == True,
-                Permission.code.in_(permission_codes)
-            )
-        )
-        user_permissions = set(result.scalars().all())
 
-        # 권한중 하나라고 있으면 통과
-        if any(perm in user_permissions for perm in permission_codes):
+        # 권한중 하나라고 있으면 통과 (존재하지 않는 코드는 무시)
+        accepted, _ = await permission_catalog.mask(permission_codes)
+        if current_user.perm_bits & accepted:
             return current_user
         
         raise HTTPException(
@@ -1,4 +1,5 @@
 import os
+from contextlib import asynccontextmanager
 
 from fastapi import FastAPI
 from starlette.middleware.base import BaseHTTPMiddleware
@@ -7,12 +8,25 @@ from slowapi import Limiter, _rate_limit_exceeded_handler
 from slowapi.util import get_remote_address
 from slowapi.errors import RateLimitExceeded
 
+from pbx_common.log import setup_logging
+
 from app.core.config import get_settings
-from app.routes import calls, users, companies, signaling, permissions, auth, customer, ivr, queue, consult
+from app.routes import calls, users, companies, signaling, call_state, permissions, auth, customer, ivr, queue, consult
 
 # 설정 로드
 settings = get_settings()
 
+# 요청 처리 중 로그 쓰기가 이벤트 루프를 막지 않도록 큐 기반 로깅 (uvicorn 로그도 같은 경로로)
+setup_logging(
+    "api",
+    level=settings.log_level,
+    fmt=settings.log_format,
+    sample_rate=settings.log_sample_rate,
+    capture=("uvicorn", "uvicorn.error", "uvicorn.access"),
+    # access 로그는 모든 요청이 같은 호출 위치라 샘플링하면 요청 기록이 빠진다
+    sample_exempt=("uvicorn.access",),
+)
+
 # Rate Limiter 인스턴스 생성
 limiter = Limiter(key_func=get_remote_address)
 
@@ -39,10 +53,17 @@ class SecurityHeaderMiddleware(BaseHTTPMiddleware):
 
         return response
 
+@asynccontextmanager
+async def lifespan(application: FastAPI):
+    yield
+    # 실시간 콜 상태 LISTEN 커넥션 정리
+    await call_state.hub.close()
+
 def create_application() -> FastAPI:
     application = FastAPI(
         title=settings.api_title,
         version=settings.api_version,
+        lifespan=lifespan,
     )
 
     # 보안 헤더 미들웨어 추가 (CORS 보다 먼저 적용 필수)
@@ -81,6 +102,7 @@ def create_application() -> FastAPI:
 
     # WebSocket 라우터
     application.include_router(signaling.router)
+    application.include_router(call_state.router)
 
     return application
 
@@ -11,6 +11,7 @@ from pbx_common.models import User, Permission, UserPermission, UserStatusLog, U
 from pbx_common.utils.security import verify_password, create_access_token
 from app.db.session import get_db
 from app.schemas.user import LoginRequest, Token, ActivityUpdate
+from app.core.principal import Principal, encode_permission_bits, permission_catalog
 from app.deps import get_current_user
 
 router = APIRouter(prefix="/api/v1/auth", tags=["Authentication"])
@@ -32,16 +33,17 @@ async def login(request: Request, login_data: LoginRequest, db: AsyncSession = D
             detail="아이디 또는 비밀번호가 일치하지 않습니다.",
         )
     
-    # 3. UserPermission과 Permission 테이블을 조인해서 code 값만 긁어오기
+    # 3. UserPermission과 Permission 테이블을 조인해서 code 값과 id(토큰 비트맵용)를 긁어오기
     perm_result = await db.execute(
-        select(Permission.code)
+        select(Permission.code, Permission.id)
         .join(UserPermission, UserPermission.permission_id == Permission.id)
         .where(
             UserPermission.user_id == user.id,
             UserPermission.is_active == True
         )
     )
-    user_permissions = perm_result.scalars().all()
+    perm_rows = perm_result.all()
+    user_permissions = [code for code, _ in perm_rows]
 
     # 4. 기존 로그 마감 처리 (혹시 종료되지 않은 로그가 있는 경우에만..)
     # ended_at이 null인 가장 최근 로그를 찾아 마감
@@ -86,7 +88,10 @@ async def login(request: Request, login_data: LoginRequest, db: AsyncSession = D
             "name": user.name,
             "role": user.role.value if hasattr(user.role, 'value') else str(user.role),
             "id": user.id,
-            "company_id": user.company_id
+            "company_id": user.company_id,
+            # 권한 비트맵 + 버전 (요청마다 권한 테이블을 조회하지 않도록)
+            "pm": encode_permission_bits(pid for _, pid in perm_rows),
+            "pv": user.perm_version,
         }
     )
 
@@ -220,15 +225,7 @@ async def update_activity(activity_data: ActivityUpdate, request: Request, db: A
 
 @router.get("/me/permissions")
 async def get_my_permissions(
-    db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: Principal = Depends(get_current_user)
 ):
-    perm_result = await db.execute(
-        select(Permission.code)
-        .join(UserPermission, UserPermission.permission_id == Permission.id)
-        .where(
-            UserPermission.user_id == current_user.id,
-            UserPermission.is_active == True
-        )
-    )
-    return {"permissions": perm_result.scalars().all()}
\ No newline at end of file
+    # 토큰의 권한 비트맵 -> 코드 (권한 카탈로그 캐시 사용)
+    return {"permissions": await permission_catalog.codes(current_user.perm_bits)}
@@ -0,0 +1,229 @@
+import asyncio
+import json
+import logging
+from collections import deque
+from typing import Deque, Optional, Set
+
+from fastapi import APIRouter, WebSocket, WebSocketDisconnect, Query, HTTPException, status
+from sqlalchemy import text
+
+from pbx_common.models import UserRole
+from app.core.principal import authenticate
+from app.db.session import engine
+from app.routes.signaling import verify_websocket_token
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter(tags=["call-state"])
+
+# ARI Worker(app/services/call_state.py)가 NOTIFY 하는 채널
+CALL_STATE_CHANNEL = "call_state"
+
+# 실시간 콜 상태를 볼 수 있는 권한 코드 (통화 이력 메뉴와 동일)
+CALL_STATE_PERMISSION = "history"
+
+# 구독자별 미전송 메시지 상한 (느린 클라이언트는 오래된 것부터 버린다)
+SUBSCRIBER_BUFFER = 256
+
+# 연결 중 권한 재확인 주기 (사용자 캐시를 거치므로 다른 프로세스의 변경은 PRINCIPAL_CACHE_TTL_SEC 만큼 더 늦을 수 있음)
+AUTH_RECHECK_SEC = 30.0
+
+
+class CallStateSubscriber:
+    """WebSocket 1개 = 구독자 1개 (company_id가 None이면 전체 회사)"""
+
+    def __init__(self, websocket: WebSocket, company_id: Optional[int], all_companies: bool):
+        self.websocket = websocket
+        self.company_id = company_id
+        self.all_companies = all_companies
+        self.buffer: Deque[str] = deque(maxlen=SUBSCRIBER_BUFFER)
+        self.ready = asyncio.Event()
+        self.dropped = 0
+
+    def wants(self, company_id: Optional[int]) -> bool:
+        return self.all_companies or (company_id is not None and company_id == self.company_id)
+
+    def same_scope(self, other: "CallStateSubscriber") -> bool:
+        return (self.company_id, self.all_companies) == (other.company_id, other.all_companies)
+
+    def push(self, message: str) -> None:
+        if len(self.buffer) == self.buffer.maxlen:
+            self.dropped += 1
+        self.buffer.append(message)
+        self.ready.set()
+
+
+class CallStateHub:
+    """
+    Postgres LISTEN 1개를 모든 WebSocket 구독자에게 분배
+
+    API 프로세스당 전용 커넥션 하나만 LISTEN 하고 (첫 구독자 접속 시 시작),
+    NOTIFY 페이로드는 회사 단위로 걸러 원문 문자열 그대로 각 구독자 버퍼에 넣는다.
+    커넥션이 끊기면 재접속하며, 그 사이의 변경분은 유실된다 (목록 API로 보정).
+    """
+
+    def __init__(self, channel: str = CALL_STATE_CHANNEL, check_interval: float = 30.0):
+        self.channel = channel
+        self.check_interval = check_interval
+        self.subscribers: Set[CallStateSubscriber] = set()
+        self._task: Optional[asyncio.Task] = None
+
+        # 메트릭
+        self.received = 0
+        self.delivered = 0
+
+    def subscribe(self, sub: CallStateSubscriber) -> None:
+        self.subscribers.add(sub)
+        if self._task is None:
+            self._task = asyncio.create_task(self._run(), name="call-state-listener")
+
+    def unsubscribe(self, sub: CallStateSubscriber) -> None:
+        self.subscribers.discard(sub)
+
+    async def close(self) -> None:
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+    def _on_notify(self, _conn, _pid, _channel, payload: str) -> None:
+        self.received += 1
+        try:
+            company_id = json.loads(payload).get("company_id")
+        except ValueError:
+            logger.warning(f"잘못된 call_state 페이로드: {payload[:200]}")
+            return
+        for sub in self.subscribers:
+            if sub.wants(company_id):
+                sub.push(payload)
+                self.delivered += 1
+
+    async def _run(self) -> None:
+        while True:
+            conn = None
+            try:
+                conn = await engine.connect()
+                conn = await conn.execution_options(isolation_level="AUTOCOMMIT")
+                raw = await conn.get_raw_connection()
+                await raw.driver_connection.add_listener(self.channel, self._on_notify)
+                logger.info(f"LISTEN {self.channel} 시작")
+                # 알림은 콜백으로 들어오므로 주기적으로 커넥션 생존만 확인
+                while True:
+                    await asyncio.sleep(self.check_interval)
+                    await conn.execute(text("SELECT 1"))
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"LISTEN {self.channel} 연결 끊김, 3초 후 재접속: {e!r}")
+            finally:
+                if conn is not None:
+                    try:
+                        await conn.close()
+                    except Exception:
+                        pass
+            await asyncio.sleep(3)
+
+    def stats(self) -> dict:
+        return {
+            "subscribers": len(self.subscribers),
+            "received": self.received,
+            "delivered": self.delivered,
+        }
+
+
+hub = CallStateHub()
+
+
+async def _authorize(payload: dict) -> Optional[CallStateSubscriber]:
+    """활성 사용자 + (SYSTEM_ADMIN 또는 history 권한)만 구독 허용"""
+    user = await authenticate(payload)
+    if user is None or not user.is_active:
+        return None
+
+    # SYSTEM_ADMIN은 모든 회사의 콜을 본다
+    if user.role == UserRole.S:
+        return CallStateSubscriber(None, None, all_companies=True)
+
+    if user.company_id is None or not await user.has_permission(CALL_STATE_PERMISSION):
+        return None
+    return CallStateSubscriber(None, user.company_id, all_companies=False)
+
+
+async def _sender(sub: CallStateSubscriber) -> None:
+    try:
+        while True:
+            await sub.ready.wait()
+            sub.ready.clear()
+            while sub.buffer:
+                await sub.websocket.send_text(sub.buffer.popleft())
+    except asyncio.CancelledError:
+        raise
+    except Exception as e:
+        # 끊긴 연결 -> 수신 루프가 WebSocketDisconnect로 정리
+        logger.debug(f"call_state 전송 중단: {e!r}")
+
+
+async def _auth_watcher(sub: CallStateSubscriber, payload: dict) -> None:
+    """
+    연결 중에도 주기적으로 권한을 다시 확인
+    권한 재할당(perm_version 변경), 비활성화, 회사/역할 변경으로 볼 수 있는 범위가 달라지면 연결을 닫는다.
+    """
+    while True:
+        await asyncio.sleep(AUTH_RECHECK_SEC)
+        try:
+            current = await _authorize(payload)
+        except Exception as e:
+            # DB 일시 장애로 기존 구독을 끊지는 않는다 (다음 주기에 재확인)
+            logger.warning(f"call_state 권한 재확인 실패: {e!r}")
+            continue
+        if current is None or not current.same_scope(sub):
+            logger.info("call_state 구독 권한 변경 -> 연결 종료")
+            hub.unsubscribe(sub)
+            try:
+                await sub.websocket.close(code=status.WS_1008_POLICY_VIOLATION, reason="권한 변경")
+            except Exception as e:
+                logger.debug(f"call_state 연결 종료 실패 (이미 끊김): {e!r}")
+            return
+
+
+@router.websocket("/ws/calls")
+async def call_state_endpoint(
+    websocket: WebSocket,
+    token: str = Query(..., description="JWT 인증 토큰")
+):
+    # 1. 토큰 검증
+    try:
+        payload = verify_websocket_token(token)
+    except HTTPException:
+        await websocket.close(code=status.WS_1008_POLICY_VIOLATION, reason="인증 실패")
+        return
+
+    # 2. 사용자/권한 확인 -> 볼 수 있는 회사 범위 결정
+    sub = await _authorize(payload)
+    if sub is None:
+        await websocket.close(code=status.WS_1008_POLICY_VIOLATION, reason="권한 없음")
+        return
+
+    # 3. 연결 후 구독 (서버 -> 클라이언트 단방향, 수신 메시지는 무시)
+    await websocket.accept()
+    sub.websocket = websocket
+    hub.subscribe(sub)
+    sender = asyncio.create_task(_sender(sub))
+    watcher = asyncio.create_task(_auth_watcher(sub, payload))
+    try:
+        while True:
+            await websocket.receive_text()
+    except WebSocketDisconnect:
+        pass
+    except Exception as e:
+        logger.warning(f"call_state WebSocket 오류: {e!r}")
+    finally:
+        hub.unsubscribe(sub)
+        sender.cancel()
+        watcher.cancel()
+        if sub.dropped:
+            logger.info(f"call_state 구독 종료 (버퍼 초과로 {sub.dropped}건 버림)")
@@ -1,23 +1,29 @@
 import httpx
+import logging
+import uuid
 
-from datetime import date
-from typing import List, Optional
+from datetime import date, datetime, timedelta, timezone
+from typing import Optional
 from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select, and_
 
 from pbx_common.models import Call
+from app.core.cursor import decode_cursor, keyset_after, paginate
 from app.db.session import get_db
 from app.schemas.call import CallResponse
+from app.schemas.page import Page
 from app.deps import get_current_user
 from app.core.config import get_settings
 
+logger = logging.getLogger(__name__)
+
 router = APIRouter(prefix="/api/v1", tags=["Calls"], dependencies=[Depends(get_current_user)])
 
-@router.get("/calls", response_model=List[CallResponse])
+@router.get("/calls", response_model=Page[CallResponse])
 async def read_calls(
-    skip: int = 0, 
-    limit: int = 100, 
+    cursor: Optional[str] = None,
+    limit: int = Query(100, ge=1, le=1000),
     date_from: Optional[date] = Query(None),
     date_to: Optional[date] = Query(None),
     direction: Optional[str] = Query(None),
@@ -25,20 +31,19 @@ async def read_calls(
     search: Optional[str] = Query(None),
     db: AsyncSession = Depends(get_db)
 ):
+    # 최신순 (created_at, id) keyset -> idx_calls_created_at_id 범위 탐색 (페이지 깊이와 무관)
+    # created_at은 워커가 StasisStart에서 행을 만든 시각 (= 통화 시작)
+    after = keyset_after((Call.created_at, Call.id), decode_cursor(cursor, datetime, uuid.UUID))
     try:
         conditions = []
 
         if date_from:
-            from datetime import datetime, timezone
             conditions.append(
-                (Call.started_at != None) &
-                (Call.started_at >= datetime.combine(date_from, datetime.min.time()).replace(tzinfo=timezone.utc))
+                Call.created_at >= datetime.combine(date_from, datetime.min.time()).replace(tzinfo=timezone.utc)
             )
         if date_to:
-            from datetime import datetime, timezone, timedelta
             conditions.append(
-                (Call.started_at != None) &
-                (Call.started_at < datetime.combine(date_to, timedelta(days=1), datetime.min.time()).replace(tzinfo=timezone.utc))
+                Call.created_at < datetime.combine(date_to + timedelta(days=1), datetime.min.time()).replace(tzinfo=timezone.utc)
             )
         if direction:
             conditions.append(Call.direction == direction)
@@ -50,21 +55,23 @@ async def read_calls(
                 Call.callee_exten.ilike(f"%{search}")
             )
 
+        if after is not None:
+            conditions.append(after)
+
         query = (
             select(Call)
             .where(and_(*conditions))
-            .order_by(Call.started_at.desc())
-            .offset(skip)
-            .limit(limit)
+            .order_by(Call.created_at.desc(), Call.id.desc())
+            .limit(limit + 1)
         )
 
         result = await db.execute(query)
-        calls = result.scalars().all()
+        calls, next_cursor = paginate(result.scalars().all(), limit, lambda c: (c.created_at, c.id))
 
-        return calls
+        return Page(items=calls, next_cursor=next_cursor)
     
     except Exception as e:
-        print(f"Error fetching calls: {e}")
+        logger.exception(f"Error fetching calls: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
 @router.post("/calls/originate")
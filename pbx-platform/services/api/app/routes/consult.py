@@ -8,11 +8,13 @@ from sqlalchemy import select, and_
 
 from pbx_common.models.consultation import Consultation, ConsultationStatus
 from pbx_common.models.consult_category import ConsultCategory
+from app.core.cursor import decode_cursor, keyset_after, paginate
 from app.db.session import get_db
 from app.schemas.consult import (
     ConsultationCreate, ConsultationUpdate, ConsultationLinkCall, ConsultationResponse,
     ConsultCategoryCreate, ConsultCategoryUpdate, ConsultCategoryResponse,
 )
+from app.schemas.page import Page
 from app.deps import get_current_user, require_permission
 
 router = APIRouter(
@@ -21,10 +23,10 @@ router = APIRouter(
     dependencies=[Depends(get_current_user)],
 )
 
-@router.get("", response_model=List[ConsultationResponse])
+@router.get("", response_model=Page[ConsultationResponse])
 async def list_consultation(
-    skip: int = 0,
-    limit: int = 100,
+    cursor: Optional[str] = None,
+    limit: int = Query(100, ge=1, le=1000),
     date_from: Optional[date] = Query(None),
     date_to: Optional[date] = Query(None),
     agent_id: Optional[int] = Query(None),
@@ -56,15 +58,21 @@ async def list_consultation(
         conditions.append(Consultation.agent_id == agent_id)
     if company_id:
         conditions.append(Consultation.company_id == company_id)
+
+    # 최신순 (created_at, id) keyset -> idx_consultations_created_at_id
+    after = keyset_after((Consultation.created_at, Consultation.id), decode_cursor(cursor, datetime, int))
+    if after is not None:
+        conditions.append(after)
     
     stmt = (
         select(Consultation)
         .where(and_(*conditions))
-        .order_by(Consultation.created_at.desc())
-        .offset(skip).limit(limit)
+        .order_by(Consultation.created_at.desc(), Consultation.id.desc())
+        .limit(limit + 1)
     )
     result = await db.execute(stmt)
-    return result.scalars().all()
+    items, next_cursor = paginate(result.scalars().all(), limit, lambda c: (c.created_at, c.id))
+    return Page(items=items, next_cursor=next_cursor)
 
 
 @router.post("", response_model=ConsultationResponse)
@@ -1,12 +1,19 @@
-from typing import List, Optional
+import re
+from typing import Optional
 from datetime import datetime, timezone
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, status
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
-
-from pbx_common.models import Customer, CustomerGroup
+from sqlalchemy import Select, func, literal_column, or_, select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import contains_eager
+
+from pbx_common.models import Company, Customer, CustomerGroup, UserRole
+from pbx_common.utils.phone import normalize_phone
+from app.core.cursor import decode_cursor, keyset_after, paginate
+from app.core.principal import Principal
 from app.db.session import get_db
 from app.schemas.customer import CustomerCreate, CustomerUpdate, CustomerResponse
+from app.schemas.page import Page
 from app.deps import get_current_user, require_permission
 
 router = APIRouter(
@@ -15,17 +22,37 @@ router = APIRouter(
     dependencies=[Depends(get_current_user)]
 )
 
+# 숫자만 남긴 전화번호 (idx_customer_phone_digits_trgm 인덱스 식과 같아야 인덱스를 탄다 -> 상수는 리터럴로)
+PHONE_DIGITS = func.regexp_replace(
+    Customer.phone, literal_column("'[^0-9]'"), literal_column("''"), literal_column("'g'")
+)
 
-@router.get("", response_model=List[CustomerResponse])
-async def read_customers(
-    group:  Optional[str] = None,
+
+def _like_pattern(term: str) -> str:
+    """부분 일치 LIKE 패턴 (와일드카드 문자는 이스케이프)"""
+    return "%" + re.sub(r"([\\%_])", r"\\\1", term) + "%"
+
+
+def customer_query(
+    group: Optional[str] = None,
     search: Optional[str] = None,
-    skip:   int = 0,
-    limit:  int = 200,
-    db: AsyncSession = Depends(get_db),
-    _: object = Depends(require_permission("customer-search"))
-):
-    query = select(Customer).where(Customer.is_active == True).order_by(Customer.created_at.desc())
+    cursor: Optional[str] = None,
+    limit: int = 200,
+) -> Select:
+    """
+    고객 목록/검색 쿼리 (limit + 1건)
+
+    - 검색어 없음: 최신 등록순 (created_at, id) keyset (idx_customer_active_created_at_id)
+    - 검색어 있음: 이름/회사명 부분 일치 또는 숫자만 비교한 전화번호 부분 일치
+      (pg_trgm GIN 인덱스), 유사도 높은 순 (rank, id) keyset
+    회사는 조인 한 번으로 함께 읽는다 (행마다 selectin 조회 없음).
+    """
+    query = (
+        select(Customer)
+        .join(Customer.company, isouter=True)
+        .options(contains_eager(Customer.company))
+        .where(Customer.is_active == True)
+    )
 
     if group and group != "all":
         try:
@@ -33,19 +60,104 @@ async def read_customers(
         except ValueError:
             raise HTTPException(status_code=400, detail="유효하지 않은 그룹입니다.")
 
-    result = await db.execute(query.offset(skip).limit(limit))
-    customers = result.scalars().all()
+    term = (search or "").strip()
+    if not term:
+        after = keyset_after((Customer.created_at, Customer.id), decode_cursor(cursor, datetime, int))
+        if after is not None:
+            query = query.where(after)
+        return query.order_by(Customer.created_at.desc(), Customer.id.desc()).limit(limit + 1)
+
+    pattern = _like_pattern(term)
+    digits = re.sub(r"[^0-9]", "", term)
+
+    # 회사명 일치는 회사 id 집합으로 바꿔 고객 테이블 조건만으로 OR (각 조건이 인덱스를 탈 수 있게)
+    matching_companies = select(Company.id).where(Company.company_name.ilike(pattern, escape="\\"))
+    conditions = [
+        Customer.name.ilike(pattern, escape="\\"),
+        Customer.company_id.in_(matching_companies),
+    ]
+    scores = [
+        func.similarity(Customer.name, term),
+        func.similarity(func.coalesce(Company.company_name, ""), term),
+    ]
+    if digits:
+        conditions.append(PHONE_DIGITS.like(_like_pattern(digits), escape="\\"))
+        scores.append(func.similarity(PHONE_DIGITS, digits))
+
+    rank = func.greatest(*scores).label("rank")
+    query = query.add_columns(rank).where(or_(*conditions))
+
+    after = keyset_after((rank, Customer.id), decode_cursor(cursor, float, int))
+    if after is not None:
+        query = query.where(after)
+    return query.order_by(rank.desc(), Customer.id.desc()).limit(limit + 1)
+
+
+async def _commit_customer(db: AsyncSession) -> None:
+    """같은 회사에 같은 번호(phone_norm)의 활성 고객이 이미 있으면 409"""
+    try:
+        await db.commit()
+    except IntegrityError as e:
+        await db.rollback()
+        if "uq_customer_company_phone_norm" not in str(e.orig):
+            raise
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail="이미 등록된 전화번호입니다.")
+
+
+@router.get("", response_model=Page[CustomerResponse])
+async def read_customers(
+    group:  Optional[str] = None,
+    search: Optional[str] = None,
+    cursor: Optional[str] = None,
+    limit:  int = Query(200, ge=1, le=1000),
+    db: AsyncSession = Depends(get_db),
+    _: object = Depends(require_permission("customer-search"))
+):
+    result = await db.execute(customer_query(group, search, cursor, limit))
+
+    if search and search.strip():
+        rows = result.all()
+        page, next_cursor = paginate(rows, limit, lambda r: (r.rank, r.Customer.id))
+        customers = [r.Customer for r in page]
+    else:
+        rows = result.scalars().all()
+        customers, next_cursor = paginate(rows, limit, lambda c: (c.created_at, c.id))
 
-    if search:
-        q = search.lower()
-        customers = [
-            c for c in customers
-            if q in c.name.lower()
-            or q in c.phone.lower()
-            or (c.company_name and q in c.company_name.lower())
-        ]
+    return Page(items=customers, next_cursor=next_cursor)
 
-    return customers
+
+@router.get("/lookup", response_model=CustomerResponse)
+async def lookup_customer(
+    phone: str,
+    company_id: Optional[int] = None,
+    db: AsyncSession = Depends(get_db),
+    current_user: Principal = Depends(require_permission("customer-search"))
+):
+    """
+    발신 번호 -> 고객 1건 (정규화 번호 + 회사 유니크 인덱스 조회)
+    회사는 로그인 사용자 소속, SYSTEM_ADMIN만 company_id로 지정할 수 있다.
+    """
+    if current_user.role != UserRole.S or company_id is None:
+        company_id = current_user.company_id
+
+    phone_norm = normalize_phone(phone)
+    if phone_norm is None:
+        raise HTTPException(status_code=404, detail="고객을 찾을 수 없습니다.")
+
+    result = await db.execute(
+        select(Customer)
+        .join(Customer.company, isouter=True)
+        .options(contains_eager(Customer.company))
+        .where(
+            Customer.company_id.is_(None) if company_id is None else Customer.company_id == company_id,
+            Customer.phone_norm == phone_norm,
+            Customer.is_active == True,
+        )
+    )
+    customer = result.scalars().first()
+    if customer is None:
+        raise HTTPException(status_code=404, detail="고객을 찾을 수 없습니다.")
+    return customer
 
 
 @router.post("", response_model=CustomerResponse)
@@ -62,13 +174,14 @@ async def create_customer(
     new_customer = Customer(
         name=customer_in.name,
         phone=customer_in.phone,
+        phone_norm=normalize_phone(customer_in.phone),
         email=customer_in.email,
         company_id=customer_in.company_id,
         group=group,
         memo=customer_in.memo,
     )
     db.add(new_customer)
-    await db.commit()
+    await _commit_customer(db)
     await db.refresh(new_customer)
     return new_customer
 
@@ -92,10 +205,13 @@ async def update_customer(
         except ValueError:
             raise HTTPException(status_code=400, detail="유효하지 않은 그룹입니다.")
 
+    if "phone" in update_data:
+        update_data["phone_norm"] = normalize_phone(update_data["phone"])
+
     for key, value in update_data.items():
         setattr(customer, key, value)
 
-    await db.commit()
+    await _commit_customer(db)
     await db.refresh(customer)
     return customer
 
@@ -7,7 +7,8 @@ from sqlalchemy import func
 
 from app.db.session import get_db
 from app.schemas.permissions import MenuTemplateCreate, PermissionUpdate, UserPermissionAssign
-from pbx_common.models import Permission, PermissionType, UserPermission
+from pbx_common.models import Permission, PermissionType, User, UserPermission
+from app.core.principal import permission_catalog, principal_cache
 from app.deps import get_current_user
 
 router = APIRouter(prefix="/api/v1/permissions", tags=["Permissions"], dependencies=[Depends(get_current_user)])
@@ -59,6 +60,8 @@ async def create_permission_template(data: MenuTemplateCreate, db: AsyncSession
 
     try:
         await db.commit()
+        # 권한 코드 -> 비트 매핑을 다시 읽도록 카탈로그 무효화
+        permission_catalog.clear()
         return {"status": "success", "menu_id": menu.id}
     except Exception as e:
         await db.rollback()
@@ -90,6 +93,7 @@ async def patch_permission_template(permission_id: int, data: PermissionUpdate,
 
     try:
         await db.commit()
+        permission_catalog.clear()
         return {"status": "success", "update_fields": list(update_data.keys())}
     except Exception as e:
         await db.rollback()
@@ -117,6 +121,7 @@ async def delete_permission_template(permission_id: int, db: AsyncSession = Depe
         )
 
     await db.commit()
+    permission_catalog.clear()
     return {"message": f"'{permission.name}' 및 하위권한 비활성화 완료"}
 
 
@@ -148,8 +153,16 @@ async def assign_user_permissions(data: UserPermissionAssign, db: AsyncSession =
         )
         await db.execute(stmt)
 
+    # 권한 버전 +1 -> 이 사용자의 기존 토큰(이전 권한 비트맵)은 거부된다
+    await db.execute(
+        update(User)
+        .where(User.id == data.user_id)
+        .values(perm_version=User.perm_version + 1)
+    )
+
     try:
         await db.commit()
+        principal_cache.invalidate(data.user_id)
         return {"message": "해당 메뉴 권한 동기화 완료"}
     except Exception as e:
         await db.rollback()
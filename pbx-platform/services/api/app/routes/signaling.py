@@ -2,9 +2,12 @@ from fastapi import APIRouter, WebSocket, WebSocketDisconnect, Query, HTTPExcept
 from typing import List, Dict
 from jose import jwt, JWTError
 import json
+import logging
 
 from pbx_common.utils.security import SECRET_KEY, ALGORITHM
 
+logger = logging.getLogger(__name__)
+
 router = APIRouter(tags=["signaling"])
 
 class SignalingManager:
@@ -40,7 +43,7 @@ class SignalingManager:
                     try:
                         await connection.send_json(message)
                     except Exception as e:
-                        print(f"메세지 전송 실패: {e}")
+                        logger.warning(f"메세지 전송 실패: {e}", extra={"room_id": room_id})
 
 manager = SignalingManager()
 
@@ -118,7 +121,7 @@ async def websocket_endpoint(
                     "message": "잘못된 JSON 형식입니다."
                 })
             except Exception as e:
-                print(f"메시지 처리 오류: {e}")
+                logger.error(f"메시지 처리 오류: {e}", extra={"room_id": room_id, "user_id": user_id})
                 break
 
     except WebSocketDisconnect:
@@ -1,5 +1,5 @@
-from typing import List, Optional
-from fastapi import APIRouter, Depends, HTTPException, status
+from typing import Optional
+from fastapi import APIRouter, Depends, HTTPException, Query, status
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
 from datetime import datetime
@@ -7,8 +7,11 @@ from datetime import datetime
 from pbx_common.utils.security import SECRET_KEY, ALGORITHM
 from pbx_common.models import User, Company, UserStatus, UserStatusLog, LoginStatus, UserActivity, UserRole, UserPermission, PsEndpoint, PsAuth, PsAor
 from pbx_common.utils.security import hash_password
+from app.core.cursor import decode_cursor, keyset_after, paginate
 from app.db.session import get_db
+from app.schemas.page import Page
 from app.schemas.user import UserCreate, UserResponse, UserUpdate
+from app.core.principal import Principal, principal_cache
 from app.deps import get_current_user, require_role, require_permission
 
 router = APIRouter(prefix="/api/v1/users", tags=["Users"])
@@ -20,7 +23,7 @@ router = APIRouter(prefix="/api/v1/users", tags=["Users"])
 async def create_user(
     user_in: UserCreate,
     db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(require_role(UserRole.S))
+    current_user: Principal = Depends(require_role(UserRole.S))
 ):
     # API 필드(username) -> DB 필드(account) 매핑
     q_account = select(User).where(User.account == user_in.username)
@@ -78,27 +81,34 @@ async def create_user(
 
 # 2. 사용자 목록 조회
 # 권한: 액션권한이 있다면 접근 가능
-@router.get("", response_model=List[UserResponse])
+@router.get("", response_model=Page[UserResponse])
 async def read_users(
     company_id: Optional[int] = None,
+    cursor: Optional[str] = None,
+    limit: int = Query(500, ge=1, le=1000),
     db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(require_permission("agent-detail"))
+    current_user: Principal = Depends(require_permission("agent-detail"))
 ):
     # 역할에 따른 필터링
     if current_user.role == UserRole.S:
         if company_id is not None:
-            query = select(User).where(User.company_id == company_id).order_by(User.id.asc())
+            query = select(User).where(User.company_id == company_id)
         else:
-            query = select(User).order_by(User.id.asc())
+            query = select(User)
     else:
         # 시스템관리자가 아닌경우는 본인의 업체만 조회가능
-        query = select(User).where(User.company_id == current_user.company_id).order_by(User.id.asc())   
+        query = select(User).where(User.company_id == current_user.company_id)
 
-    result = await db.execute(query)
-    users = result.scalars().all()
+    # id 오름차순 keyset (회사 필터는 idx_user_company_id_id)
+    after = keyset_after((User.id,), decode_cursor(cursor, int), descending=False)
+    if after is not None:
+        query = query.where(after)
+
+    result = await db.execute(query.order_by(User.id.asc()).limit(limit + 1))
+    users, next_cursor = paginate(result.scalars().all(), limit, lambda u: (u.id,))
 
     # UserResponse 형식으로 변환
-    return [
+    items = [
         UserResponse(
             id=user.id,
             username=user.account,
@@ -111,6 +121,7 @@ async def read_users(
         )
         for user in users
     ]
+    return Page(items=items, next_cursor=next_cursor)
 
 # 3. 사용자 정보 수정
 # 권한: 시스템관리자(SYSTEM_ADMIN), 운영관리자(MANAGER)
@@ -118,7 +129,7 @@ async def read_users(
 async def update_user(
     user_id: int, user_in: UserUpdate, 
     db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(require_role(UserRole.S, UserRole.M))
+    current_user: Principal = Depends(require_role(UserRole.S, UserRole.M))
 ):
     user = await db.get(User, user_id)
 
@@ -173,6 +184,8 @@ async def update_user(
                 await _sync_pjsip(db, user_in.extension, sip_pass)
 
     await db.commit()
+    # 역할/소속이 바뀌었을 수 있으므로 인증 캐시 무효화
+    principal_cache.invalidate(user_id)
     await db.refresh(user)
 
     return UserResponse(
@@ -192,7 +205,7 @@ async def update_user(
 async def delete_user(
     user_id: int,
     db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(require_role(UserRole.S, UserRole.M))
+    current_user: Principal = Depends(require_role(UserRole.S, UserRole.M))
 ):
     user = await db.get(User, user_id)
     if not user:
@@ -200,6 +213,7 @@ async def delete_user(
 
     user.is_active = False
     await db.commit()
+    principal_cache.invalidate(user_id)
 
 # 5. 사용자 재활성화
 # 권한: 시스템관리자(SYSTEM_ADMIN), 운영관리자(MANAGER)
@@ -207,7 +221,7 @@ async def delete_user(
 async def restore_user(
     user_id: int,
     db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(require_role(UserRole.S, UserRole.M))
+    current_user: Principal = Depends(require_role(UserRole.S, UserRole.M))
 ):
     user = await db.get(User, user_id)
     if not user:
@@ -215,6 +229,7 @@ async def restore_user(
 
     user.is_active = True
     await db.commit()
+    principal_cache.invalidate(user_id)
     await db.refresh(user)
 
     return UserResponse(
@@ -234,7 +249,7 @@ async def restore_user(
 async def get_user_permissions(
     user_id: int,
     db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(require_role(UserRole.S, UserRole.M))
+    current_user: Principal = Depends(require_role(UserRole.S, UserRole.M))
 ):
     user = await db.get(User, user_id)
     if not user:
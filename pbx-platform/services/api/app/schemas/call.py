@@ -16,12 +16,18 @@ class CallResponse(BaseModel):
     # --- 전화번호 정보 ---
     caller_exten: Optional[str] = None
     callee_exten: Optional[str] = None
+    customer_id: Optional[int] = None   # 발신 번호로 찾은 고객 (워커가 인입 시 연결)
     
     # --- 통화 상태 및 방향 ---
     direction: str       # internal, inbound 등
     status: str          # ended, up, new 등
     hangup_reason: Optional[str] = None
     hangup_cause: Optional[int] = None # 숫자 코드도 필요하다면 추가
+
+    # --- 통화 지표 (워커가 종료 시 계산) ---
+    ring_ms: Optional[int] = None       # 인입 -> 응답 (미응답이면 종료까지)
+    talk_ms: Optional[int] = None       # 응답 -> 종료
+    hangup_party: Optional[str] = None  # caller / callee / system
     
     # --- 내부 시스템 정보 (필요한 경우에만 노출) ---
     # bridge_id: Optional[str] = None
@@ -0,0 +1,9 @@
+from typing import Generic, List, Optional, TypeVar
+from pydantic import BaseModel
+
+T = TypeVar("T")
+
+class Page(BaseModel, Generic[T]):
+    """목록 API 공통 응답 (keyset 페이지네이션)"""
+    items: List[T]
+    next_cursor: Optional[str] = None   # 다음 페이지 요청 시 cursor로 전달 (마지막 페이지면 null)
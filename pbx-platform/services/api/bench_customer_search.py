@@ -0,0 +1,217 @@
+"""
+고객 검색 벤치마크 (pg_trgm 인덱스 + keyset)
+
+별도 스키마(bench_customer_search)에 company/customer 테이블을 만들고 합성 고객을 채운 뒤,
+- 기존 방식: 최신 200건을 읽어 파이썬에서 부분 일치 필터 (찾은 건수 / 실제 일치 건수)
+- 현재 방식: routes/customer.py 의 customer_query (SQL 검색 + 유사도 정렬 + keyset)
+를 검색어별로 반복 실행해 p50/p95 지연과 실행 계획(사용 인덱스)을 비교한다.
+
+    # 100만 고객, 검색어당 20회
+    python bench_customer_search.py --rows 1000000 --reps 20
+
+    # 이미 채운 스키마 재사용 / 끝난 뒤 스키마 유지
+    python bench_customer_search.py --reuse --keep
+"""
+import argparse
+import asyncio
+import os
+import statistics
+import time
+from dotenv import load_dotenv
+
+load_dotenv("../../.env")
+
+from sqlalchemy import func, select, text
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from pbx_common.models import Base, Company, Customer
+from app.core.cursor import encode_cursor
+from app.routes.customer import customer_query
+
+SCHEMA = "bench_customer_search"
+
+# 마이그레이션(add_customer_search_indexes)의 식 인덱스 (모델에 선언되지 않은 것)
+EXTRA_INDEXES = (
+    "CREATE INDEX idx_customer_phone_digits_trgm ON customer "
+    "USING gin (regexp_replace(phone, '[^0-9]', '', 'g') gin_trgm_ops)",
+)
+
+SEARCH_TERMS = (
+    "김민",             # 이름 2글자 (일치 다수)
+    "박서준",           # 이름 3글자
+    "1234",             # 전화번호 일부
+    "010-5678-12",      # 하이픈 포함 전화번호 일부
+    "회사17",           # 회사명
+    "없는고객",         # 일치 없음
+)
+
+_FILL_COMPANIES = text("""
+    INSERT INTO company (company_name)
+    SELECT '회사' || g || ' ' || (ARRAY['물산','전자','상사','유통','건설'])[1 + g % 5]
+    FROM generate_series(1, :companies) g
+""")
+
+_FILL_CUSTOMERS = text("""
+    INSERT INTO customer (company_id, name, phone, "group", memo, is_active, created_at)
+    SELECT
+        1 + (g % :companies),
+        (ARRAY['김','이','박','최','정','강','조','윤','장','임'])[1 + floor(random() * 10)::int]
+          || (ARRAY['민','서','지','현','수','영','준','하','도','예'])[1 + floor(random() * 10)::int]
+          || (ARRAY['준','연','우','진','호','아','윤','원','희','빈'])[1 + floor(random() * 10)::int],
+        '010-' || lpad(floor(random() * 10000)::int::text, 4, '0')
+          || '-' || lpad(floor(random() * 10000)::int::text, 4, '0'),
+        (ARRAY['NORMAL','NORMAL','NORMAL','VIP','BLACKLIST'])[1 + g % 5],
+        '',
+        random() > 0.02,
+        now() - make_interval(secs => g)
+    FROM generate_series(:start, :stop) g
+""")
+
+
+async def setup(engine, rows: int, companies: int, batch: int = 200_000) -> None:
+    async with engine.begin() as conn:
+        await conn.execute(text("CREATE EXTENSION IF NOT EXISTS pg_trgm"))
+        await conn.execute(text(f"DROP SCHEMA IF EXISTS {SCHEMA} CASCADE"))
+        await conn.execute(text(f"CREATE SCHEMA {SCHEMA}"))
+        await conn.run_sync(lambda c: Base.metadata.create_all(c, tables=[Company.__table__, Customer.__table__]))
+        # 적재 중 인덱스 유지 비용을 빼기 위해 PK 외 인덱스는 적재 후 생성
+        for idx in Customer.__table__.indexes:
+            await conn.execute(text(f"DROP INDEX {SCHEMA}.{idx.name}"))
+
+    t0 = time.perf_counter()
+    async with engine.begin() as conn:
+        await conn.execute(_FILL_COMPANIES, {"companies": companies})
+        for start in range(1, rows + 1, batch):
+            await conn.execute(_FILL_CUSTOMERS, {
+                "companies": companies, "start": start, "stop": min(start + batch - 1, rows),
+            })
+    print(f"loaded {rows} customers / {companies} companies in {time.perf_counter() - t0:.1f}s")
+
+    t0 = time.perf_counter()
+    async with engine.begin() as conn:
+        await conn.run_sync(lambda c: [idx.create(c) for idx in Customer.__table__.indexes])
+        for ddl in EXTRA_INDEXES:
+            await conn.execute(text(ddl))
+        await conn.execute(text("ANALYZE company"))
+        await conn.execute(text("ANALYZE customer"))
+    print(f"built indexes in {time.perf_counter() - t0:.1f}s")
+
+    async with engine.connect() as conn:
+        res = await conn.execute(text(
+            "SELECT indexrelname, pg_size_pretty(pg_relation_size(indexrelid)) FROM pg_stat_user_indexes "
+            "WHERE schemaname = :schema AND relname = 'customer' ORDER BY indexrelname"
+        ), {"schema": SCHEMA})
+        for name, size in res.all():
+            print(f"  {name:<36} {size}")
+
+
+def _legacy_filter(customers, term: str):
+    q = term.lower()
+    return [
+        c for c in customers
+        if q in c.name.lower()
+        or q in c.phone.lower()
+        or (c.company_name and q in c.company_name.lower())
+    ]
+
+
+async def _timed(SessionLocal, stmt, reps: int):
+    """ORM 세션으로 실행 (API와 같은 객체 변환 비용 포함)"""
+    times, rows = [], []
+    for _ in range(reps):
+        t0 = time.perf_counter()
+        async with SessionLocal() as s:
+            rows = (await s.execute(stmt)).all()
+        times.append((time.perf_counter() - t0) * 1000)
+    times.sort()
+    return rows, statistics.median(times), times[max(0, int(len(times) * 0.95) - 1)]
+
+
+async def _plan(engine, stmt) -> str:
+    """실행 계획에서 사용한 인덱스 이름만 추린다"""
+    sql = str(stmt.compile(dialect=engine.dialect, compile_kwargs={"literal_binds": True}))
+    async with engine.connect() as conn:
+        lines = [r[0] for r in (await conn.exec_driver_sql("EXPLAIN (ANALYZE, BUFFERS) " + sql)).all()]
+    used = sorted({
+        word for line in lines for word in line.replace("(", " ").split()
+        if word.startswith("idx_") or word.endswith("_pkey")
+    })
+    return ", ".join(used) or "seq scan"
+
+
+async def run(engine, reps: int, limit: int) -> None:
+    SessionLocal = async_sessionmaker(bind=engine, expire_on_commit=False)
+
+    print(f"\n{'term':<14} {'matches':>8} {'legacy found':>12} {'legacy p50':>10} {'sql p50':>8} {'sql p95':>8}  indexes")
+    for term in SEARCH_TERMS:
+        # 기존 방식: 최신 200건 + 파이썬 필터
+        t0 = time.perf_counter()
+        async with SessionLocal() as s:
+            latest = (await s.execute(
+                select(Customer).where(Customer.is_active == True).order_by(Customer.created_at.desc()).limit(200)
+            )).scalars().all()
+            legacy = _legacy_filter(latest, term)
+        legacy_ms = (time.perf_counter() - t0) * 1000
+
+        stmt = customer_query(search=term, limit=limit)
+        async with engine.connect() as conn:
+            total = (await conn.execute(
+                select(func.count()).select_from(customer_query(search=term, limit=10**9).subquery())
+            )).scalar_one()
+        _, p50, p95 = await _timed(SessionLocal, stmt, reps)
+        print(f"{term:<14} {total:>8} {len(legacy):>12} {legacy_ms:>8.1f}ms {p50:>6.1f}ms {p95:>6.1f}ms  {await _plan(engine, stmt)}")
+
+    # keyset: 검색 2페이지 / 목록 깊은 페이지
+    first, _, _ = await _timed(SessionLocal, customer_query(search="김민", limit=limit), 1)
+    if len(first) > limit:
+        last = first[limit - 1]
+        stmt = customer_query(search="김민", cursor=encode_cursor(last.rank, last.Customer.id), limit=limit)
+        _, p50, p95 = await _timed(SessionLocal, stmt, reps)
+        print(f"\nsearch page 2 (keyset)      p50 {p50:.1f}ms  p95 {p95:.1f}ms")
+
+    async with engine.connect() as conn:
+        row = (await conn.execute(
+            select(Customer.created_at, Customer.id).where(Customer.is_active == True)
+            .order_by(Customer.created_at.desc(), Customer.id.desc()).offset(500_000).limit(1)
+        )).first()
+    if row is not None:
+        stmt = customer_query(cursor=encode_cursor(row.created_at, row.id), limit=limit)
+        _, p50, p95 = await _timed(SessionLocal, stmt, reps)
+        print(f"list after 500k (keyset)    p50 {p50:.1f}ms  p95 {p95:.1f}ms  {await _plan(engine, stmt)}")
+        offset_stmt = (
+            select(Customer).where(Customer.is_active == True)
+            .order_by(Customer.created_at.desc(), Customer.id.desc()).offset(500_000).limit(limit)
+        )
+        _, p50, p95 = await _timed(SessionLocal, offset_stmt, reps)
+        print(f"list after 500k (offset)    p50 {p50:.1f}ms  p95 {p95:.1f}ms")
+
+
+async def main():
+    ap = argparse.ArgumentParser(description="customer search benchmark (pg_trgm + keyset)")
+    ap.add_argument("--rows", type=int, default=1_000_000)
+    ap.add_argument("--companies", type=int, default=200)
+    ap.add_argument("--reps", type=int, default=20)
+    ap.add_argument("--limit", type=int, default=50)
+    ap.add_argument("--reuse", action="store_true", help="이미 채운 벤치 스키마 재사용")
+    ap.add_argument("--keep", action="store_true", help="끝난 뒤 벤치 스키마 유지")
+    args = ap.parse_args()
+
+    db_url = os.getenv("DATABASE_URL")
+    if not db_url:
+        print("DATABASE_URL을 찾을 수 없습니다.")
+        return
+
+    # 벤치 스키마를 먼저 찾고, pg_trgm 함수는 public에서 찾는다
+    engine = create_async_engine(db_url, connect_args={"server_settings": {"search_path": f"{SCHEMA},public"}})
+    try:
+        if not args.reuse:
+            await setup(engine, args.rows, args.companies)
+        await run(engine, args.reps, args.limit)
+        if not args.keep:
+            async with engine.begin() as conn:
+                await conn.execute(text(f"DROP SCHEMA {SCHEMA} CASCADE"))
+    finally:
+        await engine.dispose()
+
+if __name__ == "__main__":
+    asyncio.run(main())
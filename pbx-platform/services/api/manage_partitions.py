@@ -0,0 +1,220 @@
+"""
+call_events 월 파티션 관리 / 보존 정책
+
+    # 이번 달부터 3개월 뒤까지 파티션 생성 (DEFAULT에 들어간 해당 기간 행은 새 파티션으로 이동)
+    python manage_partitions.py ensure --ahead 3
+
+    # 6개월보다 오래된 파티션: DETACH 후 DROP (DELETE 없이 즉시 공간 회수)
+    python manage_partitions.py retain --keep-months 6
+
+    # 삭제 대신 CSV(gzip)로 내보낸 뒤 DROP, 또는 archive 스키마로 이동
+    python manage_partitions.py retain --keep-months 6 --archive-dir /backup/call_events
+    python manage_partitions.py retain --keep-months 6 --archive-schema archive
+
+    # calls는 파티션하지 않으므로(FK/upsert 제약) 오래된 행을 배치 DELETE (선택)
+    python manage_partitions.py retain --keep-months 6 --calls-keep-months 24
+
+cron 예: 매일 03:00 에 ensure, 매월 1일 04:00 에 retain
+"""
+import argparse
+import asyncio
+import gzip
+import os
+import re
+from datetime import date, datetime, time
+from dotenv import load_dotenv
+
+load_dotenv("../../.env")
+
+from sqlalchemy import text
+
+from pbx_common.db import Database, DatabaseConfig
+
+PARENT = "call_events"
+DEFAULT_PARTITION = "call_events_default"
+_PARTITION_RE = re.compile(r"^call_events_p(\d{4})(\d{2})$")
+
+
+def add_months(d: date, n: int) -> date:
+    y, m = divmod(d.month - 1 + n, 12)
+    return date(d.year + y, m + 1, 1)
+
+
+def partition_name(month: date) -> str:
+    return f"{PARENT}_p{month:%Y%m}"
+
+
+async def list_partitions(conn) -> dict[date, str]:
+    """부모에 붙어 있는 월 파티션 (이름 규칙 call_events_pYYYYMM)"""
+    res = await conn.execute(text(
+        "SELECT c.relname FROM pg_inherits i JOIN pg_class c ON c.oid = i.inhrelid "
+        "WHERE i.inhparent = CAST(:parent AS regclass)"
+    ), {"parent": PARENT})
+    out = {}
+    for (name,) in res:
+        m = _PARTITION_RE.match(name)
+        if m:
+            out[date(int(m.group(1)), int(m.group(2)), 1)] = name
+    return dict(sorted(out.items()))
+
+
+async def ensure(db: Database, ahead: int) -> None:
+    this_month = date.today().replace(day=1)
+    async with db.engine.connect() as conn:
+        existing = await list_partitions(conn)
+
+    for i in range(ahead + 1):
+        month = add_months(this_month, i)
+        if month in existing:
+            continue
+        name = partition_name(month)
+        lo, hi = month.isoformat(), add_months(month, 1).isoformat()
+
+        # DEFAULT 파티션에 해당 기간 행이 있으면 PARTITION OF 생성이 실패하므로
+        # 별도 테이블로 만들고 행을 옮긴 뒤 ATTACH 한다 (한 트랜잭션)
+        async with db.engine.begin() as conn:
+            await conn.execute(text(f"CREATE TABLE {name} (LIKE {PARENT} INCLUDING DEFAULTS INCLUDING CONSTRAINTS)"))
+            moved = await conn.execute(text(
+                f"WITH moved AS ("
+                f"  DELETE FROM {DEFAULT_PARTITION} WHERE created_at >= '{lo}' AND created_at < '{hi}' RETURNING *"
+                f") INSERT INTO {name} SELECT * FROM moved"
+            ))
+            await conn.execute(text(
+                f"ALTER TABLE {PARENT} ATTACH PARTITION {name} FOR VALUES FROM ('{lo}') TO ('{hi}')"
+            ))
+        print(f"created {name} [{lo}, {hi}) (moved {moved.rowcount} rows from default)")
+
+
+async def _archive_to_file(db: Database, name: str, archive_dir: str) -> str:
+    os.makedirs(archive_dir, exist_ok=True)
+    path = os.path.join(archive_dir, f"{name}.csv.gz")
+    tmp = path + ".tmp"
+    async with db.engine.connect() as conn:
+        raw = await conn.get_raw_connection()
+        # asyncpg COPY TO: 행을 메모리에 모으지 않고 파일로 바로 스트리밍
+        with gzip.open(tmp, "wb") as f:
+            await raw.driver_connection.copy_from_table(name, output=f, format="csv", header=True)
+    os.replace(tmp, path)
+    return path
+
+
+async def retain(
+        db: Database,
+        keep_months: int,
+        archive_dir: str = "",
+        archive_schema: str = "",
+        calls_keep_months: int = 0,
+        batch: int = 5000,
+        dry_run: bool = False,
+) -> None:
+    cutoff = add_months(date.today().replace(day=1), -keep_months)
+    async with db.engine.connect() as conn:
+        expired = [(m, n) for m, n in (await list_partitions(conn)).items() if add_months(m, 1) <= cutoff]
+
+    if not expired:
+        print(f"no call_events partitions older than {cutoff}")
+
+    for month, name in expired:
+        if dry_run:
+            print(f"[dry-run] would detach {name}")
+            continue
+
+        # DETACH는 메타데이터만 바꾸므로 DELETE와 달리 행 수와 무관하게 즉시 끝난다
+        async with db.engine.begin() as conn:
+            await conn.execute(text(f"ALTER TABLE {PARENT} DETACH PARTITION {name}"))
+
+        if archive_schema:
+            async with db.engine.begin() as conn:
+                await conn.execute(text(f"CREATE SCHEMA IF NOT EXISTS {archive_schema}"))
+                await conn.execute(text(f"ALTER TABLE {name} SET SCHEMA {archive_schema}"))
+            print(f"detached {name} -> {archive_schema}.{name}")
+            continue
+
+        if archive_dir:
+            path = await _archive_to_file(db, name, archive_dir)
+            print(f"archived {name} -> {path}")
+
+        async with db.engine.begin() as conn:
+            await conn.execute(text(f"DROP TABLE {name}"))
+        print(f"dropped {name}")
+
+    if calls_keep_months:
+        calls_cutoff = add_months(date.today().replace(day=1), -calls_keep_months)
+        await _retain_calls(db, datetime.combine(calls_cutoff, time.min).astimezone(), batch, dry_run)
+
+
+async def _retain_calls(db: Database, cutoff: datetime, batch: int, dry_run: bool) -> None:
+    """
+    calls는 파티션 대상이 아니다.
+    - consultations.call_id -> calls.id FK: 파티션 테이블의 PK/UNIQUE는 파티션 키를 포함해야 해서 참조 불가
+    - 워커의 ON CONFLICT (id) upsert도 id 단독 UNIQUE가 필요
+    따라서 짧은 트랜잭션의 배치 DELETE로 정리한다 (consultations.call_id는 SET NULL).
+    """
+    if dry_run:
+        async with db.engine.connect() as conn:
+            n = (await conn.execute(text("SELECT count(*) FROM calls WHERE created_at < :c"), {"c": cutoff})).scalar()
+        print(f"[dry-run] would delete {n} calls rows older than {cutoff}")
+        return
+
+    total = 0
+    while True:
+        async with db.engine.begin() as conn:
+            res = await conn.execute(text(
+                "DELETE FROM calls WHERE id IN ("
+                "  SELECT id FROM calls WHERE created_at < :c LIMIT :n"
+                ")"
+            ), {"c": cutoff, "n": batch})
+        total += res.rowcount
+        if res.rowcount < batch:
+            break
+    print(f"deleted {total} calls rows older than {cutoff}")
+
+
+async def main():
+    ap = argparse.ArgumentParser(description="call_events partition maintenance")
+    sub = ap.add_subparsers(dest="cmd", required=True)
+
+    p_ensure = sub.add_parser("ensure", help="create upcoming monthly partitions")
+    p_ensure.add_argument("--ahead", type=int, default=3)
+
+    p_retain = sub.add_parser("retain", help="detach and drop/archive old partitions")
+    p_retain.add_argument("--keep-months", type=int, required=True)
+    p_retain.add_argument("--archive-dir", default="")
+    p_retain.add_argument("--archive-schema", default="")
+    p_retain.add_argument("--calls-keep-months", type=int, default=0)
+    p_retain.add_argument("--batch", type=int, default=5000)
+    p_retain.add_argument("--dry-run", action="store_true")
+
+    sub.add_parser("list", help="show attached monthly partitions")
+
+    args = ap.parse_args()
+
+    db_url = os.getenv("DATABASE_URL")
+    if not db_url:
+        print("DATABASE_URL을 찾을 수 없습니다.")
+        return
+
+    db = Database(DatabaseConfig(database_url=db_url))
+    db.init()
+    try:
+        if args.cmd == "ensure":
+            await ensure(db, args.ahead)
+        elif args.cmd == "retain":
+            await retain(
+                db,
+                args.keep_months,
+                archive_dir=args.archive_dir,
+                archive_schema=args.archive_schema,
+                calls_keep_months=args.calls_keep_months,
+                batch=args.batch,
+                dry_run=args.dry_run,
+            )
+        else:
+            async with db.engine.connect() as conn:
+                for month, name in (await list_partitions(conn)).items():
+                    print(f"{name}  [{month}, {add_months(month, 1)})")
+    finally:
+        await db.close()
+
+if __name__ == "__main__":
+    asyncio.run(main())
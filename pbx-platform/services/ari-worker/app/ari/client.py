@@ -1,10 +1,28 @@
 from __future__ import annotations
 
+import re
+import time
 from dataclasses import dataclass
 from typing import Any, Optional
 
 import httpx
 
+from app.core.metrics import Counter, Histogram
+
+_REQUEST_LATENCY = Histogram(
+    "ari_request_seconds", "ARI REST request latency", ("method", "route"),
+)
+_REQUEST_ERRORS = Counter(
+    "ari_request_errors_total", "ARI REST requests that failed", ("method", "route", "status"),
+)
+
+# /channels/<id>/... -> /channels/{id}/... (ID별로 시계열이 늘어나지 않게)
+_ROUTE_ID = re.compile(r"^/(channels|bridges)/[^/]+")
+
+
+def route_template(path: str) -> str:
+    return _ROUTE_ID.sub(r"/\1/{id}", path)
+
 @dataclass
 class AriClient:
     ari_base: str
@@ -37,7 +55,7 @@ class AriClient:
             await self._client.aclose()
             self._client = None
 
-    async def _request(self, method: str, path: str, params: dict = None) -> dict:
+    async def _request(self, method: str, path: str, params: dict = None, json: Any = None) -> Any:
         """내부 헬퍼 메소드: 반복되는 요청 로직 통합"""
         if self._client is None:
             raise RuntimeError("AriClient is not started. Call await client.start() first.")
@@ -47,10 +65,19 @@ class AriClient:
         if params:
             final_params.update(params)
         
-        response = await self._client.request(method, path, params=final_params)
+        route = route_template(path)
+        t0 = time.perf_counter()
+        try:
+            response = await self._client.request(method, path, params=final_params, json=json)
+        except Exception as e:
+            _REQUEST_ERRORS.inc(method, route, type(e).__name__)
+            raise
+        finally:
+            _REQUEST_LATENCY.observe(time.perf_counter() - t0, method, route)
 
         # 404 등 에러 처리 (필요시 커스텀 예외로 변경 가능)
         if response.status_code not in (200, 204):
+            _REQUEST_ERRORS.inc(method, route, response.status_code)
             response.raise_for_status()
 
         if response.status_code == 204:
@@ -58,13 +85,23 @@ class AriClient:
         
         return response.json()
     
-    async def originate(self, endpoint: str, app_args: str, caller_id: str = "ARI", timeout: int = 30) -> str:
+    async def originate(
+            self,
+            endpoint: str,
+            app_args: str,
+            caller_id: str = "ARI",
+            timeout: int = 30,
+            channel_id: Optional[str] = None,
+    ) -> str:
         params = {
             "endpoint": endpoint,
             "appArgs": app_args,
             "caller_id": caller_id,
             "timeout": timeout,
         }
+        # 채널 ID를 미리 지정하면 이후 이벤트를 응답 대기 없이 바로 매칭할 수 있다
+        if channel_id:
+            params["channelId"] = channel_id
 
         # POST /channels
         data = await self._request("POST", "/channels", params=params)
@@ -74,17 +111,46 @@ class AriClient:
             raise RuntimeError(f"originate succeeded but no channel id: {data}")
         return cid
     
-    async def create_bridge(self, name: str, bridge_type: str = "mixing") -> str:
+    async def list_channels(self) -> list[dict[str, Any]]:
+        """GET /channels: 현재 살아있는 모든 채널"""
+        return await self._request("GET", "/channels") or []
+
+    async def list_bridges(self) -> list[dict[str, Any]]:
+        """GET /bridges: 현재 존재하는 모든 브릿지 (channels 목록 포함)"""
+        return await self._request("GET", "/bridges") or []
+
+    async def set_event_filter(self, disallowed: list[str]) -> bool:
+        """
+        PUT /applications/{app}/eventFilter: 지정 타입 이벤트를 Asterisk에서 보내지 않게 한다.
+        필터를 지원하지 않는 버전(404/405/501 등)이면 False (수신 측 정책으로만 거른다)
+        """
+        body = {"disallowed": [{"type": t} for t in disallowed]}
+        try:
+            await self._request("PUT", f"/applications/{self.ari_app}/eventFilter", json=body)
+        except httpx.HTTPStatusError as e:
+            if e.response.status_code in (400, 404, 405, 501):
+                return False
+            raise
+        return True
+
+    async def create_bridge(self, name: str, bridge_type: str = "mixing", bridge_id: Optional[str] = None) -> str:
         params = {"type": bridge_type, "name": name}
-        data = await self._request("POST", "/bridges", params=params)
 
-        bid = data.get("id")
+        # 브릿지 ID를 미리 지정하면 POST /bridges/{bridgeId} 로 생성
+        path = f"/bridges/{bridge_id}" if bridge_id else "/bridges"
+        data = await self._request("POST", path, params=params)
+
+        bid = data.get("id") or bridge_id
         if not bid:
             raise RuntimeError(f"create_bridge succeeded but no bridge id: {data}")
         return bid
     
     async def add_channel_to_bridge(self, bridge_id: str, channel_id: str) -> None:
-        params = {"channel": channel_id}
+        await self.add_channels_to_bridge(bridge_id, [channel_id])
+
+    async def add_channels_to_bridge(self, bridge_id: str, channel_ids: list[str]) -> None:
+        """여러 채널을 한 번의 요청으로 추가 (ARI channel 파라미터는 콤마 구분 목록 허용)"""
+        params = {"channel": ",".join(channel_ids)}
         await self._request("POST", f"/bridges/{bridge_id}/addChannel", params=params)
 
     async def destroy_bridge(self, bridge_id: str) -> None:
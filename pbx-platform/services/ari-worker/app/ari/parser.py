@@ -1,59 +1,155 @@
 from __future__ import annotations
 
+import enum
+import json
+import sys
 from dataclasses import dataclass
-from typing import Any, Optional
+from datetime import datetime
+from functools import lru_cache
+from typing import Any, Optional, Union
+
+# 선택 의존성: orjson이 설치되어 있으면 사용, 없으면 표준 json으로 fallback
+try:
+    import orjson as _orjson
+except ImportError:  # pragma: no cover
+    _orjson = None
+
+JSON_BACKEND = "orjson" if _orjson is not None else "json"
+
+# orjson.JSONDecodeError는 json.JSONDecodeError의 하위 클래스이므로 호출부는 그대로 사용 가능
+JSONDecodeError = json.JSONDecodeError
+
+
+def decode_frame(message: Union[str, bytes]) -> dict[str, Any]:
+    """WebSocket 프레임(JSON 텍스트) -> dict"""
+    if _orjson is not None:
+        return _orjson.loads(message)
+    return json.loads(message)
+
+
+def encode_json(obj: Any) -> str:
+    """dict -> JSON 텍스트 (원본 프레임이 없는 이벤트를 적재할 때 사용)"""
+    if _orjson is not None:
+        return _orjson.dumps(obj).decode("utf-8")
+    return json.dumps(obj, ensure_ascii=False, separators=(",", ":"))
+
+
+class EventType(str, enum.Enum):
+    """워커가 구분하는 ARI 이벤트 타입 (그 외는 OTHER)"""
+    STASIS_START = "StasisStart"
+    STASIS_END = "StasisEnd"
+    CHANNEL_CREATED = "ChannelCreated"
+    CHANNEL_STATE_CHANGE = "ChannelStateChange"
+    CHANNEL_DIALPLAN = "ChannelDialplan"
+    CHANNEL_VARSET = "ChannelVarset"
+    CHANNEL_HANGUP_REQUEST = "ChannelHangupRequest"
+    CHANNEL_DESTROYED = "ChannelDestroyed"
+    CHANNEL_ENTERED_BRIDGE = "ChannelEnteredBridge"
+    CHANNEL_LEFT_BRIDGE = "ChannelLeftBridge"
+    BRIDGE_CREATED = "BridgeCreated"
+    BRIDGE_DESTROYED = "BridgeDestroyed"
+    DIAL = "Dial"
+    OTHER = "Other"
+
+
+_EVENT_TYPES: dict[str, EventType] = {m.value: m for m in EventType if m is not EventType.OTHER}
+
+
+def event_type(etype: Optional[str]) -> EventType:
+    return _EVENT_TYPES.get(etype, EventType.OTHER) if etype else EventType.OTHER
+
+
+@lru_cache(maxsize=4096)
+def parse_ari_timestamp(t: Optional[str]) -> Optional[datetime]:
+    """
+    ARI timestamp("2024-01-01T12:00:00.000+0900") -> datetime
+    같은 ms에 발생한 이벤트가 많아 문자열 단위로 캐싱한다.
+    """
+    if not t:
+        return None
+    # +0900 -> +09:00 (python 3.9/3.10 fromisoformat 호환)
+    if len(t) >= 5 and (t[-5] in ("+", "-")) and t[-2:].isdigit():
+        t = t[:-5] + t[-5:-2] + ":" + t[-2:]
+    try:
+        return datetime.fromisoformat(t)
+    except ValueError:
+        return None
+
 
 @dataclass(frozen=True)
 class ParsedEvent:
+    __slots__ = (
+        "etype", "kind", "timestamp", "ts",
+        "channel_id", "channel_name", "app_name", "app_args", "caller_number", "raw", "raw_text",
+    )
+
     etype: str
+    kind: EventType
     timestamp: Optional[str]
+    ts: Optional[datetime]
     channel_id: Optional[str]
     channel_name: Optional[str]
     app_name: Optional[str]
     app_args: list[str]
+    caller_number: Optional[str]    # 발신 번호 (StasisStart만, 고객 조회용)
     raw: dict[str, Any]
+    raw_text: Optional[str]     # 수신한 원본 프레임 (call_events.raw에 그대로 적재)
 
 
 def _split_app_data(app_data: Optional[str]) -> tuple[Optional[str], list[str]]:
     if not isinstance(app_data, str) or not app_data.strip():
         return None, []
-    
+
     parts = [p.strip() for p in app_data.split(",") if p.strip()]
     if not parts:
         return None, []
-    
+
     app_name = parts[0]
     args = parts[1:]
     return app_name, args
 
-def parse_event(event: dict[str, Any]) -> ParsedEvent:
+def parse_event(event: dict[str, Any], raw_text: Union[str, bytes, None] = None) -> ParsedEvent:
     etype = event.get("type")
+    if etype:
+        # 타입 문자열은 종류가 적으므로 intern하여 비교/저장 비용을 줄인다
+        etype = sys.intern(etype)
     ts = event.get("timestamp")
 
     channel = event.get("channel") or {}
     chan_id = channel.get("id")
     chan_name = channel.get("name")
-    
-    app_name = event.get("application")
-    app_args = event.get("args")
 
-    if not app_args or not isinstance(app_args, list):
-        dialplan = channel.get("dialplan") or {}
-        app_data = dialplan.get("app_data")
+    kind = event_type(etype)
+
+    # app 인자/발신 번호는 StasisStart에서만 사용하므로 그 외 이벤트는 추출하지 않는다
+    app_name: Optional[str] = None
+    app_args: Any = None
+    caller_number: Optional[str] = None
+    if kind is EventType.STASIS_START:
+        app_name = event.get("application")
+        app_args = event.get("args")
+        caller_number = (channel.get("caller") or {}).get("number") or None
 
-        parsed_name, parsed_args = _split_app_data(app_data)
+        # args가 없을 때만 dialplan.app_data를 파싱
+        if not app_args or not isinstance(app_args, list):
+            dialplan = channel.get("dialplan") or {}
+            parsed_name, parsed_args = _split_app_data(dialplan.get("app_data"))
 
-        if not app_name:
-            app_name = parsed_name
-        if not app_args:
-            app_args = parsed_args
+            if not app_name:
+                app_name = parsed_name
+            if not app_args:
+                app_args = parsed_args
 
     return ParsedEvent(
         etype=etype,
+        kind=kind,
         timestamp=ts,
+        ts=parse_ari_timestamp(ts),
         channel_id=chan_id,
         channel_name=chan_name,
         app_name=app_name,
         app_args=app_args or [],
+        caller_number=caller_number,
         raw=event,
-    )
\ No newline at end of file
+        raw_text=raw_text.decode("utf-8") if isinstance(raw_text, bytes) else raw_text,
+    )
@@ -14,6 +14,56 @@ class Settings:
 
     database_url: str 
 
+    # call_events 배치 적재 정책
+    event_flush_rows: int = 500         # 버퍼가 N건 쌓이면 즉시 flush
+    event_flush_ms: int = 200           # 마지막 flush 후 T ms가 지나면 flush
+    event_queue_max: int = 20000        # 버퍼 최대 크기 (가득 차면 add_event가 대기)
+    event_raw_mode: str = "passthrough" # passthrough: 원본 프레임 그대로 적재 / json: dict 재직렬화
+    event_policy: str = ""              # 타입별 적재 정책 (비우면 전부 원본 적재, "reduced" 프리셋, "ChannelVarset=ignore,*=slim")
+
+    # DB 장애 대비 로컬 spool (디렉터리를 비우면 사용하지 않음)
+    spool_dir: str = ""
+    spool_segment_mb: int = 16          # 세그먼트 교체 크기
+    spool_fsync_ms: int = 100           # fsync 묶음 주기
+    spool_replay_sec: int = 5           # DB 재생 시도 주기
+
+    # 이벤트 디스패처 샤드
+    dispatch_shards: int = 8            # 동시 처리 worker 수 (같은 채널은 항상 같은 샤드)
+    shard_mailbox_size: int = 1000      # 샤드별 mailbox 상한
+
+    # 콜 세션 만료 (hangup 유실 대비, TTL 0이면 비활성)
+    session_ttl_sec: int = 300          # 마지막 이벤트 후 이 시간이 지나면 ARI에 채널 생존 확인
+    session_sweep_sec: int = 60         # 만료 검사 주기
+
+    # 콜 상태 변경 알림 (Postgres NOTIFY -> API /ws/calls)
+    call_state_notify: int = 1          # 0이면 발행하지 않음
+    call_state_queue_max: int = 10000   # 발행 대기 큐 상한 (가득 차면 버림)
+    exten_cache_ttl_sec: int = 300      # 내선 -> 회사 캐시 TTL
+
+    # 발신 번호 -> 고객 연결 (calls.customer_id, customer.last_call_at)
+    customer_resolve: int = 1           # 0이면 고객을 찾지 않음
+    customer_cache_ttl_sec: int = 300   # (회사, 정규화 번호) -> 고객 캐시 TTL
+    customer_touch_flush_sec: int = 5   # last_call_at 묶음 반영 주기
+
+    # WebSocket 리더 <-> 디스패처 사이 수신 큐
+    ingest_queue_max: int = 10000       # 큐 상한
+    ingest_overflow: str = "block"      # 가득 찼을 때: block / drop(저가치 타입 버림) / spill(디스크)
+    ingest_drop_types: str = ""         # drop 대상 이벤트 타입 (콤마 구분, 비우면 기본값)
+    ingest_spill_dir: str = ""          # spill 파일 디렉터리 (비우면 시스템 임시 디렉터리)
+
+    # 로깅 (QueueHandler -> 백그라운드 리스너)
+    log_level: str = "INFO"
+    log_format: str = "json"            # json: 한 줄 JSON / text: 개발용
+    log_sample_rate: int = 50           # 호출 위치별 초당 INFO 로그 상한 (0이면 샘플링 안 함)
+
+    # Prometheus 메트릭 엔드포인트 (포트 0이면 비활성)
+    metrics_host: str = "127.0.0.1"
+    metrics_port: int = 9108
+
+    # 다중 인스턴스 (0이면 단일 인스턴스: 모든 콜을 처리)
+    cluster_partitions: int = 0         # 콜 소유권 파티션 수 (모든 워커가 같은 값을 사용)
+    cluster_rebalance_sec: int = 5      # 파티션 재분배 주기
+
     @property
     def ari_base(self) -> str:
         return f"http://{self.ari_host}:{self.ari_port}/ari"
@@ -29,6 +79,15 @@ class Settings:
             f"?app={self.ari_app}&api_key={self.api_key}"
         )
     
+def _env_int(name: str, default: int) -> int:
+    v = os.getenv(name, "").strip()
+    if not v:
+        return default
+    try:
+        return int(v)
+    except ValueError:
+        raise SystemExit(f"Invalid env: {name}={v!r} (integer required)")
+
 def load_settings() -> Settings:
     load_dotenv()
 
@@ -39,6 +98,36 @@ def load_settings() -> Settings:
         ari_user = os.getenv("ARI_USER", "").strip(),
         ari_pass = os.getenv("ARI_PASS", "").strip(),
         database_url=os.getenv("DATABASE_URL", "").strip(),
+        event_flush_rows=_env_int("EVENT_FLUSH_ROWS", 500),
+        event_flush_ms=_env_int("EVENT_FLUSH_MS", 200),
+        event_queue_max=_env_int("EVENT_QUEUE_MAX", 20000),
+        event_raw_mode=os.getenv("EVENT_RAW_MODE", "passthrough").strip() or "passthrough",
+        event_policy=os.getenv("EVENT_POLICY", "").strip(),
+        spool_dir=os.getenv("SPOOL_DIR", "").strip(),
+        spool_segment_mb=_env_int("SPOOL_SEGMENT_MB", 16),
+        spool_fsync_ms=_env_int("SPOOL_FSYNC_MS", 100),
+        spool_replay_sec=_env_int("SPOOL_REPLAY_SEC", 5),
+        dispatch_shards=_env_int("DISPATCH_SHARDS", 8),
+        shard_mailbox_size=_env_int("SHARD_MAILBOX_SIZE", 1000),
+        session_ttl_sec=_env_int("SESSION_TTL_SEC", 300),
+        session_sweep_sec=_env_int("SESSION_SWEEP_SEC", 60),
+        call_state_notify=_env_int("CALL_STATE_NOTIFY", 1),
+        call_state_queue_max=_env_int("CALL_STATE_QUEUE_MAX", 10000),
+        exten_cache_ttl_sec=_env_int("EXTEN_CACHE_TTL_SEC", 300),
+        customer_resolve=_env_int("CUSTOMER_RESOLVE", 1),
+        customer_cache_ttl_sec=_env_int("CUSTOMER_CACHE_TTL_SEC", 300),
+        customer_touch_flush_sec=_env_int("CUSTOMER_TOUCH_FLUSH_SEC", 5),
+        ingest_queue_max=_env_int("INGEST_QUEUE_MAX", 10000),
+        ingest_overflow=os.getenv("INGEST_OVERFLOW", "block").strip() or "block",
+        ingest_drop_types=os.getenv("INGEST_DROP_TYPES", "").strip(),
+        ingest_spill_dir=os.getenv("INGEST_SPILL_DIR", "").strip(),
+        log_level=os.getenv("LOG_LEVEL", "INFO").strip() or "INFO",
+        log_format=os.getenv("LOG_FORMAT", "json").strip() or "json",
+        log_sample_rate=_env_int("LOG_SAMPLE_RATE", 50),
+        metrics_host=os.getenv("METRICS_HOST", "127.0.0.1").strip() or "127.0.0.1",
+        metrics_port=_env_int("METRICS_PORT", 9108),
+        cluster_partitions=_env_int("CLUSTER_PARTITIONS", 0),
+        cluster_rebalance_sec=_env_int("CLUSTER_REBALANCE_SEC", 5),
     )
 
     missing = [k for k, v in {
@@ -0,0 +1,226 @@
+from __future__ import annotations
+
+import asyncio
+import bisect
+import logging
+import time
+from contextlib import contextmanager
+from typing import Any, Callable, Iterator, Optional
+
+logger = logging.getLogger(__name__)
+
+# 지연 시간용 기본 버킷 (초)
+DEFAULT_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+LabelValues = tuple[str, ...]
+
+
+def _fmt_labels(names: tuple[str, ...], values: LabelValues, extra: str = "") -> str:
+    parts = [f'{n}="{_escape(v)}"' for n, v in zip(names, values)]
+    if extra:
+        parts.append(extra)
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+
+def _escape(v: str) -> str:
+    return str(v).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _fmt_value(v: float) -> str:
+    if v == float("inf"):
+        return "+Inf"
+    return repr(float(v)) if not float(v).is_integer() else str(int(v))
+
+
+class Registry:
+    """Prometheus text format(0.0.4) 렌더링용 최소 레지스트리"""
+
+    def __init__(self):
+        self._metrics: dict[str, _Metric] = {}
+
+    def register(self, metric: _Metric) -> None:
+        if metric.name in self._metrics:
+            raise ValueError(f"Duplicate metric: {metric.name}")
+        self._metrics[metric.name] = metric
+
+    def render(self) -> str:
+        lines: list[str] = []
+        for m in self._metrics.values():
+            lines.append(f"# HELP {m.name} {m.help}")
+            lines.append(f"# TYPE {m.name} {m.kind}")
+            lines.extend(m.samples())
+        return "\n".join(lines) + "\n"
+
+
+REGISTRY = Registry()
+
+
+class _Metric:
+    kind = "untyped"
+
+    def __init__(self, name: str, help: str, labelnames: tuple[str, ...] = (), registry: Registry = REGISTRY):
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labelnames)
+        registry.register(self)
+
+    def _key(self, labels: tuple) -> LabelValues:
+        if len(labels) != len(self.labelnames):
+            raise ValueError(f"{self.name}: expected labels {self.labelnames}, got {labels}")
+        return tuple(str(v) for v in labels)
+
+    def samples(self) -> list[str]:
+        raise NotImplementedError
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def __init__(self, *args: Any, **kwargs: Any):
+        super().__init__(*args, **kwargs)
+        self._values: dict[LabelValues, float] = {}
+
+    def inc(self, *labels: Any, amount: float = 1.0) -> None:
+        key = self._key(labels)
+        self._values[key] = self._values.get(key, 0.0) + amount
+
+    def samples(self) -> list[str]:
+        return [
+            f"{self.name}{_fmt_labels(self.labelnames, k)} {_fmt_value(v)}"
+            for k, v in self._values.items()
+        ]
+
+
+class Gauge(_Metric):
+    """set()으로 값을 넣거나, fn을 주면 scrape 시점에 계산 (라벨 없는 경우)"""
+    kind = "gauge"
+
+    def __init__(self, *args: Any, fn: Optional[Callable[[], float]] = None, **kwargs: Any):
+        super().__init__(*args, **kwargs)
+        self._values: dict[LabelValues, float] = {}
+        self._fn = fn
+
+    def set_function(self, fn: Callable[[], float]) -> None:
+        self._fn = fn
+
+    def set(self, value: float, *labels: Any) -> None:
+        self._values[self._key(labels)] = value
+
+    def samples(self) -> list[str]:
+        if self._fn is not None:
+            try:
+                return [f"{self.name} {_fmt_value(self._fn())}"]
+            except Exception as e:
+                logger.warning(f"Gauge {self.name} callback failed: {e!r}")
+                return []
+        return [
+            f"{self.name}{_fmt_labels(self.labelnames, k)} {_fmt_value(v)}"
+            for k, v in self._values.items()
+        ]
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(self, *args: Any, buckets: tuple[float, ...] = DEFAULT_BUCKETS, **kwargs: Any):
+        super().__init__(*args, **kwargs)
+        self.buckets = tuple(sorted(buckets))
+        # 라벨별 [버킷별 개수..., 합계, 전체 개수]
+        self._values: dict[LabelValues, list[float]] = {}
+
+    def observe(self, value: float, *labels: Any) -> None:
+        key = self._key(labels)
+        v = self._values.get(key)
+        if v is None:
+            v = self._values[key] = [0.0] * (len(self.buckets) + 2)
+        i = bisect.bisect_left(self.buckets, value)
+        if i < len(self.buckets):
+            v[i] += 1
+        v[-2] += value
+        v[-1] += 1
+
+    @contextmanager
+    def time(self, *labels: Any) -> Iterator[None]:
+        t0 = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - t0, *labels)
+
+    def samples(self) -> list[str]:
+        out: list[str] = []
+        for k, v in self._values.items():
+            cumulative = 0.0
+            for b, n in zip(self.buckets, v):
+                cumulative += n
+                le = _fmt_labels(self.labelnames, k, f'le="{_fmt_value(b)}"')
+                out.append(f"{self.name}_bucket{le} {_fmt_value(cumulative)}")
+            inf = _fmt_labels(self.labelnames, k, 'le="+Inf"')
+            out.append(f"{self.name}_bucket{inf} {_fmt_value(v[-1])}")
+            labels = _fmt_labels(self.labelnames, k)
+            out.append(f"{self.name}_sum{labels} {_fmt_value(v[-2])}")
+            out.append(f"{self.name}_count{labels} {_fmt_value(v[-1])}")
+        return out
+
+
+# 이벤트 루프 지연: 일정 주기로 sleep 하고, 예정보다 늦게 깨어난 만큼을 기록
+EVENT_LOOP_LAG = Histogram(
+    "ari_worker_event_loop_lag_seconds",
+    "Delay between scheduled and actual wakeup of the event loop probe",
+    buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 5.0),
+)
+
+
+async def monitor_event_loop_lag(interval: float = 0.5) -> None:
+    loop = asyncio.get_running_loop()
+    while True:
+        t0 = loop.time()
+        await asyncio.sleep(interval)
+        EVENT_LOOP_LAG.observe(max(loop.time() - t0 - interval, 0.0))
+
+
+class MetricsServer:
+    """GET /metrics 만 처리하는 최소 HTTP 서버 (asyncio.start_server)"""
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 9108, registry: Registry = REGISTRY):
+        self.host = host
+        self.port = port
+        self._registry = registry
+        self._server: Optional[asyncio.base_events.Server] = None
+
+    async def start(self) -> None:
+        self._server = await asyncio.start_server(self._handle, self.host, self.port)
+        logger.info(f"Metrics endpoint: http://{self.host}:{self.port}/metrics")
+
+    async def close(self) -> None:
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+            self._server = None
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            request_line = await asyncio.wait_for(reader.readline(), timeout=5.0)
+            # 헤더는 읽고 버린다
+            while True:
+                line = await asyncio.wait_for(reader.readline(), timeout=5.0)
+                if line in (b"\r\n", b"\n", b""):
+                    break
+
+            parts = request_line.decode("latin-1").split()
+            if len(parts) >= 2 and parts[0] == "GET" and parts[1].split("?")[0] == "/metrics":
+                status, ctype = "200 OK", "text/plain; version=0.0.4; charset=utf-8"
+                body = self._registry.render().encode("utf-8")
+            else:
+                status, ctype, body = "404 Not Found", "text/plain", b"not found\n"
+
+            writer.write(
+                f"HTTP/1.1 {status}\r\nContent-Type: {ctype}\r\n"
+                f"Content-Length: {len(body)}\r\nConnection: close\r\n\r\n".encode("latin-1")
+                + body
+            )
+            await writer.drain()
+        except Exception as e:
+            logger.warning(f"Metrics request failed: {e!r}")
+        finally:
+            writer.close()
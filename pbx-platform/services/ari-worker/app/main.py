@@ -1,23 +1,98 @@
 from __future__ import annotations
 
 import asyncio
-import json
+import tempfile
+import time
 import websockets
 import logging
 
 from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
 
+from pbx_common.log import setup_logging, shutdown_logging
+
 from app.core.config import load_settings
 from app.ari.client import AriClient
-from app.ari.parser import parse_event
+from app.ari.parser import JSON_BACKEND, JSONDecodeError, decode_frame, parse_event
+from app.core.metrics import Counter, Gauge, MetricsServer, monitor_event_loop_lag
 from app.services.call_service import CallService
 from app.services.call_recorder import CallRecorder
+from app.services.call_state import CallStatePublisher, ExtenCompanyCache
+from app.services.customer_resolver import CustomerResolver
+from app.services.dispatcher import EventDispatcher
+from app.services.event_writer import EventWriter, FlushPolicy
+from app.services.ingest import IngestQueue
+from app.services.ingest_policy import Action, IngestPolicy
+from app.services.ownership import PartitionOwnership, partition_of
+from app.services.session_store import SessionSweeper
+from app.services.spool import Spool
 
-logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
+_WS_RECONNECTS = Counter("ari_ws_reconnects_total", "ARI WebSocket reconnect attempts", ("reason",))
+
+
+def _register_gauges(service, ingest, event_writer, spool, policy, publisher, customers) -> None:
+    """scrape 시점에 각 컴포넌트 상태를 읽는 gauge"""
+    Gauge("ari_worker_calls", "Live call sessions", fn=lambda: service.stats()["calls"])
+    Gauge("ari_worker_channel_to_call", "Channel -> call map size", fn=lambda: service.stats()["channel_to_call"])
+    Gauge("ari_worker_channel_to_bridge", "Channel -> bridge map size", fn=lambda: service.stats()["channel_to_bridge"])
+    Gauge("ari_worker_ingest_depth", "Ingest queue depth", fn=lambda: ingest.depth)
+    Gauge("ari_worker_ingest_lag_seconds", "Last ARI timestamp -> dispatch lag", fn=lambda: ingest.lag_last_ms / 1000.0)
+    Gauge("ari_worker_ingest_dropped", "Events dropped by the ingest overflow policy", fn=lambda: sum(ingest.dropped.values()))
+    Gauge("ari_worker_event_writer_depth", "call_events write buffer depth", fn=lambda: event_writer.queue_depth)
+    Gauge("ari_worker_policy_events_seen", "ARI events seen by the ingest policy", fn=lambda: policy.events_seen)
+    Gauge("ari_worker_policy_rows_stored", "call_events rows stored after the ingest policy", fn=lambda: policy.rows_stored)
+    Gauge("ari_worker_policy_bytes_seen", "Raw bytes of ARI events seen", fn=lambda: policy.bytes_seen)
+    Gauge("ari_worker_policy_bytes_stored", "Raw bytes stored after the ingest policy", fn=lambda: policy.bytes_stored)
+    if publisher is not None:
+        Gauge("ari_worker_call_state_published", "Call state deltas sent via NOTIFY", fn=lambda: publisher.published)
+        Gauge("ari_worker_call_state_dropped", "Call state deltas dropped (queue full)", fn=lambda: publisher.dropped)
+    if customers is not None:
+        Gauge("ari_worker_customer_cache_hits", "Caller -> customer cache hits", fn=lambda: customers.hits)
+        Gauge("ari_worker_customer_cache_misses", "Caller -> customer cache misses", fn=lambda: customers.misses)
+    if spool is not None:
+        Gauge("ari_worker_spool_pending_segments", "Spool segments waiting for replay", fn=lambda: spool.pending_segments)
+
+async def _log_stats(components: dict, interval: float = 60.0) -> None:
+    while True:
+        await asyncio.sleep(interval)
+        for name, comp in components.items():
+            logger.info(f"{name} stats: {comp.stats()}")
+
+async def _rehydrate(service: CallService, owns) -> None:
+    """ARI 채널/브릿지 + 미종료 calls 행으로 메모리 상태 복구 (소요 시간 기록)"""
+    t0 = time.perf_counter()
+    try:
+        result = await service.rehydrate(owns=owns)
+    except Exception as e:
+        logger.error(f"State rehydration failed: {e!r}")
+        return
+    elapsed = (time.perf_counter() - t0) * 1000.0
+    logger.info(f"State rehydrated in {elapsed:.1f}ms: {result}")
+
+async def _apply_event_filter(ari: AriClient, ignored: list[str]) -> None:
+    """
+    ignore 타입은 ARI 구독 단계에서부터 제외 시도
+    Stasis 앱은 WebSocket이 연결되어야 등록되므로 연결(재연결 포함)할 때마다 적용한다.
+    """
+    if not ignored:
+        return
+    try:
+        if await ari.set_event_filter(ignored):
+            logger.info(f"ARI event filter applied (disallowed: {ignored})")
+        else:
+            logger.info("ARI event filter not supported; ignoring events on receive")
+    except Exception as e:
+        logger.warning(f"ARI event filter failed: {e!r}; ignoring events on receive")
+
 async def run() -> None:
     settings = load_settings()
+    setup_logging(
+        "ari-worker",
+        level=settings.log_level,
+        fmt=settings.log_format,
+        sample_rate=settings.log_sample_rate,
+    )
 
     ari = AriClient(
         ari_base=settings.ari_base,
@@ -28,13 +103,130 @@ async def run() -> None:
     # 루프 밖에서 한번만 실행하여 연결을 재사용
     await ari.start()
 
+    # 이벤트 타입별 적재 정책 (ignore 타입의 ARI 구독 제외는 WebSocket 연결마다 적용)
+    try:
+        policy = IngestPolicy.from_spec(settings.event_policy)
+    except ValueError as e:
+        raise SystemExit(f"Invalid env: EVENT_POLICY ({e})")
+
     engine = create_async_engine(settings.database_url, echo=False, pool_pre_ping=True)
     SessionLocal = async_sessionmaker(bind=engine, expire_on_commit=False)
 
-    recorder = CallRecorder(SessionLocal)
-    service =  CallService(ari=ari, recorder=recorder)
+    # DB 쓰기 실패분을 로컬 디스크에 보관했다가 복구 후 재생
+    spool = None
+    if settings.spool_dir:
+        spool = Spool(
+            settings.spool_dir,
+            segment_bytes=settings.spool_segment_mb * 1024 * 1024,
+            fsync_ms=settings.spool_fsync_ms,
+            replay_interval=settings.spool_replay_sec,
+        )
+
+    event_writer = EventWriter(
+        SessionLocal,
+        FlushPolicy(
+            max_rows=settings.event_flush_rows,
+            max_delay_ms=settings.event_flush_ms,
+            queue_max=settings.event_queue_max,
+        ),
+        raw_mode=settings.event_raw_mode,
+        spool=spool,
+    )
+    event_writer.start()
+
+    # 내선 -> 회사 (상태 알림과 고객 조회가 같이 사용)
+    companies = ExtenCompanyCache(SessionLocal, ttl=settings.exten_cache_ttl_sec)
+
+    # 콜 상태 변경을 NOTIFY로 API에 알림 (/ws/calls)
+    publisher = None
+    if settings.call_state_notify:
+        publisher = CallStatePublisher(
+            engine,
+            companies,
+            queue_max=settings.call_state_queue_max,
+        )
+        publisher.start()
 
-    logger.info(f"Starting  ARI Worker for app: {settings.ari_app}")
+    # StasisStart 발신 번호 -> 고객 (calls.customer_id + last_call_at 묶음 갱신)
+    customers = None
+    if settings.customer_resolve:
+        customers = CustomerResolver(
+            SessionLocal,
+            companies,
+            ttl=settings.customer_cache_ttl_sec,
+            flush_interval=settings.customer_touch_flush_sec,
+        )
+        customers.start()
+
+    recorder = CallRecorder(SessionLocal, event_writer=event_writer, spool=spool, publisher=publisher)
+    if spool is not None:
+        spool.start(recorder.apply_spooled)
+    service =  CallService(ari=ari, recorder=recorder, policy=policy, customers=customers)
+
+    # hangup을 놓친 세션 정리 (ARI에 채널이 남아 있으면 유지)
+    sweeper = SessionSweeper(
+        service.sessions,
+        list_channels=ari.list_channels,
+        evict=service.expire_session,
+        ttl=settings.session_ttl_sec,
+        interval=settings.session_sweep_sec,
+    )
+    sweeper.start()
+
+    dispatcher = EventDispatcher(
+        handler=service.handle_event,
+        key_func=service.routing_key,
+        shards=settings.dispatch_shards,
+        mailbox_size=settings.shard_mailbox_size,
+    )
+    dispatcher.start()
+
+    # 리더는 ingest 큐에 넣기만 하고 다음 프레임을 읽는다 (DB 지연이 소켓까지 번지지 않게)
+    drop_types = [t.strip() for t in settings.ingest_drop_types.split(",") if t.strip()]
+    ingest = IngestQueue(
+        dispatcher.dispatch,
+        maxsize=settings.ingest_queue_max,
+        overflow=settings.ingest_overflow,
+        droppable=drop_types or None,
+        spill_dir=settings.ingest_spill_dir or tempfile.gettempdir(),
+    )
+    ingest.start()
+
+    # 다중 인스턴스: 내가 소유한 파티션의 콜 이벤트만 처리
+    ownership = PartitionOwnership(
+        engine,
+        partitions=settings.cluster_partitions,
+        rebalance_interval=settings.cluster_rebalance_sec,
+        is_busy=lambda p: service.has_calls_in_partition(p, settings.cluster_partitions),
+        on_acquired=lambda parts: _rehydrate(
+            service,
+            owns=lambda key: partition_of(key, settings.cluster_partitions) in parts,
+        ),
+    )
+    await ownership.start()
+    metrics_server = None
+    loop_lag_task = None
+    if settings.metrics_port:
+        _register_gauges(service, ingest, event_writer, spool, policy, publisher, customers)
+        metrics_server = MetricsServer(settings.metrics_host, settings.metrics_port)
+        await metrics_server.start()
+        loop_lag_task = asyncio.create_task(monitor_event_loop_lag())
+
+    stats_task = asyncio.create_task(_log_stats({
+        "Call service": service,
+        "Ingest policy": policy,
+        "Session sweeper": sweeper,
+        "Ingest": ingest,
+        "Event writer": event_writer,
+        "Dispatcher": dispatcher,
+        "Call recorder": recorder,
+        "Ownership": ownership,
+        **({"Call state": publisher} if publisher is not None else {}),
+        **({"Customer resolver": customers} if customers is not None else {}),
+        **({"Spool": spool} if spool is not None else {}),
+    }))
+
+    logger.info(f"Starting  ARI Worker for app: {settings.ari_app} (json: {JSON_BACKEND})")
 
     try:
         while True: # 성공까지 무한루프 
@@ -43,21 +235,40 @@ async def run() -> None:
 
                 async with websockets.connect(settings.ws_url) as ws:
                     logger.info("ARI WebSocket connected!")
-                    
+                    await _apply_event_filter(ari, policy.ignored_types())
+
+                    # 끊긴 동안의 이벤트는 유실 -> 이전 연결에서 받은 이벤트를 모두 처리한 뒤
+                    # 현재 ARI/DB 상태로 맵을 다시 맞추고 나서 새 이벤트를 소비한다
+                    await ingest.drain()
+                    await dispatcher.drain()
+                    await _rehydrate(service, owns=ownership.owns)
+
                     # 연결 성공 시 AriClient 시작 
                     async for message in ws:
                         try: 
-                            raw = json.loads(message)
-                            ev = parse_event(raw)
+                            raw = decode_frame(message)
+                            ev = parse_event(raw, raw_text=message)
+
+                            # 다른 워커 소유 / 소유자 없는 파티션 이벤트는 사유별로 센다 (Ownership stats)
+                            if not ownership.accept(service.routing_key(ev)):
+                                continue
+
+                            # ignore 타입은 큐/디스패처를 거치지 않고 버린다
+                            if policy.action_for(ev.etype) is Action.IGNORE:
+                                policy.account(ev, Action.IGNORE)
+                                continue
 
-                            await service.handle_event(ev)
-                        except json.JSONDecodeError:
+                            # 가득 차면 overflow 정책에 따라 대기/버림/spill
+                            await ingest.put(ev)
+                        except JSONDecodeError:
                             logger.error(f"Invalid JSON: {message}")
                         except Exception as e:
                             logger.error(f"Error handling event: {e}")
             except (websockets.ConnectionClosed, ConnectionRefusedError) as e:
+                _WS_RECONNECTS.inc(type(e).__name__)
                 logger.warning(f"Connection lost/refused: {e}. Retrying in 3s...")
             except Exception as e:
+                _WS_RECONNECTS.inc("error")
                 logger.error(f"Unexpected error: {e}. Retrying in 3s...")
 
             # 재 연결전 대기(Backoff)
@@ -66,9 +277,31 @@ async def run() -> None:
     finally:
         # 프로그램 종료 시 자원 정리
         logger.info("Shutting down worker...")
+        stats_task.cancel()
+        if loop_lag_task is not None:
+            loop_lag_task.cancel()
+        if metrics_server is not None:
+            await metrics_server.close()
+        await sweeper.close()
+        await ownership.close()
+        await ingest.close()
+        # 샤드 mailbox에 남은 이벤트 처리 -> 그 결과로 쌓인 call_events flush 순서
+        await dispatcher.close()
+        logger.info(f"Dispatcher drained: {dispatcher.stats()}")
+        # 버퍼에 남은 이벤트를 모두 적재한 뒤 DB 연결을 닫는다
+        await event_writer.close()
+        logger.info(f"Event writer drained: {event_writer.stats()}")
+        if publisher is not None:
+            await publisher.close()
+        if customers is not None:
+            await customers.close()
+        # 재생하지 못한 레코드는 디스크에 남겨 다음 실행에서 재생
+        if spool is not None:
+            await spool.close()
         await ari.close()
         await engine.dispose()
         logger.info("Goodbye!")
+        shutdown_logging()
 
 if __name__ == "__main__":
 
@@ -1,43 +1,304 @@
 from __future__ import annotations
 
+import logging
 import uuid
-from datetime import datetime
-from typing import Optional
+from collections import OrderedDict
+from datetime import datetime, timedelta
+from typing import Any, Optional
 
-from sqlalchemy import select, update
+from sqlalchemy import TIMESTAMP, Integer, Text, and_, case, cast, column, func, or_, select, update, values
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
 
 from pbx_common.models import Call, CallEvent
 
+from app.core.metrics import Histogram
+from app.services.call_state import CallStatePublisher
+from app.services.event_writer import EventWriter, created_at_floor, insert_event_rows
+from app.services.spool import SPOOL_CALL, SPOOL_CALL_UPDATE, SPOOL_EVENT, Spool, SpoolRecord, iter_kind
+
+logger = logging.getLogger(__name__)
+
+_DB_LATENCY = Histogram("call_recorder_db_seconds", "CallRecorder DB round trip latency", ("method",))
+
+# 상태 전이 순서: new -> up -> ended/failed (종료 상태는 되돌리지 않는다)
+TERMINAL_STATUSES = ("ended", "failed")
+_STATUS_RANK = {"new": 0, "up": 1, "ended": 2, "failed": 2}
+
+
+class CallRow:
+    """
+    calls 행의 워커 측 누적 상태
+
+    상태가 실제로 바뀔 때만 전체 행을 한 번 upsert 하고,
+    같은 전이(중복 종료, 종료 이후의 늦은 이벤트 등)는 DB 쓰기 없이 무시한다.
+    (응답된 콜의 calls 쓰기: 생성 1회 + 응답 1회 + 종료 1회)
+    """
+    __slots__ = (
+        "call_id", "status", "direction",
+        "caller_exten", "callee_exten", "customer_id",
+        "caller_channel_id", "callee_channel_id", "bridge_id",
+        "started_at", "answered_at", "ended_at",
+        "hangup_cause", "hangup_reason",
+        "ring_ms", "talk_ms", "hangup_party",
+    )
+
+    def __init__(self, call_id: uuid.UUID):
+        self.call_id = call_id
+        self.status = "new"
+        self.direction = "internal"
+        self.caller_exten: Optional[str] = None
+        self.callee_exten: Optional[str] = None
+        self.customer_id: Optional[int] = None
+        self.caller_channel_id: Optional[str] = None
+        self.callee_channel_id: Optional[str] = None
+        self.bridge_id: Optional[str] = None
+        self.started_at: Optional[datetime] = None
+        self.answered_at: Optional[datetime] = None
+        self.ended_at: Optional[datetime] = None
+        self.hangup_cause: Optional[int] = None
+        self.hangup_reason: Optional[str] = None
+        self.ring_ms: Optional[int] = None
+        self.talk_ms: Optional[int] = None
+        self.hangup_party: Optional[str] = None
+
+    @property
+    def is_terminal(self) -> bool:
+        return self.status in TERMINAL_STATUSES
+
+    def values(self) -> dict[str, Any]:
+        return {
+            "id": self.call_id,
+            "status": self.status,
+            "direction": self.direction,
+            "caller_exten": self.caller_exten,
+            "callee_exten": self.callee_exten,
+            "customer_id": self.customer_id,
+            "caller_channel_id": self.caller_channel_id,
+            "callee_channel_id": self.callee_channel_id,
+            "bridge_id": self.bridge_id,
+            "started_at": self.started_at,
+            "answered_at": self.answered_at,
+            "ended_at": self.ended_at,
+            "hangup_cause": self.hangup_cause,
+            "hangup_reason": self.hangup_reason,
+            "ring_ms": self.ring_ms,
+            "talk_ms": self.talk_ms,
+            "hangup_party": self.hangup_party,
+        }
+
+    def on_answered(self) -> None:
+        self.ring_ms = _ms_between(self.started_at, self.answered_at)
+
+    def on_ended(self) -> None:
+        """종료 시 1회: 미응답 콜은 종료까지를 ring으로 본다"""
+        if self.ring_ms is None:
+            self.ring_ms = _ms_between(self.started_at, self.answered_at or self.ended_at)
+        self.talk_ms = _ms_between(self.answered_at, self.ended_at) if self.answered_at else 0
+
+
+def _ms_between(start: Optional[datetime], end: Optional[datetime]) -> Optional[int]:
+    if start is None or end is None:
+        return None
+    return max(0, int((end - start).total_seconds() * 1000))
+
+
+def _sql_ms_between(start, end):
+    return func.greatest(0, cast(func.extract("epoch", end - start) * 1000, Integer))
+
+
+def _end_metrics(ended_at) -> dict[str, Any]:
+    """누적 상태가 없는 행의 종료 지표: 행에 있는 started_at/answered_at 기준으로 SQL에서 계산"""
+    return {
+        "ring_ms": func.coalesce(
+            Call.ring_ms,
+            _sql_ms_between(Call.started_at, func.coalesce(Call.answered_at, ended_at)),
+        ),
+        "talk_ms": case(
+            (Call.answered_at.is_(None), 0),
+            else_=_sql_ms_between(Call.answered_at, ended_at),
+        ),
+    }
+
+
+def _upsert_stmt(values: dict[str, Any]):
+    """
+    전체 행 upsert
+    - 이미 종료된 행의 status는 유지
+    - 종료 정보(ended_at/hangup_*)는 먼저 기록된 값을 유지 (first hangup wins)
+    """
+    stmt = pg_insert(Call).values(**values)
+    ex = stmt.excluded
+    return stmt.on_conflict_do_update(
+        index_elements=[Call.id],
+        set_={
+            "status": case((Call.status.in_(TERMINAL_STATUSES), Call.status), else_=ex.status),
+            "caller_exten": func.coalesce(ex.caller_exten, Call.caller_exten),
+            "callee_exten": func.coalesce(ex.callee_exten, Call.callee_exten),
+            "customer_id": func.coalesce(Call.customer_id, ex.customer_id),
+            "caller_channel_id": func.coalesce(ex.caller_channel_id, Call.caller_channel_id),
+            "callee_channel_id": func.coalesce(ex.callee_channel_id, Call.callee_channel_id),
+            "bridge_id": func.coalesce(ex.bridge_id, Call.bridge_id),
+            "started_at": func.coalesce(Call.started_at, ex.started_at),
+            "answered_at": func.coalesce(Call.answered_at, ex.answered_at),
+            "ended_at": func.coalesce(Call.ended_at, ex.ended_at),
+            "hangup_cause": case((Call.ended_at.is_(None), ex.hangup_cause), else_=Call.hangup_cause),
+            "hangup_reason": case((Call.ended_at.is_(None), ex.hangup_reason), else_=Call.hangup_reason),
+            "ring_ms": func.coalesce(Call.ring_ms, ex.ring_ms),
+            "talk_ms": case((Call.ended_at.is_(None), ex.talk_ms), else_=Call.talk_ms),
+            "hangup_party": case((Call.ended_at.is_(None), ex.hangup_party), else_=Call.hangup_party),
+        },
+    )
+
+
+def _guarded_update_stmt(call_id: uuid.UUID, values: dict[str, Any]):
+    """
+    누적 상태가 없는 콜 갱신: 이미 종료된 행은 건드리지 않는다
+    응답/종료 시각이 있으면 ring/talk 지표도 같은 UPDATE에서 계산한다.
+    """
+    metrics: dict[str, Any] = {}
+    if values.get("answered_at") is not None:
+        metrics["ring_ms"] = _sql_ms_between(Call.started_at, values["answered_at"])
+    if values.get("ended_at") is not None:
+        metrics.update(_end_metrics(values["ended_at"]))
+    return (
+        update(Call)
+        .where(Call.id == call_id, Call.status.notin_(TERMINAL_STATUSES))
+        .values(**values, **metrics)
+    )
+
+
 class CallRecorder:
-    def __init__(self, session_factory: async_sessionmaker[AsyncSession]):
+    def __init__(
+            self,
+            session_factory: async_sessionmaker[AsyncSession],
+            event_writer: Optional[EventWriter] = None,
+            spool: Optional[Spool] = None,
+            publisher: Optional[CallStatePublisher] = None,
+            recent_terminal_max: int = 10000,
+    ):
         self._SessionLocal = session_factory
+        self._event_writer = event_writer
+        # DB 쓰기 실패 시 행을 보관할 로컬 spool (없으면 예외를 그대로 올린다)
+        self._spool = spool
+        # 상태 변경 알림 (ringing/up/ended -> NOTIFY)
+        self._publisher = publisher
+
+        # 진행 중인 콜의 누적 상태 (종료 시 제거)
+        self._rows: dict[uuid.UUID, CallRow] = {}
+        # 최근 종료된 콜 (같은 콜의 늦은 종료 이벤트가 조건부 UPDATE로 다시 쓰지 않도록)
+        self._terminal: OrderedDict[uuid.UUID, None] = OrderedDict()
+        self.recent_terminal_max = recent_terminal_max
+
+        # 메트릭
+        self.call_writes = 0
+        self.call_writes_skipped = 0
+        self.call_writes_spooled = 0
+
+    def _spool_or_raise(self, kind: str, payload: dict[str, Any], err: Exception) -> None:
+        if self._spool is None:
+            raise err
+        self._spool.append(kind, payload)
+        self.call_writes_spooled += 1
+        logger.warning(f"calls write failed, spooled ({kind}): {err!r}")
+
+    async def _write_row(self, row: CallRow, method: str) -> None:
+        values = row.values()
+        try:
+            with _DB_LATENCY.time(method):
+                async with self._SessionLocal() as s:
+                    await s.execute(_upsert_stmt(values))
+                    await s.commit()
+        except Exception as e:
+            self._spool_or_raise(SPOOL_CALL, values, e)
+            return
+        self.call_writes += 1
+
+    def _remember_terminal(self, call_id: uuid.UUID) -> None:
+        self._terminal[call_id] = None
+        if len(self._terminal) > self.recent_terminal_max:
+            self._terminal.popitem(last=False)
+
+    def _recently_terminal(self, call_id: uuid.UUID) -> bool:
+        if call_id in self._terminal:
+            self.call_writes_skipped += 1
+            return True
+        return False
+
+    def _publish(self, row: CallRow) -> None:
+        if self._publisher is not None:
+            self._publisher.publish(row.call_id, row.status, row.caller_exten, row.callee_exten, row.hangup_party)
+
+    async def _transition(self, row: CallRow, status: str, method: str) -> bool:
+        """
+        상태 전이 -> 실제로 바뀐 경우에만 upsert 1회
+        반환값: DB에 기록했는지 여부
+        """
+        if row.is_terminal or _STATUS_RANK[status] <= _STATUS_RANK[row.status]:
+            self.call_writes_skipped += 1
+            return False
+
+        row.status = status
+        if row.is_terminal:
+            self._rows.pop(row.call_id, None)
+            self._remember_terminal(row.call_id)
+        await self._write_row(row, method)
+        self._publish(row)
+        return True
 
     async def ensure_call_row(
-            self, 
+            self,
             call_id: uuid.UUID,
             caller_exten: Optional[str],
             callee_exten: Optional[str],
             caller_channel_id: Optional[str],
+            started_at: Optional[datetime] = None,
+            customer_id: Optional[int] = None,
     ) -> None:
-        async with self._SessionLocal() as s:
-            exists = await s.execute(select(Call.id).where(Call.id == call_id))
-            if exists.scalar_one_or_none():
-                return
-            
-            s.add(
-                Call(
-                    id=call_id,
-                    caller_exten=caller_exten,
-                    callee_exten=callee_exten,
-                    caller_channel_id=caller_channel_id,
-                    status="new",
-                    direction="internal",
-                    started_at=datetime.now().astimezone(),
-                )
-            )
-            await s.commit()
-    
+        if call_id in self._rows:
+            return
+
+        row = CallRow(call_id)
+        row.caller_exten = caller_exten
+        row.callee_exten = callee_exten
+        row.customer_id = customer_id
+        row.caller_channel_id = caller_channel_id
+        row.started_at = started_at or datetime.now().astimezone()
+        self._rows[call_id] = row
+
+        # SELECT 후 INSERT 대신 upsert 한 번
+        await self._write_row(row, "ensure_call_row")
+        self._publish(row)
+
+    async def set_customer(self, call_id: uuid.UUID, customer_id: int) -> None:
+        """
+        발신 번호로 찾은 고객 연결 (originate와 동시에 조회한 결과)
+        진행 중인 콜은 메모리에만 반영하고 다음 calls 쓰기(응답 또는 종료 upsert)에 함께 기록한다.
+        조회가 끝나기 전에 이미 종료 기록된 콜만 UPDATE 1회.
+        """
+        row = self._rows.get(call_id)
+        if row is not None:
+            if row.customer_id is None:
+                row.customer_id = customer_id
+            return
+        if call_id not in self._terminal:
+            return
+
+        try:
+            with _DB_LATENCY.time("set_customer"):
+                async with self._SessionLocal() as s:
+                    await s.execute(
+                        update(Call)
+                        .where(Call.id == call_id, Call.customer_id.is_(None))
+                        .values(customer_id=customer_id)
+                    )
+                    await s.commit()
+        except Exception as e:
+            # 고객 연결은 콜 처리에 필수가 아니므로 spool하지 않는다
+            logger.warning(f"customer link failed: {e!r}")
+            return
+        self.call_writes += 1
+
     async def add_event(
             self,
             call_id: Optional[uuid.UUID],
@@ -46,52 +307,104 @@ class CallRecorder:
             channel_id: Optional[str],
             bridge_id: Optional[str],
             raw: dict,
+            raw_text: Optional[str] = None,
     ) -> None:
-        async with self._SessionLocal() as s:
-            s.add(
-                CallEvent(
-                    call_id=call_id,
-                    ts=ts,
-                    type=etype,
-                    channel_id=channel_id,
-                    bridge_id=bridge_id,
-                    raw=raw,
-                )
-            )
-            await s.commit()
-    
+        # 배치 writer가 있으면 큐에 적재만 하고 즉시 반환
+        w = self._event_writer
+        if w is not None:
+            row = {
+                "call_id": call_id,
+                "ts": ts,
+                "type": etype,
+                "channel_id": channel_id,
+                "bridge_id": bridge_id,
+            }
+            # 원본 프레임이 있으면 dict는 버퍼에 보관하지 않는다 (핸들링 후 바로 해제)
+            if w.raw_passthrough and raw_text is not None:
+                row["raw_text"] = raw_text
+            else:
+                row["raw"] = raw
+            await w.put(row)
+            return
+
+        try:
+            with _DB_LATENCY.time("add_event"):
+                async with self._SessionLocal() as s:
+                    s.add(
+                        CallEvent(
+                            call_id=call_id,
+                            ts=ts,
+                            type=etype,
+                            channel_id=channel_id,
+                            bridge_id=bridge_id,
+                            raw=raw,
+                        )
+                    )
+                    await s.commit()
+        except Exception as e:
+            self._spool_or_raise(SPOOL_EVENT, {
+                "call_id": call_id,
+                "ts": ts,
+                "type": etype,
+                "channel_id": channel_id,
+                "bridge_id": bridge_id,
+                "raw": raw,
+            }, e)
+
     async def mark_failed(self, call_id: uuid.UUID, reason: str,) -> None:
-        async with self._SessionLocal() as s:
-            await s.execute(
-                update(Call)
-                .where(Call.id == call_id)
-                .values(
-                    status="failed",
-                    hangup_reason=reason,
-                    ended_at=datetime.now().astimezone(),
-                )
+        row = self._rows.get(call_id)
+        if row is None:
+            if self._recently_terminal(call_id):
+                return
+            # 누적 상태가 없는 콜 (재시작 이전 콜 등) -> 종료되지 않은 경우에만 갱신
+            await self._update_unknown(
+                call_id,
+                "mark_failed",
+                status="failed",
+                hangup_reason=reason,
+                hangup_party="system",
+                ended_at=datetime.now().astimezone(),
             )
-            await s.commit()
-    
+            return
+
+        if not row.is_terminal:
+            row.hangup_reason = reason
+            row.hangup_party = "system"
+            row.ended_at = datetime.now().astimezone()
+            row.on_ended()
+        await self._transition(row, "failed", "mark_failed")
+
     async def mark_ended(
             self,
             call_id: uuid.UUID,
             ended_at: Optional[datetime] = None,
             hangup_cause: Optional[int] = None,
             hangup_reason: Optional[str] =None,
+            hangup_party: Optional[str] = "system",
     ) -> None:
-        async with self._SessionLocal() as s:
-            await s.execute(
-                update(Call)
-                .where(Call.id == call_id)
-                .values(
-                    ended_at=ended_at or datetime.now().astimezone(),
-                    hangup_cause=hangup_cause,
-                    hangup_reason=hangup_reason,
-                    status="ended",
-                )
+        row = self._rows.get(call_id)
+        if row is None:
+            if self._recently_terminal(call_id):
+                return
+            await self._update_unknown(
+                call_id,
+                "mark_ended",
+                status="ended",
+                ended_at=ended_at or datetime.now().astimezone(),
+                hangup_cause=hangup_cause,
+                hangup_reason=hangup_reason,
+                hangup_party=hangup_party,
             )
-            await s.commit()
+            return
+
+        # 첫 번째 종료 이벤트의 시각/원인/주체만 기록 (이후 중복 종료는 무시)
+        if not row.is_terminal:
+            row.ended_at = ended_at or datetime.now().astimezone()
+            row.hangup_cause = hangup_cause
+            row.hangup_reason = hangup_reason
+            row.hangup_party = hangup_party
+            row.on_ended()
+        await self._transition(row, "ended", "mark_ended")
 
     async def mark_bridged(
             self,
@@ -99,17 +412,181 @@ class CallRecorder:
             bridge_id: str,
             caller_channel_id: str,
             callee_channel_id: str,
+            answered_at: Optional[datetime] = None,
     ) -> None:
-        async with self._SessionLocal() as s:
-            await s.execute(
-                update(Call)
-                .where(Call.id == call_id)
-                .values(
-                    bridge_id=bridge_id,
-                    caller_channel_id=caller_channel_id,
-                    callee_channel_id=callee_channel_id,
-                    status="up",
-                    answered_at=datetime.now().astimezone(),
+        answered_at = answered_at or datetime.now().astimezone()
+        row = self._rows.get(call_id)
+        if row is None:
+            if self._recently_terminal(call_id):
+                return
+            await self._update_unknown(
+                call_id,
+                "mark_bridged",
+                bridge_id=bridge_id,
+                caller_channel_id=caller_channel_id,
+                callee_channel_id=callee_channel_id,
+                status="up",
+                answered_at=answered_at,
+            )
+            return
+
+        if row.status == "new":
+            row.bridge_id = bridge_id
+            row.caller_channel_id = caller_channel_id
+            row.callee_channel_id = callee_channel_id
+            row.answered_at = answered_at
+            row.on_answered()
+        await self._transition(row, "up", "mark_bridged")
+
+    async def load_open_calls(self, max_age_hours: int = 24) -> list[Call]:
+        """
+        재접속/재시작 복구용: 아직 종료되지 않은 calls 행
+        (created_at 인덱스로 최근 구간만 본다)
+        """
+        since = datetime.now().astimezone() - timedelta(hours=max_age_hours)
+        with _DB_LATENCY.time("load_open_calls"):
+            async with self._SessionLocal() as s:
+                res = await s.execute(
+                    select(Call).where(
+                        Call.created_at >= since,
+                        Call.status.notin_(TERMINAL_STATUSES),
+                        Call.ended_at.is_(None),
+                    )
                 )
+                return list(res.scalars().all())
+
+    def adopt(self, call: Call, bridged: bool = False, answered_at: Optional[datetime] = None) -> None:
+        """
+        DB에서 읽은 진행 중 콜을 누적 상태로 복원 (이미 있으면 유지)
+        bridged: ARI에 브릿지가 남아 있는 콜 -> 응답 기록이 유실된(spool 미반영 등) 행이면 여기서 up으로 복원
+        answered_at: 응답 시각 (브릿지 생성 시각)
+        """
+        if call.id in self._rows:
+            return
+        row = CallRow(call.id)
+        for name in CallRow.__slots__:
+            if name != "call_id":
+                setattr(row, name, getattr(call, name))
+        if bridged and row.status == "new":
+            row.status = "up"
+            row.answered_at = answered_at
+            row.on_answered()
+        self._rows[call.id] = row
+
+    async def close_orphans(self, call_ids: list[uuid.UUID], reason: str) -> int:
+        """
+        채널이 모두 사라진 진행 중 콜을 UPDATE 한 번으로 종료 처리
+        DB 쓰기가 실패하면 콜별 조건부 UPDATE로 spool하고, 메모리 상태는 기록(또는 spool)된 뒤에만 바꾼다.
+        """
+        if not call_ids:
+            return 0
+        values = {
+            "status": "ended",
+            "ended_at": datetime.now().astimezone(),
+            "hangup_reason": reason,
+            "hangup_party": "system",
+        }
+        try:
+            with _DB_LATENCY.time("close_orphans"):
+                async with self._SessionLocal() as s:
+                    res = await s.execute(
+                        update(Call)
+                        .where(Call.id.in_(call_ids), Call.status.notin_(TERMINAL_STATUSES))
+                        .values(**values, **_end_metrics(values["ended_at"]))
+                    )
+                    await s.commit()
+        except Exception as e:
+            if self._spool is None:
+                raise
+            self._spool.append_many(SPOOL_CALL_UPDATE, [{"id": call_id, "values": dict(values)} for call_id in call_ids])
+            self.call_writes_spooled += len(call_ids)
+            logger.warning(f"close_orphans failed, spooled {len(call_ids)} updates: {e!r}")
+            closed_count = len(call_ids)
+        else:
+            self.call_writes += 1
+            closed_count = res.rowcount or 0
+
+        for call_id in call_ids:
+            row = self._rows.pop(call_id, None)
+            self._remember_terminal(call_id)
+            if row is not None and not row.is_terminal:
+                row.status = "ended"
+                row.hangup_party = "system"
+                self._publish(row)
+        return closed_count
+
+    async def _update_unknown(self, call_id: uuid.UUID, method: str, **values: Any) -> None:
+        try:
+            with _DB_LATENCY.time(method):
+                async with self._SessionLocal() as s:
+                    await s.execute(_guarded_update_stmt(call_id, values))
+                    await s.commit()
+        except Exception as e:
+            self._spool_or_raise(SPOOL_CALL_UPDATE, {"id": call_id, "values": values}, e)
+            return
+        self.call_writes += 1
+
+    async def apply_spooled(self, records: list[SpoolRecord]) -> None:
+        """
+        spool 재생 (멱등)
+        - call_events: (channel_id, ts, type)가 이미 있는 행은 건너뛴다 (NULL끼리도 같은 값으로 비교)
+        - calls: upsert / 조건부 UPDATE 자체가 재실행에 안전하다
+        기록 순서대로 calls 변경을 적용하고, 하나의 트랜잭션으로 커밋한다.
+        """
+        events = list(iter_kind(records, SPOOL_EVENT))
+        async with self._SessionLocal() as s:
+            if events:
+                keys = [(r.get("channel_id"), r.get("ts"), r.get("type")) for r in events]
+                existing = await self._existing_event_keys(s, keys)
+                fresh = [r for r, k in zip(events, keys) if k not in existing]
+                if fresh:
+                    await insert_event_rows(s, fresh)
+
+            for kind, payload in records:
+                if kind == SPOOL_CALL:
+                    await s.execute(_upsert_stmt(payload))
+                elif kind == SPOOL_CALL_UPDATE:
+                    await s.execute(_guarded_update_stmt(payload["id"], payload["values"]))
+            await s.commit()
+
+    @staticmethod
+    async def _existing_event_keys(s: AsyncSession, keys: list[tuple]) -> set[tuple]:
+        """
+        spool의 (channel_id, ts, type) 중 call_events에 이미 있는 키
+        채널 없는 이벤트(브릿지 등)나 ts 없는 이벤트도 비교되도록 IS NOT DISTINCT FROM으로 조인한다.
+        """
+        spooled = values(
+            column("channel_id", Text),
+            column("ts", TIMESTAMP(timezone=True)),
+            column("type", Text),
+            name="spooled",
+        ).data(list(set(keys)))
+
+        # 한 컬럼이 모두 NULL이면 VALUES의 타입을 추론할 수 없으므로 명시적으로 캐스팅
+        stmt = select(CallEvent.channel_id, CallEvent.ts, CallEvent.type).join(
+            spooled,
+            and_(
+                CallEvent.channel_id.is_not_distinct_from(cast(spooled.c.channel_id, Text)),
+                CallEvent.ts.is_not_distinct_from(cast(spooled.c.ts, TIMESTAMP(timezone=True))),
+                CallEvent.type.is_not_distinct_from(cast(spooled.c.type, Text)),
+            ),
+        )
+        # 같은 묶음의 이벤트는 시간대가 같다 -> ts 범위 + created_at 하한으로 파티션/블록을 좁힌다
+        stamps = [k[1] for k in keys if k[1] is not None]
+        if stamps:
+            in_range = CallEvent.ts.between(min(stamps), max(stamps))
+            stmt = stmt.where(
+                CallEvent.created_at >= created_at_floor(min(stamps)),
+                or_(in_range, CallEvent.ts.is_(None)) if len(stamps) < len(keys) else in_range,
             )
-            await s.commit()
\ No newline at end of file
+        res = await s.execute(stmt)
+        return {tuple(r) for r in res.all()}
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "open_rows": len(self._rows),
+            "call_writes": self.call_writes,
+            "call_writes_skipped": self.call_writes_skipped,
+            "recent_terminal": len(self._terminal),
+            "call_writes_spooled": self.call_writes_spooled,
+        }
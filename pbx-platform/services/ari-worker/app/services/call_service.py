@@ -1,102 +1,273 @@
 from __future__ import annotations
 
 import asyncio
+import logging
+import time
 import uuid
-from dataclasses import dataclass
 from datetime import datetime
-from typing import Optional
+from typing import Any, Callable, Optional
+
+from pbx_common.log import bind, log_context
 
 from app.ari.client import AriClient
-from app.ari.parser import ParsedEvent
+from app.ari.parser import EventType, ParsedEvent, parse_ari_timestamp
 from app.services.call_recorder import CallRecorder
+from app.services.customer_resolver import CustomerResolver
+from app.services.ingest_policy import Action, IngestPolicy
+from app.services.ownership import partition_of
+from app.services.session_store import CallSession, SessionStore
 
+logger = logging.getLogger(__name__)
 
 # 통화 제어 서비스
 
-@dataclass
-class CallSession:
-    call_id: uuid.UUID
-    target_exten: str
-    caller_channel_id: str
-    callee_channel_id: Optional[str] = None
-    bridge_id: Optional[str] = None
-    bridged: bool = False
-    done: bool =False
+# callee 채널 ID는 originate 시 caller 채널 ID로부터 미리 지정한다.
+# -> callee StasisStart를 dict 조회 한 번으로 해당 콜에 연결할 수 있고,
+#    두 채널의 이벤트가 같은 라우팅 키(caller 채널 ID)를 갖게 된다.
+# 브릿지 ID도 같은 방식으로 미리 지정한다.
+CALLEE_CHANNEL_SUFFIX = "-callee"
+BRIDGE_SUFFIX = "-bridge"
+
+def callee_channel_id_for(caller_channel_id: str) -> str:
+    return f"{caller_channel_id}{CALLEE_CHANNEL_SUFFIX}"
+
+def bridge_id_for(caller_channel_id: str) -> str:
+    return f"{caller_channel_id}{BRIDGE_SUFFIX}"
+
+def caller_channel_key(object_id: str) -> str:
+    """채널/브릿지 ID -> 해당 콜의 caller 채널 ID (suffix 제거)"""
+    for suffix in (CALLEE_CHANNEL_SUFFIX, BRIDGE_SUFFIX):
+        if object_id.endswith(suffix):
+            return object_id[: -len(suffix)]
+    return object_id
 
 class CallService:
-    def __init__(self, ari: AriClient, recorder: CallRecorder):
+    def __init__(
+            self,
+            ari: AriClient,
+            recorder: CallRecorder,
+            teardown_concurrency: int = 32,
+            policy: Optional[IngestPolicy] = None,
+            customers: Optional[CustomerResolver] = None,
+    ):
         self.ari = ari
         self.recorder = recorder
-        self._lock = asyncio.Lock()
-
-        self._pending_by_exten: dict[str, list[uuid.UUID]] = {}
-        self._calls: dict[uuid.UUID, CallSession] = {}
-        self._channel_to_call: dict[str, uuid.UUID] = {}
-        self._channel_to_bridge: dict[str, str] = {}
+        # 발신 번호 -> 고객 (없으면 calls.customer_id를 채우지 않음)
+        self.customers = customers
+
+        # 이벤트 타입별 적재 정책 (미지정 시 모든 이벤트 원본 적재)
+        self.policy = policy or IngestPolicy.store_all()
+        self.calls_started = 0
+
+        # 종료 처리(hangup/destroy) 동시 요청 상한 -> 대량 종료 시 ARI 폭주 방지
+        self._teardown_sem = asyncio.Semaphore(teardown_concurrency)
+
+        # 이벤트는 채널 단위 샤드에서 처리되므로 전역 락 없이 저장소를 직접 갱신한다.
+        # (asyncio 단일 스레드: await 사이의 dict 연산은 원자적)
+        self.sessions = SessionStore()
+
+        # 이벤트 타입별 핸들러 테이블
+        # pre: 이벤트 적재 전 (call_id 매핑을 먼저 잡아야 하는 것)
+        # post: 이벤트 적재 후 (종료 처리)
+        self._pre_handlers = {
+            EventType.STASIS_START: self._on_stasis_start,
+        }
+        self._post_handlers = {
+            EventType.CHANNEL_HANGUP_REQUEST: self._on_hangup_like,
+            EventType.CHANNEL_DESTROYED: self._on_hangup_like,
+        }
+
+    def routing_key(self, ev: ParsedEvent) -> Optional[str]:
+        """디스패처 샤드 선택용 키: 같은 콜(caller/callee 채널)의 이벤트는 같은 샤드로"""
+        if ev.channel_id:
+            return caller_channel_key(ev.channel_id)
+        b = ev.raw.get("bridge") or {}
+        b_id = b.get("id")
+        return caller_channel_key(b_id) if b_id else None
     
+    def stats(self) -> dict[str, Any]:
+        return {
+            **self.sessions.stats(),
+            "calls_started": self.calls_started,
+            **self.policy.per_call(self.calls_started),
+        }
+
+    def has_calls_in_partition(self, partition: int, partitions: int) -> bool:
+        """파티션 반납 전 확인용: 해당 파티션에 진행 중인 콜이 있는지"""
+        return any(
+            partition_of(sess.caller_channel_id, partitions) == partition
+            for sess in self.sessions.values()
+        )
+
+    async def rehydrate(self, owns: Callable[[Optional[str]], bool] = lambda key: True) -> dict[str, Any]:
+        """
+        재시작/재접속 시 메모리 상태 복구
+
+        ARI의 현재 채널/브릿지 목록과 DB의 미종료 calls 행을 조인해
+        세션 저장소(콜 세션 + 채널 매핑)를 다시 만든다.
+        - 두 채널이 모두 사라진 행: 끊긴 사이 종료된 콜 -> 한 번에 종료 처리
+        - 한쪽 채널만 남은 콜: 놓친 hangup -> 남은 채널 정리
+        owns: 소유 파티션 필터 (다중 워커에서 내 파티션의 콜만 복구)
+
+        파티션 획득(on_acquired) 시에는 이벤트 처리와 동시에 실행되므로
+        채널 목록 스냅샷 이후 이벤트가 있었던 세션은 스냅샷으로 판단하지 않는다.
+        """
+        snapshot = time.monotonic()
+        channels, bridges = await asyncio.gather(self.ari.list_channels(), self.ari.list_bridges())
+        open_calls = await self.recorder.load_open_calls()
+
+        live = {c.get("id") for c in channels}
+        chan_bridge: dict[str, str] = {}
+        bridge_at: dict[str, Optional[datetime]] = {}
+        for b in bridges:
+            bridge_at[b.get("id")] = parse_ari_timestamp(b.get("creationtime"))
+            for ch in b.get("channels") or []:
+                chan_bridge[ch] = b.get("id")
+
+        restored: set[uuid.UUID] = set()
+        orphans: list[uuid.UUID] = []
+        for call in open_calls:
+            caller = call.caller_channel_id
+            if not caller or not owns(caller_channel_key(caller)):
+                continue
+            callee = call.callee_channel_id or callee_channel_id_for(caller)
+            if caller not in live and callee not in live:
+                orphans.append(call.id)
+                continue
+            if call.id in self.sessions:
+                continue
+
+            # 응답(up)은 종료 시에만 DB에 기록되므로 브릿지 존재 여부로 판단한다
+            bridge_id = call.bridge_id or chan_bridge.get(caller)
+            bridged = call.status == "up" or caller in chan_bridge
+            sess = CallSession(
+                call_id=call.id,
+                target_exten=call.callee_exten or "",
+                caller_channel_id=caller,
+                callee_channel_id=callee,
+                bridge_id=bridge_id,
+                bridged=bridged,
+            )
+            self.sessions.add(sess)
+            self.recorder.adopt(call, bridged=bridged, answered_at=bridge_at.get(bridge_id))
+            restored.add(call.id)
+
+        closed = await self.recorder.close_orphans(orphans, reason="rehydrate: channels gone")
+
+        # 한쪽 채널이라도 사라진 콜은 끊긴 동안 hangup을 놓친 것 -> 종료 처리
+        # (메모리에만 남아 있던 콜도 같은 기준으로 정리). 대상은
+        # - 내 파티션의 콜
+        # - 방금 복구했거나 스냅샷 이후 이벤트가 없던 세션 (이후 시작/변경된 콜은 스냅샷과 맞지 않음)
+        # - 브릿지된 콜 (울리는 중이면 callee 채널이 아직 없을 수 있음 -> TTL sweeper가 정리)
+        stale = [
+            sess.call_id for sess in self.sessions.values()
+            if not sess.done
+            and sess.bridged
+            and owns(caller_channel_key(sess.caller_channel_id))
+            and (sess.call_id in restored or sess.last_event < snapshot)
+            and (
+                sess.caller_channel_id not in live
+                or (sess.callee_channel_id and sess.callee_channel_id not in live)
+            )
+        ]
+        await asyncio.gather(*(self._terminate_orphaned(cid) for cid in stale), return_exceptions=True)
+
+        return {
+            "channels": len(live),
+            "bridges": len(bridges),
+            "open_rows": len(open_calls),
+            "restored": len(restored),
+            "orphans_closed": closed,
+            "terminated": len(stale),
+        }
+
+    async def _terminate_orphaned(self, call_id: uuid.UUID) -> None:
+        # 종료 사유 기록 후 남은 채널/브릿지 정리 (_terminate_call은 calls를 다시 쓰지 않는다)
+        with log_context(call_id=call_id):
+            await self.recorder.mark_ended(call_id=call_id, hangup_reason="rehydrate: leg gone")
+            await self._terminate_call(call_id)
+
+    async def expire_session(self, sess: CallSession) -> None:
+        """
+        SessionSweeper 콜백: 이벤트가 끊기고 ARI에도 채널이 없는 세션 정리
+        채널은 이미 없으므로 hangup 요청 없이 DB 종료 기록 + 남은 브릿지만 정리한다.
+        """
+        with log_context(call_id=sess.call_id, channel_id=sess.caller_channel_id):
+            sess.done = True
+            await self.recorder.mark_ended(call_id=sess.call_id, hangup_reason="expired: no events")
+            if sess.bridge_id:
+                try:
+                    await self.ari.destroy_bridge(sess.bridge_id)
+                except Exception as e:
+                    logger.warning(f"expired session bridge cleanup failed: {e!r}")
+            self._cleanup_call(sess.call_id)
+            logger.info("session expired")
+
     async def handle_event(self, ev: ParsedEvent) -> None:
         if not ev.etype:
             return
+
+        # 이 이벤트 처리 중 남기는 로그(후속 task 포함)에 call_id/channel_id 부착
+        call_id = self.sessions.call_for_channel(ev.channel_id)
+        self.sessions.touch(call_id)
+        with log_context(call_id=call_id, channel_id=ev.channel_id):
+            await self._handle_event(ev)
+
+    async def _handle_event(self, ev: ParsedEvent) -> None:
+        # ignore 타입은 보통 리더에서 걸러지지만, 직접 호출(재생 도구 등)에 대비해 한 번 더 확인
+        action = self.policy.action_for(ev.etype)
+        if action is Action.IGNORE:
+            self.policy.account(ev, action)
+            return
         
         # StasisStart 선처리 (call_id 매핑을 먼저 잡는다)
-        if ev.etype == "StasisStart":
-            await self._on_stasis_start(ev)
+        pre = self._pre_handlers.get(ev.kind)
+        if pre is not None:
+            await pre(ev)
 
         # Bridge 매핑 선처리 (raw에서 bridge.id를 뽑아 channel->bridge 갱신)
         if ev.channel_id:
                 b = (ev.raw.get("bridge") or {})
                 b_id = b.get("id")
                 if b_id:
-                    async with self._lock:
-                        self._channel_to_bridge[ev.channel_id] = b_id
-
-        # ts 파싱
-        ts: Optional[datetime] = None
-        if ev.timestamp:
-            t = ev.timestamp
-            if len(t) >= 5 and (t[-5] in ("+", "-")) and t[-2:].isdigit():
-                t = t[:-5] + t[-5:-2] + ":" + t[-2:]
-            try:
-                ts = datetime.fromisoformat(t)
-            except Exception:
-                ts = None
+                    self.sessions.map_bridge(ev.channel_id, b_id)
 
         # call_id / bridge_id 조회
         call_id: Optional[uuid.UUID] = None
         bridge_id: Optional[str] = None
         if ev.channel_id:
-            async with self._lock:
-                call_id = self._channel_to_call.get(ev.channel_id)
-                bridge_id = self._channel_to_bridge.get(ev.channel_id)
+            call_id = self.sessions.call_for_channel(ev.channel_id)
+            bridge_id = self.sessions.bridge_for_channel(ev.channel_id)
         
-        # 이벤트 적재
-        await self.recorder.add_event(
-            call_id=call_id,
-            ts=ts,
-            etype=ev.etype,
-            channel_id=ev.channel_id,
-            bridge_id=bridge_id,
-            raw=ev.raw,
-        )
+        # 이벤트 적재 (memory: 적재 생략 / slim: 주요 필드만)
+        raw, raw_text = self.policy.project(ev, action)
+        if raw is not None:
+            await self.recorder.add_event(
+                call_id=call_id,
+                ts=ev.ts,
+                etype=ev.etype,
+                channel_id=ev.channel_id,
+                bridge_id=bridge_id,
+                raw=raw,
+                raw_text=raw_text,
+            )
 
         # 종료 이벤트 처리
-        if ev.etype in ("ChannelHangupRequest", "ChannelDestroyed"):
-            await self._on_hangup_like(ev)
-            return
+        post = self._post_handlers.get(ev.kind)
+        if post is not None:
+            await post(ev)
         
     async def _on_stasis_start(self, ev: ParsedEvent) -> None:
 
         if ev.app_args and ev.app_args[0] == "direct":
-            print(f"[direct_call] channel={ev.channel_id} target={ev.app_args[1] if len(ev.app_args) > 1 else '?'}")
+            logger.info("direct call", extra={"target": ev.app_args[1] if len(ev.app_args) > 1 else None})
             return
 
         if not ev.channel_id:
             return
 
         if len(ev.app_args) >= 2 and ev.app_args[0] == "callee":
-            target_exten = ev.app_args[1]
-            async with self._lock:
-                await self._attach_callee_and_bridge_locked(target_exten, ev.channel_id)
+            self._attach_callee_and_bridge(ev.channel_id, ev.app_args[2:], answered_at=ev.ts)
             return
 
         if not ev.app_args:
@@ -105,15 +276,17 @@ class CallService:
         target_exten = ev.app_args[0]
         call_id = uuid.uuid4()
 
-        async with self._lock:
-            sess = CallSession(
-                call_id=call_id,
-                target_exten=target_exten,
-                caller_channel_id=ev.channel_id,
-            )
-            self._calls[call_id] = sess
-            self._channel_to_call[ev.channel_id] = call_id
-            self._pending_by_exten.setdefault(target_exten, []).append(call_id)
+        sess = CallSession(
+            call_id=call_id,
+            target_exten=target_exten,
+            caller_channel_id=ev.channel_id,
+        )
+        # callee 채널 ID를 originate 전에 확정하여 매핑해 둔다
+        callee_channel_id = callee_channel_id_for(ev.channel_id)
+        sess.callee_channel_id = callee_channel_id
+        self.sessions.add(sess)
+        self.calls_started += 1
+        bind(call_id=call_id)
 
         caller_exten: Optional[str] = None
         if ev.channel_name and "/" in ev.channel_name:
@@ -124,71 +297,114 @@ class CallService:
             caller_exten=caller_exten,
             callee_exten=target_exten,
             caller_channel_id=ev.channel_id,
+            started_at=ev.ts,
         )
 
+        # 고객 조회는 originate를 기다리게 하지 않는다 (결과는 다음 calls 쓰기에 함께 기록)
+        if self.customers is not None and ev.caller_number:
+            asyncio.create_task(self._link_customer(call_id, ev.caller_number, target_exten, caller_exten, ev.ts))
+
         try:
-            callee_channel_id = await self.ari.originate(
+            await self.ari.originate(
                 endpoint=f"PJSIP/{target_exten}",
-                app_args=f"callee,{target_exten}",
+                app_args=f"callee,{target_exten},{call_id}",
                 caller_id="ARI",
                 timeout=30,
+                channel_id=callee_channel_id,
             )
-            print({"action": "originate", "dialed_exten": target_exten, "callee_channel_id": callee_channel_id})
+            logger.info("originate", extra={"dialed_exten": target_exten, "callee_channel_id": callee_channel_id})
         except Exception as e:
-            print("[originate_error]", repr(e))
-            async with self._lock:
-                await self._cleanup_call_locked(call_id)
-
-    async def _attach_callee_and_bridge_locked(self, target_exten: str, callee_channel_id: str) -> None:
-        q = self._pending_by_exten.get(target_exten) or []
-        if not q:
+            logger.error(f"originate failed: {e!r}", extra={"dialed_exten": target_exten})
+            self._cleanup_call(call_id)
+
+    async def _link_customer(
+            self,
+            call_id: uuid.UUID,
+            phone: str,
+            target_exten: str,
+            caller_exten: Optional[str],
+            ts: Optional[datetime],
+    ) -> None:
+        # 캐시 적중이면 DB 조회 없이, 아니면 유니크 인덱스 조회 1회
+        customer_id = await self.customers.resolve(phone, target_exten, caller_exten)
+        if customer_id is None:
             return
-        
-        call_id = q.pop(0)
-        sess = self._calls.get(call_id)
+        self.customers.touch(customer_id, ts)
+        await self.recorder.set_customer(call_id, customer_id)
+
+    def _attach_callee_and_bridge(
+            self,
+            callee_channel_id: str,
+            extra_args: list[str],
+            answered_at: Optional[datetime] = None,
+    ) -> None:
+        # O(1): originate 시 미리 등록한 callee 채널 ID로 조회
+        call_id = self.sessions.call_for_channel(callee_channel_id)
+
+        # 채널 ID 지정이 안 된 경우 appArgs로 전달한 call_id로 보정
+        if call_id is None and extra_args:
+            try:
+                call_id = uuid.UUID(extra_args[0])
+            except ValueError:
+                call_id = None
+
+        sess = self.sessions.get(call_id)
         if not sess or sess.done:
             return
-        
-        sess.callee_channel_id = callee_channel_id
-        self._channel_to_call[callee_channel_id] = call_id
 
-        caller_id = sess.caller_channel_id
+        if sess.callee_channel_id != callee_channel_id:
+            sess.callee_channel_id = callee_channel_id
+            self.sessions.map_channel(callee_channel_id, call_id)
 
-        asyncio.create_task(self._bridge_pair(call_id, caller_id, callee_channel_id))
+        caller_id = sess.caller_channel_id
 
-    async def _bridge_pair(self, call_id: uuid.UUID, caller_channel_id: str, callee_channel_id: str) -> None:
-        async with self._lock:
-            sess = self._calls.get(call_id)
-            if not sess or sess.done or sess.bridged:
-                return
+        # callee가 Stasis에 들어온 시각 = 응답 시각 (ring 시간 계산 기준)
+        asyncio.create_task(self._bridge_pair(call_id, caller_id, callee_channel_id, answered_at))
+
+    async def _bridge_pair(
+            self,
+            call_id: uuid.UUID,
+            caller_channel_id: str,
+            callee_channel_id: str,
+            answered_at: Optional[datetime] = None,
+    ) -> None:
+        sess = self.sessions.get(call_id)
+        if not sess or sess.done or sess.bridged:
+            return
+        # await 전에 선점 표시 -> 다른 샤드에서 중복 브릿지 생성 방지
+        sess.bridged = True
         
         try:
+            # 브릿지 ID 사전 지정 + 두 채널 한 번에 추가 -> REST 왕복 3회에서 2회로
+            # ID를 먼저 세션에 기록해 두면 생성 도중 종료되어도 _terminate_call이 정리할 수 있다
             bridge_name = f"call-{str(call_id)[:8]}"
-            bridge_id = await self.ari.create_bridge(name=bridge_name, bridge_type="mixing")
-
-            await self.ari.add_channel_to_bridge(bridge_id, caller_channel_id)
-            await self.ari.add_channel_to_bridge(bridge_id, callee_channel_id)
-
+            sess.bridge_id = bridge_id_for(caller_channel_id)
+            bridge_id = await self.ari.create_bridge(
+                name=bridge_name,
+                bridge_type="mixing",
+                bridge_id=sess.bridge_id,
+            )
+            await self.ari.add_channels_to_bridge(bridge_id, [caller_channel_id, callee_channel_id])
 
-            async with self._lock:
-                self._channel_to_bridge[caller_channel_id] = bridge_id
-                self._channel_to_bridge[callee_channel_id] = bridge_id
+            self.sessions.map_bridge(caller_channel_id, bridge_id)
+            self.sessions.map_bridge(callee_channel_id, bridge_id)
 
-                sess = self._calls.get(call_id)
-                if sess and not sess.done:
-                    sess.bridge_id = bridge_id
+            sess = self.sessions.get(call_id)
+            if sess and not sess.done:
+                sess.bridge_id = bridge_id
 
             await self.recorder.mark_bridged(
                 call_id=call_id,
                 bridge_id=bridge_id,
                 caller_channel_id=caller_channel_id,
                 callee_channel_id=callee_channel_id,
+                answered_at=answered_at,
             )
             
-            print({"action": "bridge", "call_id": call_id, "bridge_id": bridge_id})
+            logger.info("bridge", extra={"bridge_id": bridge_id})
 
         except Exception as e:
-            print("[bridge_error]", repr(e))
+            logger.error(f"bridge failed: {e!r}")
             await self.recorder.mark_failed(call_id, reason=repr(e))
 
             await self._terminate_call(call_id)
@@ -197,22 +413,19 @@ class CallService:
         if not ev.channel_id:
             return
         
-        async with self._lock:
-            call_id = self._channel_to_call.get(ev.channel_id)
-
+        call_id = self.sessions.call_for_channel(ev.channel_id)
         if not call_id:
             return
 
-        ended_at: Optional[datetime] = None
-        if ev.timestamp:
-            t = ev.timestamp
-            if len(t) >= 5 and (t[-5] in ("+", "-")) and t[-2:].isdigit():
-                t = t[:-5] + t[-5:-2] + ":" + t[-2:]
-            try:
-                ended_at = datetime.fromisoformat(t)
-            except Exception:
-                ended_at = None
-        
+        # 먼저 끊은 쪽 (첫 종료 이벤트의 채널)
+        sess = self.sessions.get(call_id)
+        party = "system"
+        if sess is not None:
+            if ev.channel_id == sess.caller_channel_id:
+                party = "caller"
+            elif ev.channel_id == sess.callee_channel_id:
+                party = "callee"
+
         cause: Optional[int] = None
         cause_txt: Optional[str] = None
 
@@ -232,58 +445,46 @@ class CallService:
 
         await self.recorder.mark_ended(
             call_id=call_id,
-            ended_at=ended_at,
+            ended_at=ev.ts,
             hangup_cause=cause,
             hangup_reason=cause_txt,
+            hangup_party=party,
         )
         
         await self._terminate_call(call_id)
     
     async def _terminate_call(self, call_id: uuid.UUID) -> None:
-        async with self._lock:
-            sess = self._calls.get(call_id)
-            if not sess or sess.done:
-                return
-            sess.done = True
+        """채널/브릿지 정리 (종료 상태는 호출하는 쪽이 먼저 mark_ended/mark_failed로 기록한다)"""
+        sess = self.sessions.get(call_id)
+        if not sess or sess.done:
+            return
+        sess.done = True
 
-            caller = sess.caller_channel_id
-            callee = sess.callee_channel_id
-            bridge_id = sess.bridge_id
-
-        try:
-            await self.recorder.mark_ended(
-                call_id=call_id,
-                ended_at=datetime.now().astimezone(),
-                hangup_cause=None,
-                hangup_reason="hangup",
-            )
-        except Exception as e:
-            print("[db_martk_ended_error]", repr(e))
+        caller = sess.caller_channel_id
+        callee = sess.callee_channel_id
+        bridge_id = sess.bridge_id
 
+        # 서로 독립적인 종료 요청은 동시에 실행 (전체 동시 요청 수는 semaphore로 제한)
+        ops = []
         if caller:
-            await self.ari.hangup_channel(caller)
+            ops.append(self.ari.hangup_channel(caller))
         if callee:
-            await self.ari.hangup_channel(callee)
+            ops.append(self.ari.hangup_channel(callee))
         if bridge_id:
-            await self.ari.destroy_bridge(bridge_id)
+            ops.append(self.ari.destroy_bridge(bridge_id))
+
+        results = await self._gather_bounded(ops)
+        for r in results:
+            if isinstance(r, Exception):
+                logger.warning(f"teardown failed: {r!r}")
+
+        self._cleanup_call(call_id)
 
-        async with self._lock:
-            await self._cleanup_call_locked(call_id)
+    async def _gather_bounded(self, aws: list) -> list:
+        async def _run(aw):
+            async with self._teardown_sem:
+                return await aw
+        return await asyncio.gather(*(_run(aw) for aw in aws), return_exceptions=True)
     
-    async def _cleanup_call_locked(self, call_id: uuid.UUID) -> None:
-        sess = self._calls.pop(call_id, None)
-        if not sess:
-            return
-        
-        q = self._pending_by_exten.get(sess.target_exten)
-        if q: 
-            self._pending_by_exten[sess.target_exten] = [x for x in q if x != call_id]
-            if not self._pending_by_exten[sess.target_exten]:
-                self._pending_by_exten.pop(sess.target_exten, None)
-            
-        if sess.caller_channel_id:
-            self._channel_to_call.pop(sess.caller_channel_id, None)
-            self._channel_to_bridge.pop(sess.caller_channel_id, None)
-        if sess.callee_channel_id:
-            self._channel_to_call.pop(sess.callee_channel_id, None)
-            self._channel_to_bridge.pop(sess.callee_channel_id, None)
\ No newline at end of file
+    def _cleanup_call(self, call_id: uuid.UUID) -> None:
+        self.sessions.remove(call_id)
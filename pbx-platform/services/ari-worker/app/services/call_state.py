@@ -0,0 +1,191 @@
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+import time
+from typing import Any, Optional
+
+from sqlalchemy import select, text
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker
+
+from pbx_common.models import User
+
+logger = logging.getLogger(__name__)
+
+# API(routes/call_state.py)가 LISTEN 하는 채널
+CALL_STATE_CHANNEL = "call_state"
+
+# calls.status -> 외부에 알리는 상태
+_STATE_OF = {"new": "ringing", "up": "up", "ended": "ended", "failed": "ended"}
+
+# 배치 전체를 한 번에 NOTIFY (페이로드 배열을 unnest 하여 왕복 1회)
+_NOTIFY_SQL = text(
+    f"SELECT pg_notify('{CALL_STATE_CHANNEL}', p) FROM unnest(CAST(:payloads AS text[])) AS p"
+)
+
+
+class ExtenCompanyCache:
+    """
+    내선 -> company_id 캐시 (TTL)
+    미스는 배치 단위로 모아 IN 조회 한 번으로 채우고, 없는 내선도 None으로 캐시한다.
+    """
+
+    def __init__(self, session_factory: async_sessionmaker[AsyncSession], ttl: float = 300.0):
+        self._SessionLocal = session_factory
+        self.ttl = ttl
+        self._entries: dict[str, tuple[Optional[int], float]] = {}
+
+        # 메트릭
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, exten: Optional[str]) -> tuple[bool, Optional[int]]:
+        """(캐시 여부, company_id)"""
+        if not exten:
+            return True, None
+        hit = self._entries.get(exten)
+        if hit is None or hit[1] < time.monotonic():
+            return False, None
+        return True, hit[0]
+
+    async def load(self, extens: set[str]) -> None:
+        if not extens:
+            return
+        self.misses += len(extens)
+        async with self._SessionLocal() as s:
+            res = await s.execute(
+                select(User.exten, User.company_id).where(User.exten.in_(extens), User.is_active.is_(True))
+            )
+            found = {exten: company_id for exten, company_id in res.all()}
+        expires = time.monotonic() + self.ttl
+        for exten in extens:
+            self._entries[exten] = (found.get(exten), expires)
+
+    async def resolve(self, extens: set[str]) -> dict[str, Optional[int]]:
+        missing = set()
+        out: dict[str, Optional[int]] = {}
+        for exten in extens:
+            cached, company_id = self.get(exten)
+            if cached:
+                self.hits += 1
+                out[exten] = company_id
+            else:
+                missing.add(exten)
+        if missing:
+            await self.load(missing)
+            for exten in missing:
+                out[exten] = self.get(exten)[1]
+        return out
+
+    def stats(self) -> dict[str, Any]:
+        return {"size": len(self._entries), "hits": self.hits, "misses": self.misses}
+
+
+class CallStatePublisher:
+    """
+    콜 상태 변경(ringing/up/ended)을 Postgres NOTIFY로 발행
+
+    publish()는 큐에 넣기만 하고 즉시 반환한다 (가득 차면 버리고 카운트).
+    백그라운드 task가 큐를 배치로 비우면서 내선 -> company_id를 채우고
+    배치 전체를 pg_notify 한 번으로 보낸다.
+    """
+
+    def __init__(
+            self,
+            engine: AsyncEngine,
+            companies: ExtenCompanyCache,
+            queue_max: int = 10000,
+            batch_max: int = 500,
+    ):
+        self._engine = engine
+        self._companies = companies
+        self._queue: asyncio.Queue[dict[str, Any]] = asyncio.Queue(maxsize=queue_max)
+        self._batch_max = batch_max
+        self._task: Optional[asyncio.Task] = None
+
+        # 메트릭
+        self.published = 0
+        self.dropped = 0
+        self.failed = 0
+
+    def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._run(), name="call-state-publisher")
+
+    async def close(self) -> None:
+        if self._task is None:
+            return
+        # 남은 변경분을 보낸 뒤 종료
+        try:
+            await asyncio.wait_for(self._queue.join(), timeout=5.0)
+        except asyncio.TimeoutError:
+            logger.warning(f"Call state publisher closed with {self._queue.qsize()} pending")
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+    def publish(
+            self,
+            call_id: Any,
+            status: str,
+            caller_exten: Optional[str],
+            callee_exten: Optional[str],
+            hangup_party: Optional[str] = None,
+    ) -> None:
+        state = _STATE_OF.get(status)
+        if state is None or self._task is None:
+            return
+        delta = {
+            "call_id": str(call_id),
+            "state": state,
+            "caller": caller_exten,
+            "callee": callee_exten,
+            "ts": int(time.time() * 1000),
+        }
+        if hangup_party:
+            delta["hangup_party"] = hangup_party
+        try:
+            self._queue.put_nowait(delta)
+        except asyncio.QueueFull:
+            self.dropped += 1
+
+    async def _run(self) -> None:
+        while True:
+            batch = [await self._queue.get()]
+            while len(batch) < self._batch_max and not self._queue.empty():
+                batch.append(self._queue.get_nowait())
+            try:
+                await self._send(batch)
+                self.published += len(batch)
+            except Exception as e:
+                self.failed += len(batch)
+                logger.error(f"Call state notify failed ({len(batch)} deltas): {e!r}")
+            finally:
+                for _ in batch:
+                    self._queue.task_done()
+
+    async def _send(self, batch: list[dict[str, Any]]) -> None:
+        extens = {e for d in batch for e in (d["caller"], d["callee"]) if e}
+        companies = await self._companies.resolve(extens)
+
+        payloads = []
+        for d in batch:
+            # 발신 내선의 회사, 없으면(외부 발신 등) 수신 내선의 회사
+            d["company_id"] = companies.get(d["caller"]) or companies.get(d["callee"])
+            payloads.append(json.dumps(d, separators=(",", ":")))
+
+        async with self._engine.begin() as conn:
+            await conn.execute(_NOTIFY_SQL, {"payloads": payloads})
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "queue": self._queue.qsize(),
+            "published": self.published,
+            "dropped": self.dropped,
+            "failed": self.failed,
+            "exten_cache": self._companies.stats(),
+        }
@@ -0,0 +1,160 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from datetime import datetime
+from typing import Any, Optional
+
+from sqlalchemy import select, text
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from pbx_common.models import Customer
+from pbx_common.utils.phone import normalize_phone
+
+from app.services.call_state import ExtenCompanyCache
+
+logger = logging.getLogger(__name__)
+
+# 고객별 최근 통화 시각을 UPDATE 한 번으로 반영 (이미 더 최근 값이면 유지)
+_TOUCH_SQL = text("""
+    UPDATE customer AS c SET last_call_at = GREATEST(c.last_call_at, v.ts)
+    FROM unnest(CAST(:ids AS integer[]), CAST(:ts AS timestamptz[])) AS v(id, ts)
+    WHERE c.id = v.id
+""")
+
+
+class CustomerResolver:
+    """
+    발신 번호 -> customer_id (TTL 캐시)
+
+    키는 (수신 내선의 회사, 정규화 번호)이며 uq_customer_company_phone_norm 인덱스로
+    한 건만 조회한다. 없는 번호도 None으로 캐시해 같은 번호의 반복 인입은 DB를 보지 않는다.
+    조회 실패는 고객 미연결(None)로 넘어간다 (콜 처리를 막지 않음).
+
+    touch()는 고객별 최근 통화 시각만 모아 두고, 백그라운드 task가 주기적으로 한 번에 반영한다.
+    """
+
+    def __init__(
+            self,
+            session_factory: async_sessionmaker[AsyncSession],
+            companies: ExtenCompanyCache,
+            ttl: float = 300.0,
+            max_size: int = 100000,
+            flush_interval: float = 5.0,
+    ):
+        self._SessionLocal = session_factory
+        self._companies = companies
+        self.ttl = ttl
+        self.max_size = max_size
+        self.flush_interval = flush_interval
+        self._entries: dict[tuple[Optional[int], str], tuple[Optional[int], float]] = {}
+        self._touches: dict[int, datetime] = {}
+        self._task: Optional[asyncio.Task] = None
+
+        # 메트릭
+        self.hits = 0
+        self.misses = 0
+        self.failed = 0
+        self.touched = 0
+
+    def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._run(), name="customer-touch-flusher")
+
+    async def close(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        # 남은 최근 통화 시각 반영
+        await self.flush()
+
+    async def resolve(
+            self,
+            phone: Optional[str],
+            target_exten: Optional[str],
+            caller_exten: Optional[str] = None,
+    ) -> Optional[int]:
+        """수신 내선의 회사(없으면 발신 내선의 회사)에서 발신 번호의 고객을 찾는다"""
+        phone_norm = normalize_phone(phone)
+        if phone_norm is None:
+            return None
+
+        try:
+            extens = {e for e in (target_exten, caller_exten) if e}
+            companies = await self._companies.resolve(extens)
+            company_id = companies.get(target_exten) or companies.get(caller_exten)
+
+            key = (company_id, phone_norm)
+            hit = self._entries.get(key)
+            if hit is not None and hit[1] >= time.monotonic():
+                self.hits += 1
+                return hit[0]
+
+            self.misses += 1
+            async with self._SessionLocal() as s:
+                res = await s.execute(
+                    select(Customer.id).where(
+                        Customer.company_id.is_(None) if company_id is None else Customer.company_id == company_id,
+                        Customer.phone_norm == phone_norm,
+                        Customer.is_active.is_(True),
+                    )
+                )
+                customer_id = res.scalars().first()
+        except Exception as e:
+            self.failed += 1
+            logger.warning(f"customer lookup failed: {e!r}")
+            return None
+
+        if len(self._entries) >= self.max_size:
+            self._evict()
+        self._entries[key] = (customer_id, time.monotonic() + self.ttl)
+        return customer_id
+
+    def _evict(self) -> None:
+        now = time.monotonic()
+        self._entries = {k: v for k, v in self._entries.items() if v[1] >= now}
+        # 만료된 것이 없으면 전부 비운다 (다시 채우는 비용은 조회 1회씩)
+        if len(self._entries) >= self.max_size:
+            self._entries.clear()
+
+    def touch(self, customer_id: int, ts: Optional[datetime]) -> None:
+        ts = ts or datetime.now().astimezone()
+        prev = self._touches.get(customer_id)
+        if prev is None or ts > prev:
+            self._touches[customer_id] = ts
+
+    async def flush(self) -> None:
+        if not self._touches:
+            return
+        batch, self._touches = self._touches, {}
+        try:
+            async with self._SessionLocal() as s:
+                await s.execute(_TOUCH_SQL, {"ids": list(batch), "ts": list(batch.values())})
+                await s.commit()
+        except Exception as e:
+            logger.error(f"last_call_at update failed ({len(batch)} customers): {e!r}")
+            # 다음 주기에 다시 시도 (그 사이 들어온 더 최근 값은 유지)
+            for customer_id, ts in batch.items():
+                self.touch(customer_id, ts)
+            return
+        self.touched += len(batch)
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self.flush_interval)
+            await self.flush()
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "size": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "failed": self.failed,
+            "pending_touches": len(self._touches),
+            "touched": self.touched,
+        }
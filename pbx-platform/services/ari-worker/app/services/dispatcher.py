@@ -0,0 +1,117 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from typing import Any, Awaitable, Callable, Optional
+
+from app.ari.parser import ParsedEvent
+from app.core.metrics import Counter, Histogram
+
+logger = logging.getLogger(__name__)
+
+# close() 시 각 mailbox에 넣어 worker를 종료시키는 표식
+_STOP = object()
+
+_EVENTS = Counter("ari_events_total", "ARI events handled", ("type",))
+_HANDLER_ERRORS = Counter("ari_event_handler_errors_total", "ARI event handler exceptions", ("type",))
+_HANDLE_LATENCY = Histogram("ari_event_handle_seconds", "ARI event handler latency", ("type",))
+
+
+class EventDispatcher:
+    """
+    샤드 단위 이벤트 디스패처
+
+    같은 라우팅 키(채널/콜)의 이벤트는 항상 같은 샤드로 보내 순서를 보장하고,
+    서로 다른 콜은 N개의 worker task가 각자의 mailbox에서 동시에 처리한다.
+    """
+
+    def __init__(
+            self,
+            handler: Callable[[ParsedEvent], Awaitable[None]],
+            key_func: Callable[[ParsedEvent], Optional[str]],
+            shards: int = 8,
+            mailbox_size: int = 1000,
+    ):
+        if shards < 1:
+            raise ValueError("shards must be >= 1")
+
+        self._handler = handler
+        self._key_func = key_func
+        self._shards = shards
+        self._mailboxes: list[asyncio.Queue[Any]] = [asyncio.Queue(maxsize=mailbox_size) for _ in range(shards)]
+        self._workers: list[asyncio.Task] = []
+
+        # 메트릭
+        self.handled = [0] * shards
+        self.errors = [0] * shards
+        self.max_handle_ms = 0.0
+
+    @property
+    def shards(self) -> int:
+        return self._shards
+
+    def start(self) -> None:
+        if self._workers:
+            return
+        self._workers = [
+            asyncio.create_task(self._worker(i), name=f"dispatch-shard-{i}")
+            for i in range(self._shards)
+        ]
+
+    def shard_for(self, ev: ParsedEvent) -> int:
+        key = self._key_func(ev)
+        if not key:
+            # 채널/브릿지가 없는 이벤트는 0번 샤드에서 순서대로 처리
+            return 0
+        return hash(key) % self._shards
+
+    async def dispatch(self, ev: ParsedEvent) -> None:
+        # mailbox가 가득 차면 대기 -> 리더(WebSocket) 쪽으로 backpressure 전달
+        await self._mailboxes[self.shard_for(ev)].put(ev)
+
+    async def drain(self) -> None:
+        """현재 mailbox에 들어있는 이벤트가 모두 처리될 때까지 대기"""
+        await asyncio.gather(*(mb.join() for mb in self._mailboxes))
+
+    async def close(self) -> None:
+        """mailbox에 남은 이벤트를 모두 처리한 뒤 worker 종료"""
+        if not self._workers:
+            return
+        for mb in self._mailboxes:
+            await mb.put(_STOP)
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        self._workers = []
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "shards": self._shards,
+            "depths": [mb.qsize() for mb in self._mailboxes],
+            "handled": sum(self.handled),
+            "errors": sum(self.errors),
+            "max_handle_ms": round(self.max_handle_ms, 2),
+        }
+
+    async def _worker(self, idx: int) -> None:
+        mailbox = self._mailboxes[idx]
+        while True:
+            ev = await mailbox.get()
+            if ev is _STOP:
+                mailbox.task_done()
+                return
+
+            t0 = time.perf_counter()
+            try:
+                await self._handler(ev)
+                self.handled[idx] += 1
+            except Exception as e:
+                self.errors[idx] += 1
+                _HANDLER_ERRORS.inc(ev.etype or "unknown")
+                logger.error(f"Error handling event {ev.etype} (shard={idx}): {e!r}")
+            finally:
+                mailbox.task_done()
+                elapsed = (time.perf_counter() - t0) * 1000.0
+                _EVENTS.inc(ev.etype or "unknown")
+                _HANDLE_LATENCY.observe(elapsed / 1000.0, ev.etype or "unknown")
+                if elapsed > self.max_handle_ms:
+                    self.max_handle_ms = elapsed
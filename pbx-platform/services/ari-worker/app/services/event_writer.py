@@ -0,0 +1,201 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Any, Optional
+
+from sqlalchemy import Text, bindparam, cast, insert
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from pbx_common.models import CallEvent
+
+from app.ari.parser import encode_json
+from app.services.spool import SPOOL_EVENT, Spool
+
+logger = logging.getLogger(__name__)
+
+# close() 시 큐에 넣어 writer 루프를 종료시키는 표식
+_STOP = object()
+
+# raw 적재 모드
+# passthrough: 수신한 원본 프레임 텍스트를 그대로 보내 서버에서 jsonb로 캐스팅 (재직렬화 없음)
+# json: dict를 SQLAlchemy JSONB 타입으로 직렬화 (기존 방식)
+RAW_MODES = ("passthrough", "json")
+
+# call_events는 created_at(적재 시각) 기준 월 파티션이라 ts(이벤트 시각) 조건만으로는 파티션을 잘라내지 못한다.
+# 적재는 항상 이벤트 이후이므로 ts 하한에서 서버 간 시계 차이만큼 뺀 값을 created_at 하한으로 같이 준다.
+CREATED_AT_SKEW = timedelta(hours=1)
+
+
+def created_at_floor(ts: datetime) -> datetime:
+    """ts >= 조건에 함께 걸 created_at 하한"""
+    return ts - CREATED_AT_SKEW
+
+
+_INSERT_PASSTHROUGH = insert(CallEvent).values(raw=cast(bindparam("raw_text", type_=Text), JSONB))
+
+
+async def insert_event_rows(s: AsyncSession, rows: list[dict[str, Any]]) -> None:
+    """
+    call_events multi-row INSERT (executemany -> insertmanyvalues)
+    raw_text(원본 프레임)가 있는 행은 서버에서 jsonb로 캐스팅, 나머지는 raw dict로 적재
+    """
+    text_rows = [r for r in rows if r.get("raw_text") is not None]
+    dict_rows = [r for r in rows if r.get("raw_text") is None]
+    if text_rows:
+        await s.execute(_INSERT_PASSTHROUGH, text_rows)
+    if dict_rows:
+        await s.execute(insert(CallEvent), dict_rows)
+
+
+@dataclass(frozen=True)
+class FlushPolicy:
+    max_rows: int = 500         # 한 번에 적재할 최대 행 수
+    max_delay_ms: int = 200     # 첫 행이 들어온 뒤 flush까지 기다리는 최대 시간
+    queue_max: int = 20000      # 버퍼 상한 (초과 시 put()이 대기 -> 자연스러운 backpressure)
+
+
+class EventWriter:
+    """
+    call_events 배치 적재기 (write-behind)
+
+    add_event마다 세션/커밋을 여는 대신 큐에 쌓아두고,
+    max_rows에 도달하거나 max_delay_ms가 지나면 multi-row INSERT 한 번으로 적재한다.
+    """
+
+    def __init__(
+            self,
+            session_factory: async_sessionmaker[AsyncSession],
+            policy: Optional[FlushPolicy] = None,
+            raw_mode: str = "passthrough",
+            spool: Optional[Spool] = None,
+    ):
+        if raw_mode not in RAW_MODES:
+            raise ValueError(f"raw_mode must be one of {RAW_MODES}: {raw_mode!r}")
+
+        self._SessionLocal = session_factory
+        self.policy = policy or FlushPolicy()
+        self.raw_mode = raw_mode
+        # flush 실패 시 행을 보관할 로컬 spool (없으면 실패 행은 버려진다)
+        self._spool = spool
+        self._queue: asyncio.Queue[Any] = asyncio.Queue(maxsize=self.policy.queue_max)
+        self._task: Optional[asyncio.Task] = None
+
+        # 메트릭
+        self.rows_written = 0
+        self.rows_failed = 0
+        self.rows_spooled = 0
+        self.flush_count = 0
+        self.last_flush_ms = 0.0
+        self.max_flush_ms = 0.0
+
+    @property
+    def raw_passthrough(self) -> bool:
+        return self.raw_mode == "passthrough"
+
+    @property
+    def queue_depth(self) -> int:
+        return self._queue.qsize()
+
+    def start(self) -> None:
+        if self._task is not None:
+            return
+        self._task = asyncio.create_task(self._run(), name="event-writer")
+
+    async def put(self, row: dict[str, Any]) -> None:
+        """
+        row: call_events 컬럼 dict
+        passthrough 모드에서는 raw 대신 raw_text(원본 프레임)를 넣으면 재직렬화 없이 적재된다.
+        """
+        await self._queue.put(row)
+
+    async def close(self) -> None:
+        """남은 버퍼를 모두 flush한 뒤 종료 (shutdown drain)"""
+        if self._task is None:
+            return
+        await self._queue.put(_STOP)
+        await self._task
+        self._task = None
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "queue_depth": self.queue_depth,
+            "rows_written": self.rows_written,
+            "rows_failed": self.rows_failed,
+            "rows_spooled": self.rows_spooled,
+            "flush_count": self.flush_count,
+            "last_flush_ms": round(self.last_flush_ms, 2),
+            "max_flush_ms": round(self.max_flush_ms, 2),
+        }
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        max_rows = self.policy.max_rows
+        max_delay = self.policy.max_delay_ms / 1000.0
+
+        stopping = False
+        while not stopping:
+            first = await self._queue.get()
+            if first is _STOP:
+                break
+
+            batch = [first]
+            deadline = loop.time() + max_delay
+
+            while len(batch) < max_rows:
+                # 이미 쌓인 행은 대기 없이 바로 꺼낸다
+                try:
+                    row = self._queue.get_nowait()
+                except asyncio.QueueEmpty:
+                    timeout = deadline - loop.time()
+                    if timeout <= 0:
+                        break
+                    try:
+                        row = await asyncio.wait_for(self._queue.get(), timeout)
+                    except asyncio.TimeoutError:
+                        break
+
+                if row is _STOP:
+                    stopping = True
+                    break
+                batch.append(row)
+
+            await self._flush(batch)
+
+    def _spool_rows(self, batch: list[dict[str, Any]]) -> bool:
+        # DB 장애: 로컬 spool에 기록해 두고 복구 후 재생
+        try:
+            self._spool.append_many(SPOOL_EVENT, batch)
+        except Exception as e:
+            logger.error(f"Spool append failed: {e!r}")
+            return False
+        self.rows_spooled += len(batch)
+        return True
+
+    async def _flush(self, batch: list[dict[str, Any]]) -> None:
+        t0 = time.perf_counter()
+        try:
+            if self.raw_passthrough:
+                for row in batch:
+                    if row.get("raw_text") is None:
+                        row["raw_text"] = encode_json(row.pop("raw", None) or {})
+            async with self._SessionLocal() as s:
+                await insert_event_rows(s, batch)
+                await s.commit()
+            self.rows_written += len(batch)
+        except Exception as e:
+            if self._spool is not None and self._spool_rows(batch):
+                logger.warning(f"call_events flush failed, spooled {len(batch)} rows: {e!r}")
+            else:
+                self.rows_failed += len(batch)
+                logger.error(f"call_events flush failed ({len(batch)} rows): {e!r}")
+        finally:
+            elapsed = (time.perf_counter() - t0) * 1000.0
+            self.flush_count += 1
+            self.last_flush_ms = elapsed
+            if elapsed > self.max_flush_ms:
+                self.max_flush_ms = elapsed
@@ -0,0 +1,240 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import os
+import struct
+from collections import Counter
+from datetime import datetime, timezone
+from typing import Any, Awaitable, Callable, Iterable, Optional
+
+from app.ari.parser import EventType, ParsedEvent, decode_frame, encode_json, parse_event
+
+logger = logging.getLogger(__name__)
+
+# 큐가 가득 찼을 때의 처리 방식
+# block: 리더가 대기 (기본, 유실 없음 -> 소켓 버퍼에 쌓임)
+# drop: 저가치 이벤트 타입은 버리고, 나머지는 대기
+# spill: 디스크 파일로 넘기고 리더는 계속 읽는다 (순서 유지)
+OVERFLOW_POLICIES = ("block", "drop", "spill")
+
+# drop 정책에서 버려도 되는 기본 이벤트 타입 (콜 상태 전이에 쓰이지 않음)
+DEFAULT_DROPPABLE = frozenset({
+    EventType.CHANNEL_VARSET.value,
+    EventType.CHANNEL_DIALPLAN.value,
+})
+
+_LEN = struct.Struct("<I")
+
+# 지연(lag) 이동 평균 가중치
+_LAG_EWMA_ALPHA = 0.1
+
+
+class _SpillFile:
+    """
+    overflow 이벤트를 원본 프레임 그대로 이어 붙이는 임시 파일
+    레코드 형식: [u32 길이][프레임 바이트]
+    읽기 위치를 따라가다가 모두 읽으면 파일을 비운다.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._fh = open(path, "w+b")
+        self._read_pos = 0
+        self.pending = 0
+
+    def append(self, frame: bytes) -> None:
+        self._fh.seek(0, os.SEEK_END)
+        self._fh.write(_LEN.pack(len(frame)))
+        self._fh.write(frame)
+        self.pending += 1
+
+    def read(self, max_records: int) -> list[bytes]:
+        self._fh.flush()
+        self._fh.seek(self._read_pos)
+        out: list[bytes] = []
+        while len(out) < max_records and self.pending > 0:
+            (n,) = _LEN.unpack(self._fh.read(_LEN.size))
+            out.append(self._fh.read(n))
+            self.pending -= 1
+        self._read_pos = self._fh.tell()
+
+        if self.pending == 0:
+            # 전부 소비 -> 파일을 비워 크기가 무한히 늘지 않게 한다
+            self._fh.seek(0)
+            self._fh.truncate()
+            self._read_pos = 0
+        return out
+
+    def close(self) -> None:
+        self._fh.close()
+        try:
+            os.remove(self.path)
+        except OSError:
+            pass
+
+
+class IngestQueue:
+    """
+    WebSocket 리더와 디스패처 사이의 bounded 큐
+
+    리더는 put()으로 넣고 곧바로 다음 프레임을 읽는다.
+    pump task가 큐에서 꺼내 sink(디스패처)로 넘기며, 이때 ARI timestamp 대비
+    처리 시점까지의 지연(lag)을 측정한다.
+    """
+
+    def __init__(
+            self,
+            sink: Callable[[ParsedEvent], Awaitable[None]],
+            maxsize: int = 10000,
+            overflow: str = "block",
+            droppable: Optional[Iterable[str]] = None,
+            spill_dir: Optional[str] = None,
+    ):
+        if overflow not in OVERFLOW_POLICIES:
+            raise ValueError(f"overflow must be one of {OVERFLOW_POLICIES}: {overflow!r}")
+        if overflow == "spill" and not spill_dir:
+            raise ValueError("spill_dir is required for overflow='spill'")
+
+        self._sink = sink
+        self.maxsize = maxsize
+        self.overflow = overflow
+        self.droppable = frozenset(droppable) if droppable is not None else DEFAULT_DROPPABLE
+        self._spill_dir = spill_dir
+
+        self._queue: asyncio.Queue[ParsedEvent] = asyncio.Queue(maxsize=maxsize)
+        self._spill: Optional[_SpillFile] = None
+        self._task: Optional[asyncio.Task] = None
+
+        # 메트릭
+        self.enqueued = 0
+        self.blocked = 0
+        self.spilled = 0
+        self.dropped: Counter[str] = Counter()
+        self.lag_last_ms = 0.0
+        self.lag_max_ms = 0.0
+        self.lag_avg_ms = 0.0
+
+    @property
+    def depth(self) -> int:
+        return self._queue.qsize()
+
+    @property
+    def spill_pending(self) -> int:
+        return self._spill.pending if self._spill else 0
+
+    def start(self) -> None:
+        if self._task is not None:
+            return
+        self._task = asyncio.create_task(self._pump(), name="ingest-pump")
+
+    async def put(self, ev: ParsedEvent) -> None:
+        self.enqueued += 1
+
+        # 디스크에 밀린 이벤트가 남아 있으면 뒤에 이어 붙여 순서를 유지한다
+        if self.spill_pending:
+            self._spill_event(ev)
+            return
+
+        try:
+            self._queue.put_nowait(ev)
+            return
+        except asyncio.QueueFull:
+            pass
+
+        if self.overflow == "spill":
+            self._spill_event(ev)
+            return
+
+        if self.overflow == "drop" and ev.etype in self.droppable:
+            self.dropped[ev.etype] += 1
+            return
+
+        self.blocked += 1
+        await self._queue.put(ev)
+
+    async def drain(self) -> None:
+        """큐와 spill 파일에 남은 이벤트가 모두 sink로 넘어갈 때까지 대기"""
+        while self.spill_pending:
+            await asyncio.sleep(0.05)
+        await self._queue.join()
+
+    async def close(self) -> None:
+        """남은 이벤트를 모두 sink로 넘긴 뒤 종료"""
+        if self._task is None:
+            return
+        await self.drain()
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+        if self._spill is not None:
+            self._spill.close()
+            self._spill = None
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "depth": self.depth,
+            "overflow": self.overflow,
+            "spill_pending": self.spill_pending,
+            "enqueued": self.enqueued,
+            "blocked": self.blocked,
+            "spilled": self.spilled,
+            "dropped": sum(self.dropped.values()),
+            "dropped_by_type": dict(self.dropped),
+            "lag_last_ms": round(self.lag_last_ms, 1),
+            "lag_avg_ms": round(self.lag_avg_ms, 1),
+            "lag_max_ms": round(self.lag_max_ms, 1),
+        }
+
+    def _spill_event(self, ev: ParsedEvent) -> None:
+        if self._spill is None:
+            os.makedirs(self._spill_dir, exist_ok=True)
+            path = os.path.join(self._spill_dir, f"ingest-{os.getpid()}.spill")
+            self._spill = _SpillFile(path)
+            logger.warning(f"Ingest queue full, spilling events to {path}")
+
+        frame = ev.raw_text if ev.raw_text is not None else encode_json(ev.raw)
+        if isinstance(frame, str):
+            frame = frame.encode("utf-8")
+        self._spill.append(frame)
+        self.spilled += 1
+
+    def _refill_from_spill(self) -> None:
+        # 메모리 큐가 빈 상태에서만 호출 -> maxsize만큼 꺼내 다시 채운다
+        for frame in self._spill.read(self.maxsize):
+            try:
+                self._queue.put_nowait(parse_event(decode_frame(frame), raw_text=frame))
+            except Exception as e:
+                logger.error(f"Dropping unreadable spilled frame: {e!r}")
+
+    def _observe_lag(self, ev: ParsedEvent) -> None:
+        if ev.ts is None:
+            return
+        # 지표일 뿐이므로 timestamp가 이상해도(naive datetime 등) 이벤트 처리는 계속한다
+        try:
+            lag = (datetime.now(timezone.utc) - ev.ts).total_seconds() * 1000.0
+        except Exception as e:
+            logger.debug(f"Cannot compute ingest lag for {ev.etype} (ts={ev.ts!r}): {e!r}")
+            return
+        self.lag_last_ms = lag
+        self.lag_avg_ms += _LAG_EWMA_ALPHA * (lag - self.lag_avg_ms)
+        if lag > self.lag_max_ms:
+            self.lag_max_ms = lag
+
+    async def _pump(self) -> None:
+        while True:
+            if self._queue.empty() and self.spill_pending:
+                self._refill_from_spill()
+                continue
+
+            ev = await self._queue.get()
+            try:
+                self._observe_lag(ev)
+                await self._sink(ev)
+            except Exception as e:
+                logger.error(f"Ingest sink failed for {ev.etype}: {e!r}")
+            finally:
+                self._queue.task_done()
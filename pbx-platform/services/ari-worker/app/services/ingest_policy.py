@@ -0,0 +1,186 @@
+from __future__ import annotations
+
+import enum
+import logging
+from collections import Counter
+from typing import Any, Optional
+
+from app.ari.parser import EventType, ParsedEvent, encode_json
+
+logger = logging.getLogger(__name__)
+
+
+class Action(str, enum.Enum):
+    """이벤트 타입별 적재 정책"""
+    IGNORE = "ignore"       # 수신 즉시 버림 (핸들러도 거치지 않음, ARI 구독에서도 제외 시도)
+    MEMORY = "memory"       # 핸들러만 처리하고 call_events에는 적재하지 않음
+    SLIM = "slim"           # 주요 필드만 추린 raw로 적재
+    FULL = "full"           # 원본 이벤트 그대로 적재
+
+
+# 기본 정책: 모든 이벤트 원본 적재 (재생 도구/장애 분석용 원본 보존)
+DEFAULT_RULES: dict[str, Action] = {}
+DEFAULT_ACTION = Action.FULL
+
+# 선택 프리셋 (EVENT_POLICY="reduced"): 콜 상태 전이/장애 분석에 쓰이는 이벤트만 원본 보관
+PRESETS: dict[str, tuple[dict[str, Action], Action]] = {
+    "reduced": (
+        {
+            EventType.STASIS_START.value: Action.FULL,
+            EventType.CHANNEL_HANGUP_REQUEST.value: Action.FULL,
+            EventType.CHANNEL_DESTROYED.value: Action.FULL,
+            EventType.STASIS_END.value: Action.SLIM,
+            EventType.CHANNEL_CREATED.value: Action.SLIM,
+            EventType.CHANNEL_STATE_CHANGE.value: Action.SLIM,
+            EventType.CHANNEL_ENTERED_BRIDGE.value: Action.SLIM,
+            EventType.CHANNEL_LEFT_BRIDGE.value: Action.SLIM,
+            EventType.BRIDGE_CREATED.value: Action.SLIM,
+            EventType.BRIDGE_DESTROYED.value: Action.SLIM,
+            EventType.DIAL.value: Action.SLIM,
+            EventType.CHANNEL_DIALPLAN.value: Action.IGNORE,
+            EventType.CHANNEL_VARSET.value: Action.IGNORE,
+        },
+        Action.SLIM,
+    ),
+}
+
+# CallService가 콜 상태를 만들기 위해 반드시 받아야 하는 이벤트 -> ignore 불가
+REQUIRED_TYPES = frozenset({
+    EventType.STASIS_START.value,
+    EventType.CHANNEL_HANGUP_REQUEST.value,
+    EventType.CHANNEL_DESTROYED.value,
+})
+
+# slim 적재 시 남기는 필드
+_SLIM_TOP = ("type", "timestamp", "application", "args", "cause", "cause_txt", "dialstatus")
+_SLIM_CHANNEL = ("id", "name", "state")
+_SLIM_BRIDGE = ("id", "bridge_type")
+
+
+def slim_event(raw: dict[str, Any]) -> dict[str, Any]:
+    out = {k: raw[k] for k in _SLIM_TOP if k in raw}
+    ch = raw.get("channel")
+    if isinstance(ch, dict):
+        out["channel"] = {k: ch[k] for k in _SLIM_CHANNEL if k in ch}
+    b = raw.get("bridge")
+    if isinstance(b, dict):
+        out["bridge"] = {k: b[k] for k in _SLIM_BRIDGE if k in b}
+    return out
+
+
+def parse_rules(spec: str) -> tuple[dict[str, Action], Action]:
+    """
+    "ChannelVarset=ignore,ChannelStateChange=memory,*=slim" -> (규칙, 기본값)
+    프리셋 이름("reduced")은 그 규칙/기본값을 깔고, 뒤에 오는 항목이 덮어쓴다.
+    지정하지 않은 타입은 DEFAULT_RULES(전부 full)를 따른다.
+    """
+    rules = dict(DEFAULT_RULES)
+    default = DEFAULT_ACTION
+    for item in (p.strip() for p in spec.split(",")):
+        if not item:
+            continue
+        preset = PRESETS.get(item.lower())
+        if preset is not None:
+            rules.update(preset[0])
+            default = preset[1]
+            continue
+        etype, sep, action = item.partition("=")
+        if not sep:
+            raise ValueError(f"Invalid event policy entry: {item!r} (expected Type=action or one of {list(PRESETS)})")
+        try:
+            act = Action(action.strip().lower())
+        except ValueError:
+            raise ValueError(f"Invalid event policy action: {item!r} (one of {[a.value for a in Action]})")
+        if etype.strip() == "*":
+            default = act
+        else:
+            rules[etype.strip()] = act
+    return rules, default
+
+
+class IngestPolicy:
+    def __init__(self, rules: Optional[dict[str, Action]] = None, default: Action = DEFAULT_ACTION):
+        self.rules = dict(DEFAULT_RULES if rules is None else rules)
+        self.default = default
+        for t in REQUIRED_TYPES:
+            if self.rules.get(t) is Action.IGNORE:
+                logger.warning(f"Event policy: {t} is required by CallService, using 'memory' instead of 'ignore'")
+                self.rules[t] = Action.MEMORY
+
+        # 메트릭 (seen: 정책이 없었다면 적재됐을 양 / stored: 실제 적재량)
+        self.events_seen = 0
+        self.rows_stored = 0
+        self.bytes_seen = 0
+        self.bytes_stored = 0
+        self.by_action: Counter[str] = Counter()
+
+    @classmethod
+    def from_spec(cls, spec: str) -> IngestPolicy:
+        rules, default = parse_rules(spec)
+        return cls(rules, default)
+
+    @classmethod
+    def store_all(cls) -> IngestPolicy:
+        """정책 미적용 (모든 이벤트 원본 적재)"""
+        return cls(rules={}, default=Action.FULL)
+
+    def action_for(self, etype: Optional[str]) -> Action:
+        if not etype:
+            return self.default
+        return self.rules.get(etype, self.default)
+
+    def ignored_types(self) -> list[str]:
+        """ARI eventFilter의 disallowed 목록 (기본값이 ignore여도 명시된 타입만)"""
+        return sorted(t for t, a in self.rules.items() if a is Action.IGNORE)
+
+    def project(self, ev: ParsedEvent, action: Action) -> tuple[Optional[dict[str, Any]], Optional[str]]:
+        """
+        적재할 (raw, raw_text) 반환, 적재하지 않으면 (None, None)
+        slim은 여기서 한 번만 직렬화해 writer가 다시 인코딩하지 않게 한다.
+        """
+        if action is Action.FULL:
+            raw, raw_text = ev.raw, ev.raw_text
+            stored = len(raw_text) if raw_text is not None else None
+        elif action is Action.SLIM:
+            raw = slim_event(ev.raw)
+            raw_text = encode_json(raw)
+            stored = len(raw_text)
+        else:
+            raw, raw_text, stored = None, None, 0
+
+        self.account(ev, action, stored)
+        return raw, raw_text
+
+    def account(self, ev: ParsedEvent, action: Action, stored_bytes: Optional[int] = 0) -> None:
+        seen = len(ev.raw_text) if ev.raw_text is not None else 0
+        self.events_seen += 1
+        self.bytes_seen += seen
+        self.by_action[action.value] += 1
+        if action in (Action.FULL, Action.SLIM):
+            self.rows_stored += 1
+            # 원본 프레임이 없는 FULL 이벤트는 수신 크기로 근사
+            self.bytes_stored += seen if stored_bytes is None else stored_bytes
+
+    def per_call(self, calls: int) -> dict[str, Any]:
+        if not calls:
+            return {}
+        return {
+            "rows_per_call_seen": round(self.events_seen / calls, 1),
+            "rows_per_call_stored": round(self.rows_stored / calls, 1),
+            "bytes_per_call_seen": self.bytes_seen // calls,
+            "bytes_per_call_stored": self.bytes_stored // calls,
+        }
+
+    def stats(self) -> dict[str, Any]:
+        def pct(saved: int, total: int) -> Optional[float]:
+            return round(100.0 * saved / total, 1) if total else None
+
+        return {
+            "events_seen": self.events_seen,
+            "rows_stored": self.rows_stored,
+            "row_reduction_pct": pct(self.events_seen - self.rows_stored, self.events_seen),
+            "bytes_seen": self.bytes_seen,
+            "bytes_stored": self.bytes_stored,
+            "byte_reduction_pct": pct(self.bytes_seen - self.bytes_stored, self.bytes_seen),
+            "by_action": dict(self.by_action),
+        }
@@ -0,0 +1,345 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import math
+import random
+import zlib
+from typing import Any, Awaitable, Callable, Optional
+
+from sqlalchemy import text
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncEngine
+
+from app.core.metrics import Counter
+
+logger = logging.getLogger(__name__)
+
+_UNOWNED = Counter(
+    "ari_worker_events_unowned_total",
+    "ARI events for partitions no worker owned (handled by no worker)",
+)
+
+# advisory lock 2-key 형식 (classid, objid) 의 네임스페이스
+MEMBER_LOCK_NS = 0x50425801         # (NS, backend pid): 살아있는 워커 표시
+PARTITION_LOCK_NS = 0x50425802      # (NS, partition): 파티션 소유권
+OFFER_LOCK_NS = 0x50425803          # (NS, partition): 넘겨줄 수 있는 파티션 표시 (초과 점유 + 진행 중 콜 없음)
+
+
+def partition_of(key: Optional[str], partitions: int) -> int:
+    """라우팅 키 -> 파티션 번호 (프로세스와 무관하게 항상 같은 값)"""
+    if not key:
+        return 0
+    return zlib.crc32(key.encode("utf-8")) % partitions
+
+
+class PartitionOwnership:
+    """
+    콜 소유권 분할 (다중 ari-worker 인스턴스)
+
+    - 모든 워커가 같은 ARI app을 구독하고, 콜 라우팅 키(caller 채널 ID)를
+      고정 개수의 파티션으로 해시한다.
+    - 파티션 소유권은 Postgres advisory lock으로 점유하므로 별도 브로커가 필요 없다.
+      워커가 죽으면 커넥션이 끊기면서 lock이 풀리고, 다른 워커가 가져간다.
+    - 각 워커는 ceil(파티션 수 / 살아있는 워커 수)개까지만 점유한다.
+      초과 점유 워커는 진행 중인 콜이 없는 초과분을 offer lock으로 표시하고,
+      부족한 워커는 그 파티션 lock을 기다린다(pg_advisory_lock + lock_timeout).
+      초과 점유 워커는 누군가 기다리는 파티션만 (여전히 콜이 없을 때) 반납한다.
+      -> unlock 즉시 기다리던 워커가 점유하므로 아무도 소유하지 않는 구간이 생기지 않는다.
+    - 워커 종료 직후처럼 소유자가 없는 파티션의 이벤트는 어떤 워커도 처리하지 않는다.
+      accept()가 이를 unowned로 세고 재분배 주기마다 로그로 남긴다.
+      다른 워커 소유로 알고 건너뛴 이벤트도, 다음 재분배 때 그 파티션의 소유자가 없으면
+      unowned로 옮긴다 (소유자가 언제 사라졌는지 모르므로 상한값).
+    """
+
+    def __init__(
+            self,
+            engine: AsyncEngine,
+            partitions: int,
+            rebalance_interval: float = 5.0,
+            handoff_poll: float = 0.2,
+            handoff_wait: float = 1.0,
+            is_busy: Optional[Callable[[int], bool]] = None,
+            on_acquired: Optional[Callable[[frozenset[int]], Awaitable[None]]] = None,
+    ):
+        self._engine = engine
+        self.partitions = partitions
+        self._interval = rebalance_interval
+        # 초과 점유 중에는 대기 중인 워커를 빨리 찾도록 짧은 주기로 확인
+        self._handoff_poll = handoff_poll
+        self._handoff_wait = handoff_wait
+        self._is_busy = is_busy or (lambda p: False)
+        # 실행 중 새로 점유한 파티션 통지 (해당 파티션의 진행 중 콜 상태 복구용)
+        self._on_acquired = on_acquired
+
+        self._conn: Optional[AsyncConnection] = None
+        self._owned: set[int] = set()
+        self._offered: set[int] = set()
+        # 직전 재분배 시점에 어떤 워커든 점유하고 있던 파티션
+        self._held: set[int] = set()
+        self._over_target = False
+        self._pid: Optional[int] = None
+        self._task: Optional[asyncio.Task] = None
+
+        # 메트릭
+        self.members = 0
+        self.acquired_total = 0
+        self.released_total = 0
+        self.handoffs = 0
+        self.not_owned = 0
+        self.unowned = 0
+        self._unowned_reported = 0
+        self._unowned_parts: set[int] = set()
+        # 직전 재분배 이후 다른 워커 소유로 보고 건너뛴 이벤트 수 (파티션별)
+        self._skipped: dict[int, int] = {}
+
+    @property
+    def enabled(self) -> bool:
+        return self.partitions > 0
+
+    @property
+    def owned(self) -> frozenset[int]:
+        return frozenset(self._owned)
+
+    def owns(self, key: Optional[str]) -> bool:
+        if not self.enabled:
+            return True
+        return partition_of(key, self.partitions) in self._owned
+
+    def accept(self, key: Optional[str]) -> bool:
+        """이벤트 수신 시 판단: owns()와 같고, 처리하지 않는 이벤트를 사유별로 센다"""
+        if not self.enabled:
+            return True
+        p = partition_of(key, self.partitions)
+        if p in self._owned:
+            return True
+        if p in self._held:
+            self.not_owned += 1
+            self._skipped[p] = self._skipped.get(p, 0) + 1
+        else:
+            # 소유자가 없는 파티션 -> 다른 워커도 처리하지 않는 유실 이벤트
+            self._count_unowned(p, 1)
+        return False
+
+    def _count_unowned(self, p: int, n: int) -> None:
+        self.unowned += n
+        self._unowned_parts.add(p)
+        _UNOWNED.inc(amount=n)
+
+    async def start(self) -> None:
+        if not self.enabled or self._task is not None:
+            return
+        await self._rebalance()
+        self._task = asyncio.create_task(self._run(), name="partition-ownership")
+
+    async def close(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        await self._disconnect(release=True)
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "partitions": self.partitions,
+            "owned": len(self._owned),
+            "members": self.members,
+            "acquired_total": self.acquired_total,
+            "released_total": self.released_total,
+            "handoffs": self.handoffs,
+            "not_owned": self.not_owned,
+            "unowned": self.unowned,
+        }
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self._handoff_poll if self._over_target else self._interval)
+            try:
+                await self._rebalance()
+            except Exception as e:
+                logger.error(f"Partition rebalance failed: {e!r}")
+                # 커넥션을 버려 lock을 모두 푼다 -> 다음 주기에 재접속/재점유
+                await self._disconnect(release=False)
+            self._report_unowned()
+
+    def _report_unowned(self) -> None:
+        dropped = self.unowned - self._unowned_reported
+        if dropped:
+            logger.warning(f"Dropped {dropped} events for unowned partitions {sorted(self._unowned_parts)}")
+            self._unowned_reported = self.unowned
+            self._unowned_parts.clear()
+
+    async def _connect(self) -> AsyncConnection:
+        if self._conn is None:
+            conn = await self._engine.connect()
+            # advisory lock은 세션 단위 -> 트랜잭션을 열어둘 필요가 없으므로 autocommit
+            self._conn = await conn.execution_options(isolation_level="AUTOCOMMIT")
+            res = await self._conn.execute(
+                text("SELECT pg_advisory_lock(:ns, pg_backend_pid()), pg_backend_pid()"),
+                {"ns": MEMBER_LOCK_NS},
+            )
+            self._pid = int(res.one()[1])
+            # 넘겨받기 대기(pg_advisory_lock) 1회 상한
+            await self._conn.execute(text(f"SET lock_timeout = {int(self._handoff_wait * 1000)}"))
+        return self._conn
+
+    async def _partition_locks(self, conn: AsyncConnection) -> list[tuple[int, int, int, bool]]:
+        """파티션/offer lock 현황: (네임스페이스, 파티션, backend pid, 점유 여부) - 대기 중이면 granted = false"""
+        res = await conn.execute(
+            text(
+                "SELECT classid::int, objid::int, pid, granted FROM pg_locks "
+                "WHERE locktype = 'advisory' AND classid IN (:ns, :offer_ns) AND objsubid = 2"
+            ),
+            {"ns": PARTITION_LOCK_NS, "offer_ns": OFFER_LOCK_NS},
+        )
+        return [(int(ns), int(p), int(pid), bool(granted)) for ns, p, pid, granted in res.all()]
+
+    def _handoff_candidate(self, locks: list[tuple[int, int, int, bool]], target: int) -> Optional[int]:
+        """넘겨받을 파티션: 다른 워커가 offer한 것 우선, 없으면 목표보다 많이 점유한 워커의 파티션 중 하나"""
+        offered = [
+            p for ns, p, pid, granted in locks
+            if ns == OFFER_LOCK_NS and granted and pid != self._pid and p not in self._owned
+        ]
+        if offered:
+            return random.choice(offered)
+        held_by: dict[int, list[int]] = {}
+        for ns, p, pid, granted in locks:
+            if ns == PARTITION_LOCK_NS and granted and pid != self._pid:
+                held_by.setdefault(pid, []).append(p)
+        excess = [p for parts in held_by.values() if len(parts) > target for p in parts]
+        # 상대가 진행 중인 콜 때문에 반납하지 못하는 파티션에 계속 걸리지 않도록 무작위 선택
+        return random.choice(excess) if excess else None
+
+    async def _update_offers(self, conn: AsyncConnection, target: int) -> None:
+        """초과 점유분 중 진행 중인 콜이 없는 파티션을 offer로 표시 (나머지 offer는 철회)"""
+        excess = len(self._owned) - target
+        offer: set[int] = set()
+        if excess > 0:
+            idle = [p for p in sorted(self._owned, reverse=True) if not self._is_busy(p)]
+            offer = set(idle[:excess])
+        for p in self._offered - offer:
+            await conn.execute(text("SELECT pg_advisory_unlock(:ns, :p)"), {"ns": OFFER_LOCK_NS, "p": p})
+        for p in offer - self._offered:
+            await conn.execute(text("SELECT pg_try_advisory_lock(:ns, :p)"), {"ns": OFFER_LOCK_NS, "p": p})
+        self._offered = offer
+
+    async def _disconnect(self, release: bool) -> None:
+        conn, self._conn = self._conn, None
+        lost = len(self._owned)
+        self._owned.clear()
+        self._offered.clear()
+        self._over_target = False
+        if conn is None:
+            return
+        try:
+            if release:
+                await conn.execute(text("SELECT pg_advisory_unlock_all()"))
+        except Exception as e:
+            logger.warning(f"Advisory unlock failed: {e!r}")
+        try:
+            # 풀에 돌려보내지 않고 물리 연결을 닫는다: 오류 후(statement timeout 등) 세션이 살아 있으면
+            # member/파티션 lock이 풀 안의 커넥션에 남아 어떤 워커도 그 파티션을 처리하지 못한다
+            await conn.invalidate()
+            await conn.close()
+        except Exception as e:
+            logger.warning(f"Ownership connection close failed: {e!r}")
+        if lost:
+            self.released_total += lost
+            logger.warning(f"Released {lost} partitions")
+
+    async def _rebalance(self) -> None:
+        conn = await self._connect()
+
+        res = await conn.execute(
+            text(
+                "SELECT count(*) FROM pg_locks "
+                "WHERE locktype = 'advisory' AND granted AND classid = :ns AND objsubid = 2"
+            ),
+            {"ns": MEMBER_LOCK_NS},
+        )
+        self.members = max(int(res.scalar_one()), 1)
+        target = math.ceil(self.partitions / self.members)
+
+        locks = await self._partition_locks(conn)
+        held = {p for ns, p, _, granted in locks if ns == PARTITION_LOCK_NS and granted}
+        # 소유자가 없어진 파티션: 직전 재분배 이후 건너뛴 이벤트는 아무도 처리하지 않았을 수 있다
+        for p, n in self._skipped.items():
+            if p not in held:
+                self.not_owned -= n
+                self._count_unowned(p, n)
+        self._skipped.clear()
+        self._held = held
+
+        # 1. 초과 점유분 반납: 다른 워커가 lock을 기다리는 파티션만 (진행 중인 콜이 없을 때)
+        #    이벤트 처리를 먼저 멈춘 뒤 unlock -> 기다리던 워커가 바로 점유한다
+        if len(self._owned) > target:
+            waited = {
+                p for ns, p, pid, granted in locks
+                if ns == PARTITION_LOCK_NS and not granted and pid != self._pid
+            }
+            for p in sorted(self._owned & waited, reverse=True):
+                if len(self._owned) <= target:
+                    break
+                if self._is_busy(p):
+                    continue
+                self._owned.discard(p)
+                await conn.execute(
+                    text("SELECT pg_advisory_unlock(:ns, :p)"),
+                    {"ns": PARTITION_LOCK_NS, "p": p},
+                )
+                self.released_total += 1
+                self.handoffs += 1
+        await self._update_offers(conn, target)
+        self._over_target = len(self._owned) > target
+
+        # 2. 부족분 점유 (다른 워커가 가진 파티션은 try_lock이 실패하므로 건너뜀)
+        acquired: set[int] = set()
+        if len(self._owned) < target:
+            for p in range(self.partitions):
+                if len(self._owned) >= target:
+                    break
+                if p in self._owned:
+                    continue
+                res = await conn.execute(
+                    text("SELECT pg_try_advisory_lock(:ns, :p)"),
+                    {"ns": PARTITION_LOCK_NS, "p": p},
+                )
+                if res.scalar_one():
+                    self._owned.add(p)
+                    acquired.add(p)
+
+        # 3. 그래도 부족하면 초과 점유 워커의 파티션을 기다려 넘겨받는다 (최대 재분배 주기 1회 동안)
+        #    (최초 점유 시에는 기다리지 않음 - 시작을 늦추지 않도록)
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + self._interval
+        while self._task is not None and len(self._owned) < target and loop.time() < deadline:
+            p = self._handoff_candidate(await self._partition_locks(conn), target)
+            if p is None:
+                break
+            try:
+                await conn.execute(
+                    text("SELECT pg_advisory_lock(:ns, :p)"),
+                    {"ns": PARTITION_LOCK_NS, "p": p},
+                )
+            except DBAPIError:
+                # lock_timeout: 상대가 아직 반납하지 않음 (진행 중인 콜 등) -> 다른 파티션으로 다시
+                continue
+            self._owned.add(p)
+            acquired.add(p)
+        self._held |= self._owned
+
+        if acquired:
+            self.acquired_total += len(acquired)
+            logger.info(
+                f"Acquired partitions {sorted(acquired)} "
+                f"(owned={len(self._owned)}/{self.partitions}, members={self.members})"
+            )
+            # 최초 점유(start)는 WebSocket 접속 시 복구로 처리되므로 실행 중 점유분만 통지
+            if self._on_acquired is not None and self._task is not None:
+                try:
+                    await self._on_acquired(frozenset(acquired))
+                except Exception as e:
+                    logger.error(f"Partition acquire hook failed: {e!r}")
@@ -0,0 +1,247 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+import uuid
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Iterator, Optional
+
+from app.core.metrics import Counter, Histogram
+
+logger = logging.getLogger(__name__)
+
+_EVICTIONS = Counter(
+    "ari_worker_session_evictions_total", "Call sessions removed by the TTL sweeper", ("reason",),
+)
+_SWEEP_SECONDS = Histogram(
+    "ari_worker_session_sweep_seconds", "TTL sweep duration (including the ARI channel check)",
+)
+
+
+class CallSession:
+    """진행 중인 콜 1건의 메모리 상태 (__slots__: 콜당 dict 없이 고정 크기)"""
+
+    __slots__ = (
+        "call_id",
+        "target_exten",
+        "caller_channel_id",
+        "callee_channel_id",
+        "bridge_id",
+        "bridged",
+        "done",
+        "last_event",
+    )
+
+    def __init__(
+            self,
+            call_id: uuid.UUID,
+            target_exten: str,
+            caller_channel_id: str,
+            callee_channel_id: Optional[str] = None,
+            bridge_id: Optional[str] = None,
+            bridged: bool = False,
+            done: bool = False,
+    ):
+        self.call_id = call_id
+        self.target_exten = target_exten
+        self.caller_channel_id = caller_channel_id
+        self.callee_channel_id = callee_channel_id
+        self.bridge_id = bridge_id
+        self.bridged = bridged
+        self.done = done
+        self.last_event = time.monotonic()
+
+    def channels(self) -> tuple[str, ...]:
+        return tuple(c for c in (self.caller_channel_id, self.callee_channel_id) if c)
+
+    def __repr__(self) -> str:
+        return (
+            f"CallSession(call_id={self.call_id}, caller={self.caller_channel_id}, "
+            f"callee={self.callee_channel_id}, bridge={self.bridge_id}, bridged={self.bridged}, done={self.done})"
+        )
+
+
+class SessionStore:
+    """
+    콜 세션 + 채널 매핑 저장소
+
+    세션은 마지막 이벤트 시각 순서(OrderedDict, touch 시 맨 뒤로)로 유지되어
+    만료 후보는 앞에서부터 오래된 것만 훑으면 된다.
+    채널 매핑은 세션에 속한 채널만 갖고, 세션 제거 시 함께 지운다.
+    """
+
+    def __init__(self):
+        self._calls: OrderedDict[uuid.UUID, CallSession] = OrderedDict()
+        self._channel_to_call: dict[str, uuid.UUID] = {}
+        self._channel_to_bridge: dict[str, str] = {}
+
+    def __len__(self) -> int:
+        return len(self._calls)
+
+    def __contains__(self, call_id: uuid.UUID) -> bool:
+        return call_id in self._calls
+
+    def values(self) -> Iterator[CallSession]:
+        return iter(list(self._calls.values()))
+
+    def get(self, call_id: Optional[uuid.UUID]) -> Optional[CallSession]:
+        return self._calls.get(call_id) if call_id else None
+
+    def add(self, sess: CallSession) -> None:
+        self._calls[sess.call_id] = sess
+        self._calls.move_to_end(sess.call_id)
+        for ch in sess.channels():
+            self._channel_to_call[ch] = sess.call_id
+        if sess.bridge_id:
+            for ch in sess.channels():
+                self._channel_to_bridge[ch] = sess.bridge_id
+
+    def call_for_channel(self, channel_id: Optional[str]) -> Optional[uuid.UUID]:
+        return self._channel_to_call.get(channel_id) if channel_id else None
+
+    def bridge_for_channel(self, channel_id: Optional[str]) -> Optional[str]:
+        return self._channel_to_bridge.get(channel_id) if channel_id else None
+
+    def map_channel(self, channel_id: str, call_id: uuid.UUID) -> None:
+        self._channel_to_call[channel_id] = call_id
+
+    def map_bridge(self, channel_id: str, bridge_id: str) -> None:
+        # 콜에 속하지 않은 채널(direct 등)은 정리 시점이 없으므로 기록하지 않는다
+        if channel_id in self._channel_to_call:
+            self._channel_to_bridge[channel_id] = bridge_id
+
+    def touch(self, call_id: Optional[uuid.UUID], now: Optional[float] = None) -> None:
+        sess = self._calls.get(call_id) if call_id else None
+        if sess is None:
+            return
+        sess.last_event = time.monotonic() if now is None else now
+        self._calls.move_to_end(call_id)
+
+    def remove(self, call_id: uuid.UUID) -> Optional[CallSession]:
+        sess = self._calls.pop(call_id, None)
+        if sess is None:
+            return None
+        for ch in sess.channels():
+            self._channel_to_call.pop(ch, None)
+            self._channel_to_bridge.pop(ch, None)
+        return sess
+
+    def stale(self, ttl: float, now: Optional[float] = None, limit: int = 10000) -> list[CallSession]:
+        """마지막 이벤트가 ttl초보다 오래된 세션 (오래된 순, 최신 세션을 만나면 중단)"""
+        cutoff = (time.monotonic() if now is None else now) - ttl
+        out: list[CallSession] = []
+        for sess in self._calls.values():
+            if sess.last_event > cutoff or len(out) >= limit:
+                break
+            out.append(sess)
+        return out
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "calls": len(self._calls),
+            "channel_to_call": len(self._channel_to_call),
+            "channel_to_bridge": len(self._channel_to_bridge),
+        }
+
+
+class SessionSweeper:
+    """
+    이벤트가 끊긴 세션 정리 (hangup 유실: 재접속, 브릿지 실패 등)
+
+    ttl초 동안 이벤트가 없던 세션을 모아 ARI 채널 목록과 대조한다.
+    - 채널이 하나라도 살아 있으면 긴 통화로 보고 유지 (touch)
+    - 모두 사라졌으면 evict 콜백으로 종료 처리
+    ARI 조회가 실패하면 확인할 수 없으므로 이번 주기는 건너뛴다.
+    """
+
+    def __init__(
+            self,
+            store: SessionStore,
+            list_channels: Callable[[], Awaitable[list[dict[str, Any]]]],
+            evict: Callable[[CallSession], Awaitable[None]],
+            ttl: float = 300.0,
+            interval: float = 60.0,
+    ):
+        self.store = store
+        self._list_channels = list_channels
+        self._evict = evict
+        self.ttl = ttl
+        self.interval = interval
+        self._task: Optional[asyncio.Task] = None
+
+        # 메트릭
+        self.sweeps = 0
+        self.candidates = 0
+        self.kept_alive = 0
+        self.evicted = 0
+        self.check_failures = 0
+
+    def start(self) -> None:
+        if self._task is None and self.ttl > 0 and self.interval > 0:
+            self._task = asyncio.create_task(self._run())
+
+    async def close(self) -> None:
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self.interval)
+            try:
+                await self.sweep()
+            except Exception as e:
+                logger.error(f"Session sweep failed: {e!r}")
+
+    async def sweep(self) -> int:
+        stale = self.store.stale(self.ttl)
+        self.sweeps += 1
+        if not stale:
+            return 0
+        self.candidates += len(stale)
+
+        with _SWEEP_SECONDS.time():
+            try:
+                live = {c.get("id") for c in await self._list_channels()}
+            except Exception as e:
+                self.check_failures += 1
+                logger.warning(f"Session sweep skipped, ARI channel check failed: {e!r}")
+                return 0
+
+            evicted = 0
+            now = time.monotonic()
+            for sess in stale:
+                # ARI 조회 중 이벤트가 들어왔거나 이미 정리된 세션
+                if sess.call_id not in self.store or sess.last_event > now - self.ttl:
+                    continue
+                if any(ch in live for ch in sess.channels()):
+                    self.store.touch(sess.call_id, now)
+                    self.kept_alive += 1
+                    continue
+                try:
+                    await self._evict(sess)
+                except Exception as e:
+                    logger.error(f"Session evict failed ({sess.call_id}): {e!r}")
+                    self.store.remove(sess.call_id)
+                _EVICTIONS.inc("expired")
+                evicted += 1
+
+        self.evicted += evicted
+        if evicted:
+            logger.warning(f"Session sweep evicted {evicted} stale sessions (candidates={len(stale)})")
+        return evicted
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "sweeps": self.sweeps,
+            "candidates": self.candidates,
+            "kept_alive": self.kept_alive,
+            "evicted": self.evicted,
+            "check_failures": self.check_failures,
+        }
@@ -0,0 +1,268 @@
+from __future__ import annotations
+
+import asyncio
+import glob
+import json
+import logging
+import mmap
+import os
+import struct
+import uuid
+import zlib
+from datetime import datetime
+from typing import Any, Awaitable, Callable, Iterator, Optional
+
+logger = logging.getLogger(__name__)
+
+# 레코드 종류
+SPOOL_EVENT = "event"               # call_events 행
+SPOOL_CALL = "call"                 # calls 전체 행 upsert
+SPOOL_CALL_UPDATE = "call_update"   # calls 조건부 UPDATE ({"id": ..., "values": {...}})
+
+_KIND_CODES = {SPOOL_EVENT: 1, SPOOL_CALL: 2, SPOOL_CALL_UPDATE: 3}
+_KIND_NAMES = {v: k for k, v in _KIND_CODES.items()}
+
+# 레코드 헤더: [u32 payload 길이][u32 crc32(payload)][u8 종류]
+_HEADER = struct.Struct("<IIB")
+
+_SEGMENT_GLOB = "spool-*.seg"
+
+# JSON으로 왕복시키면 문자열이 되는 컬럼들 -> 재생 시 원래 타입으로 복원
+_UUID_FIELDS = ("id", "call_id")
+_DATETIME_FIELDS = ("ts", "started_at", "answered_at", "ended_at")
+
+SpoolRecord = tuple[str, dict[str, Any]]
+
+
+def _json_default(o: Any) -> Any:
+    if isinstance(o, datetime):
+        return o.isoformat()
+    if isinstance(o, uuid.UUID):
+        return str(o)
+    raise TypeError(f"Unserializable spool value: {type(o).__name__}")
+
+
+def _restore_types(values: dict[str, Any]) -> dict[str, Any]:
+    for k in _UUID_FIELDS:
+        v = values.get(k)
+        if isinstance(v, str):
+            values[k] = uuid.UUID(v)
+    for k in _DATETIME_FIELDS:
+        v = values.get(k)
+        if isinstance(v, str):
+            values[k] = datetime.fromisoformat(v)
+    return values
+
+
+def encode_record(kind: str, payload: dict[str, Any]) -> bytes:
+    body = json.dumps(payload, default=_json_default, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+    return _HEADER.pack(len(body), zlib.crc32(body), _KIND_CODES[kind]) + body
+
+
+def decode_payload(kind: str, body: bytes) -> dict[str, Any]:
+    payload = json.loads(body)
+    if kind == SPOOL_CALL_UPDATE:
+        payload["id"] = uuid.UUID(payload["id"])
+        _restore_types(payload["values"])
+        return payload
+    return _restore_types(payload)
+
+
+def read_segment(path: str) -> tuple[list[SpoolRecord], bool]:
+    """
+    세그먼트 파일을 mmap으로 읽어 레코드 목록 반환
+    반환: (레코드, 손상 여부) -> 잘린 꼬리/CRC 불일치 지점에서 읽기를 멈춘다.
+    """
+    records: list[SpoolRecord] = []
+    with open(path, "rb") as f:
+        size = os.fstat(f.fileno()).st_size
+        if size == 0:
+            return records, False
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            pos = 0
+            while pos + _HEADER.size <= size:
+                n, crc, code = _HEADER.unpack_from(mm, pos)
+                start = pos + _HEADER.size
+                end = start + n
+                if end > size or code not in _KIND_NAMES:
+                    return records, True
+                body = mm[start:end]
+                if zlib.crc32(body) != crc:
+                    return records, True
+                kind = _KIND_NAMES[code]
+                records.append((kind, decode_payload(kind, body)))
+                pos = end
+            return records, pos != size
+
+
+class Spool:
+    """
+    DB 장애 대비 로컬 write-ahead spool
+
+    - DB 쓰기가 실패한 행을 append-only 세그먼트 파일에 기록한다.
+      (길이 + CRC32 + 종류 헤더 뒤에 JSON 본문)
+    - fsync는 레코드마다 하지 않고 fsync_ms 주기로 묶어서 한 번 -> 장애 중에도 처리량 유지
+    - 세그먼트가 segment_bytes를 넘으면 새 파일로 교체하고,
+      재생 task가 닫힌 세그먼트를 mmap으로 읽어 apply()로 DB에 반영한 뒤 삭제한다.
+      쓰는 중인 세그먼트는 밀린 세그먼트가 모두 반영된 뒤(DB 정상)에만 앞당겨 닫는다.
+    - apply()는 멱등이어야 한다 (같은 세그먼트를 다시 재생해도 중복이 생기지 않게).
+    """
+
+    def __init__(
+            self,
+            directory: str,
+            segment_bytes: int = 16 * 1024 * 1024,
+            fsync_ms: int = 100,
+            replay_interval: float = 5.0,
+            replay_batch: int = 500,
+    ):
+        self.directory = directory
+        self.segment_bytes = segment_bytes
+        self._fsync_interval = fsync_ms / 1000.0
+        self._replay_interval = replay_interval
+        self._replay_batch = replay_batch
+
+        self._fh = None
+        self._seq = 0
+        self._active_path: Optional[str] = None
+        self._active_records = 0
+        self._dirty = False
+        self._apply: Optional[Callable[[list[SpoolRecord]], Awaitable[None]]] = None
+        self._tasks: list[asyncio.Task] = []
+
+        # 메트릭
+        self.appended = 0
+        self.replayed = 0
+        self.replay_failures = 0
+        self.corrupt_segments = 0
+        self.fsyncs = 0
+
+    @property
+    def pending_segments(self) -> int:
+        return len(self._sealed_segments()) + (1 if self._active_records else 0)
+
+    def start(self, apply: Callable[[list[SpoolRecord]], Awaitable[None]]) -> None:
+        """apply: 재생할 레코드 묶음을 DB에 반영하는 코루틴 (실패 시 예외 -> 다음 주기에 재시도)"""
+        if self._tasks:
+            return
+        os.makedirs(self.directory, exist_ok=True)
+        # 이전 실행에서 남은 세그먼트는 모두 닫힌 것으로 보고 그 뒤 번호부터 사용
+        existing = self._sealed_segments()
+        if existing:
+            self._seq = int(os.path.basename(existing[-1])[6:-4])
+            logger.warning(f"Spool has {len(existing)} segments from a previous run, replaying")
+        self._apply = apply
+        self._tasks = [
+            asyncio.create_task(self._sync_loop(), name="spool-fsync"),
+            asyncio.create_task(self._replay_loop(), name="spool-replay"),
+        ]
+
+    def append(self, kind: str, payload: dict[str, Any]) -> None:
+        if self._fh is None:
+            self._open_segment()
+        self._fh.write(encode_record(kind, payload))
+        self._active_records += 1
+        self._dirty = True
+        self.appended += 1
+        if self._fh.tell() >= self.segment_bytes:
+            self._seal()
+
+    def append_many(self, kind: str, payloads: list[dict[str, Any]]) -> None:
+        for p in payloads:
+            self.append(kind, p)
+
+    async def close(self) -> None:
+        for t in self._tasks:
+            t.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        # 남은 레코드는 디스크에 두고 다음 실행에서 재생
+        if self._fh is not None:
+            self._seal()
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "pending_segments": self.pending_segments,
+            "appended": self.appended,
+            "replayed": self.replayed,
+            "replay_failures": self.replay_failures,
+            "corrupt_segments": self.corrupt_segments,
+            "fsyncs": self.fsyncs,
+        }
+
+    def _sealed_segments(self) -> list[str]:
+        paths = sorted(glob.glob(os.path.join(self.directory, _SEGMENT_GLOB)))
+        return [p for p in paths if p != self._active_path]
+
+    def _open_segment(self) -> None:
+        self._seq += 1
+        self._active_path = os.path.join(self.directory, f"spool-{self._seq:012d}.seg")
+        self._fh = open(self._active_path, "ab")
+        self._active_records = 0
+
+    def _seal(self) -> None:
+        fh, self._fh = self._fh, None
+        fh.flush()
+        os.fsync(fh.fileno())
+        fh.close()
+        self.fsyncs += 1
+        self._dirty = False
+        self._active_path = None
+        self._active_records = 0
+
+    async def _sync_loop(self) -> None:
+        while True:
+            await asyncio.sleep(self._fsync_interval)
+            if not self._dirty or self._fh is None:
+                continue
+            self._dirty = False
+            self._fh.flush()
+            # fsync 도중 세그먼트가 교체(close)되어도 안전하도록 fd를 복제해서 사용
+            fd = os.dup(self._fh.fileno())
+            try:
+                await asyncio.to_thread(os.fsync, fd)
+            finally:
+                os.close(fd)
+            self.fsyncs += 1
+
+    async def _replay_loop(self) -> None:
+        while True:
+            await asyncio.sleep(self._replay_interval)
+            # 닫힌 세그먼트 재생이 실패하면(DB 장애 중) 쓰는 중인 세그먼트는 크기로만 교체한다
+            # -> 장애 동안 주기마다 작은 세그먼트가 쌓이지 않게
+            if not await self._replay_sealed():
+                continue
+            # 밀린 세그먼트를 모두 반영했으면(DB 정상) 쓰는 중인 세그먼트도 닫아서 바로 재생
+            if self._fh is not None and self._active_records:
+                self._seal()
+                await self._replay_sealed()
+
+    async def _replay_sealed(self) -> bool:
+        """닫힌 세그먼트를 순서대로 재생. 모두 반영했으면 True"""
+        for path in self._sealed_segments():
+            try:
+                await self._replay_segment(path)
+            except Exception as e:
+                self.replay_failures += 1
+                logger.warning(f"Spool replay failed, will retry ({os.path.basename(path)}): {e!r}")
+                return False
+        return True
+
+    async def _replay_segment(self, path: str) -> None:
+        records, corrupt = await asyncio.to_thread(read_segment, path)
+        if corrupt:
+            # 크래시로 잘린 꼬리 -> 온전한 레코드까지만 재생
+            self.corrupt_segments += 1
+            logger.error(f"Spool segment truncated/corrupt, replaying {len(records)} intact records: {path}")
+
+        for i in range(0, len(records), self._replay_batch):
+            await self._apply(records[i:i + self._replay_batch])
+
+        os.remove(path)
+        self.replayed += len(records)
+        if records:
+            logger.info(f"Spool replayed {len(records)} records from {os.path.basename(path)}")
+
+
+def iter_kind(records: list[SpoolRecord], kind: str) -> Iterator[dict[str, Any]]:
+    return (payload for k, payload in records if k == kind)
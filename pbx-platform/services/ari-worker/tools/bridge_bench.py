@@ -0,0 +1,164 @@
+"""
+응답 후 셋업(브릿지) / 종료(teardown) 시간 측정 (fake ARI)
+
+- old: 이전 방식. create_bridge -> add_channel_to_bridge x2 를 순서대로,
+       종료는 hangup(caller) -> hangup(callee) -> destroy_bridge 를 순서대로
+- new: CallService 그대로. callee StasisStart -> mark_bridged까지 (브릿지 ID 지정 + 두 채널 한 번에 추가),
+       ChannelHangupRequest 처리 완료까지 (hangup/destroy 동시 실행)
+
+ARI는 실제 HTTP(AriClient -> fake ARI)로 호출하고, DB 기록은 하지 않는다 (NullRecorder).
+--rest-delay-ms로 REST 왕복마다 지연을 넣어 실제 Asterisk와 떨어진 환경을 흉내 낸다.
+
+    python -m tools.bridge_bench --calls 300 --rest-delay-ms 0,2,5
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import logging
+import statistics
+import time
+import uuid
+from typing import Any, Optional
+
+from app.ari.client import AriClient
+from app.ari.parser import parse_event
+from app.services.call_service import CallService, callee_channel_id_for
+from tools.call_storm import percentile
+from tools.fake_ari import CAUSE_NORMAL, FakeAri, StormProfile, ari_timestamp
+from tools.replay import NullRecorder
+
+logger = logging.getLogger("bridge_bench")
+
+# fake ARI가 originate 후 스스로 응답/종료하지 않도록 (시나리오는 벤치가 직접 진행)
+_IDLE_PROFILE = StormProfile(answer_delay=(3600.0, 3600.0), talk_time=(3600.0, 3600.0), no_answer_ratio=0.0)
+
+
+class _BridgeWaitRecorder(NullRecorder):
+    """mark_bridged 시각을 콜별 future로 알려 주는 recorder 대역"""
+
+    def __init__(self):
+        super().__init__()
+        self.waiters: dict[uuid.UUID, asyncio.Future] = {}
+
+    async def mark_bridged(self, call_id: uuid.UUID, *args: Any, **kwargs: Any) -> None:
+        fut = self.waiters.pop(call_id, None)
+        if fut is not None and not fut.done():
+            fut.set_result(time.perf_counter())
+
+    async def mark_failed(self, call_id: uuid.UUID, *args: Any, reason: Optional[str] = None, **kwargs: Any) -> None:
+        fut = self.waiters.pop(call_id, None)
+        if fut is not None and not fut.done():
+            fut.set_exception(RuntimeError(f"bridge failed: {reason}"))
+
+
+def _event(etype: str, channel: dict[str, Any], **body: Any):
+    return parse_event({"type": etype, "timestamp": ari_timestamp(), "channel": dict(channel), **body})
+
+
+async def _new_call(n: int, fake: FakeAri, service: CallService, recorder: _BridgeWaitRecorder) -> tuple[float, float]:
+    caller = f"bench-{n}"
+    ch = fake._new_channel(caller, f"PJSIP/1000-{n:08x}", "2000", "Ring")
+    await service.handle_event(_event("StasisStart", ch, args=["2000"]))  # -> originate
+    callee = callee_channel_id_for(caller)
+    call_id = service.sessions.call_for_channel(callee)
+    fut = asyncio.get_running_loop().create_future()
+    recorder.waiters[call_id] = fut
+
+    t0 = time.perf_counter()
+    await service.handle_event(_event("StasisStart", fake.channels[callee], args=["callee", "2000", str(call_id)]))
+    setup = await fut - t0
+
+    t0 = time.perf_counter()
+    await service.handle_event(_event("ChannelHangupRequest", fake.channels[caller], cause=CAUSE_NORMAL))
+    teardown = time.perf_counter() - t0
+    return setup, teardown
+
+
+async def _old_call(n: int, fake: FakeAri, ari: AriClient) -> tuple[float, float]:
+    caller, callee = f"bench-{n}", callee_channel_id_for(f"bench-{n}")
+    fake._new_channel(caller, f"PJSIP/1000-{n:08x}", "2000", "Up")
+    fake._new_channel(callee, f"PJSIP/2000-{n:08x}", "2000", "Up")
+
+    t0 = time.perf_counter()
+    bridge_id = await ari.create_bridge(name=f"call-{n:08x}", bridge_type="mixing")
+    await ari.add_channel_to_bridge(bridge_id, caller)
+    await ari.add_channel_to_bridge(bridge_id, callee)
+    setup = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    for op in (lambda: ari.hangup_channel(caller), lambda: ari.hangup_channel(callee), lambda: ari.destroy_bridge(bridge_id)):
+        try:
+            await op()
+        except Exception as e:
+            logger.warning(f"teardown failed: {e!r}")
+    teardown = time.perf_counter() - t0
+    return setup, teardown
+
+
+async def _run(mode: str, calls: int, concurrency: int, rest_delay: float, port: int) -> dict[str, Any]:
+    fake = FakeAri(profile=_IDLE_PROFILE, rest_delay=rest_delay)
+    await fake.start("127.0.0.1", port)
+    ari = AriClient(ari_base=f"http://127.0.0.1:{port}/ari", ari_app="pbx", api_key="x:x")
+    await ari.start()
+    recorder = _BridgeWaitRecorder()
+    service = CallService(ari=ari, recorder=recorder)
+    sem = asyncio.Semaphore(concurrency)
+
+    async def one(n: int) -> tuple[float, float]:
+        async with sem:
+            if mode == "old":
+                return await _old_call(n, fake, ari)
+            return await _new_call(n, fake, service, recorder)
+
+    try:
+        t0 = time.perf_counter()
+        results = await asyncio.gather(*(one(n) for n in range(calls)))
+        elapsed = time.perf_counter() - t0
+        # originate(new의 사전 단계)는 빼고 응답 후 요청만 센다
+        requests = sum(v for k, v in fake.requests.items() if k != "POST /channels")
+    finally:
+        await ari.close()
+        await fake.close()
+
+    setups = sorted(r[0] for r in results)
+    teardowns = sorted(r[1] for r in results)
+    return {
+        "setup_p50": statistics.median(setups),
+        "setup_p99": percentile(setups, 99),
+        "teardown_p50": statistics.median(teardowns),
+        "teardown_p99": percentile(teardowns, 99),
+        "calls_per_sec": calls / elapsed,
+        "requests_per_call": requests / calls,
+        "leftover": len(fake.channels) + len(fake.bridges),
+    }
+
+
+async def bench(calls: int, delays_ms: list[float], concurrencies: list[int], port: int) -> None:
+    print(f"{calls} answered calls per run (times in ms, req/call: REST requests after answer)")
+    print(f"{'rtt':>5} {'conc':>5} {'mode':>4}  {'setup p50':>9} {'p99':>7}  {'teardown p50':>12} {'p99':>7}  {'calls/s':>8}  req/call  leftover")
+    for delay in delays_ms:
+        for conc in concurrencies:
+            for mode in ("old", "new"):
+                r = await _run(mode, calls, conc, delay / 1000.0, port)
+                print(
+                    f"{delay:>5g} {conc:>5} {mode:>4}  {r['setup_p50'] * 1000:>9.2f} {r['setup_p99'] * 1000:>7.2f}  "
+                    f"{r['teardown_p50'] * 1000:>12.2f} {r['teardown_p99'] * 1000:>7.2f}  {r['calls_per_sec']:>8.0f}  "
+                    f"{r['requests_per_call']:>8.1f}  {r['leftover']}"
+                )
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.WARNING, format="%(asctime)s - %(levelname)s - %(message)s")
+    ap = argparse.ArgumentParser(description="Post-answer bridge setup and teardown timing against the fake ARI")
+    ap.add_argument("--calls", type=int, default=300)
+    ap.add_argument("--rest-delay-ms", default="0,2", help="콤마 구분 REST 왕복 지연(ms)")
+    ap.add_argument("--concurrency", default="1", help="콤마 구분 동시 진행 콜 수 (fake ARI와 같은 프로세스라 높이면 CPU 포화)")
+    ap.add_argument("--port", type=int, default=18090)
+    a = ap.parse_args()
+    asyncio.run(bench(
+        a.calls,
+        [float(v) for v in a.rest_delay_ms.split(",")],
+        [int(v) for v in a.concurrency.split(",")],
+        a.port,
+    ))
@@ -0,0 +1,139 @@
+"""
+콜 폭주(call storm) 부하 테스트 드라이버
+
+fake ARI 서버를 띄우고 워커가 접속하면 지정한 도착률로 콜을 발생시킨 뒤,
+처리량 / 셋업 지연 / DB 쓰기량을 리포트한다.
+
+    # 1) 드라이버 실행 (fake ARI가 8088에서 대기)
+    python -m tools.call_storm --port 8088 --rate 50 --duration 60
+
+    # 2) 다른 터미널에서 워커를 fake ARI로 연결
+    ARI_HOST=127.0.0.1 ARI_PORT=8088 ARI_APP=pbx ARI_USER=x ARI_PASS=x ./run.sh
+
+DB 쓰기량은 DATABASE_URL(또는 --database-url)의 pg_stat_user_tables 증감으로 계산한다.
+파티션 테이블(call_events)은 부모에 카운터가 없으므로 pg_inherits로 파티션 카운터를 합산한다.
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import logging
+import os
+import time
+from typing import Optional
+
+from tools.fake_ari import FakeAri, add_profile_args, profile_from_args
+
+logger = logging.getLogger("call_storm")
+
+_TABLES = ("calls", "call_events")
+
+
+def percentile(sorted_values: list[float], p: float) -> Optional[float]:
+    if not sorted_values:
+        return None
+    k = min(int(round(p / 100.0 * (len(sorted_values) - 1))), len(sorted_values) - 1)
+    return sorted_values[k]
+
+
+async def _table_stats(database_url: str) -> dict[str, dict[str, int]]:
+    from sqlalchemy import text
+    from sqlalchemy.ext.asyncio import create_async_engine
+
+    engine = create_async_engine(database_url)
+    try:
+        async with engine.connect() as conn:
+            # 통계 스냅샷 캐시를 비워 다른 세션의 최신 카운터를 읽는다
+            await conn.execute(text("SELECT pg_stat_clear_snapshot()"))
+            res = await conn.execute(
+                text(
+                    "SELECT coalesce(parent.relname, s.relname) AS relname, "
+                    "sum(s.n_tup_ins)::bigint AS n_tup_ins, sum(s.n_tup_upd)::bigint AS n_tup_upd, "
+                    "sum(s.n_tup_del)::bigint AS n_tup_del "
+                    "FROM pg_stat_user_tables s "
+                    "LEFT JOIN pg_inherits i ON i.inhrelid = s.relid "
+                    "LEFT JOIN pg_class parent ON parent.oid = i.inhparent "
+                    "WHERE coalesce(parent.relname, s.relname) = ANY(:names) "
+                    "GROUP BY 1"
+                ),
+                {"names": list(_TABLES)},
+            )
+            return {r.relname: {"ins": r.n_tup_ins, "upd": r.n_tup_upd, "del": r.n_tup_del} for r in res}
+    finally:
+        await engine.dispose()
+
+
+def _fmt_ms(v: Optional[float]) -> str:
+    return "-" if v is None else f"{v * 1000:.1f}ms"
+
+
+async def _main(args: argparse.Namespace) -> None:
+    fake = FakeAri(app=args.app, profile=profile_from_args(args), seed=args.seed)
+    await fake.start(args.host, args.port)
+
+    database_url = args.database_url or os.getenv("DATABASE_URL", "")
+    before = await _table_stats(database_url) if database_url else {}
+
+    try:
+        logger.info("Waiting for ari-worker WebSocket connection...")
+        await fake.wait_for_client()
+
+        t0 = time.monotonic()
+        offered = await fake.run_storm(args.duration)
+        storm_elapsed = time.monotonic() - t0
+
+        # 진행 중인 콜이 끝날 때까지 (최대 grace 초) 대기
+        deadline = time.monotonic() + args.grace
+        while fake.channels and time.monotonic() < deadline:
+            await asyncio.sleep(0.5)
+        total_elapsed = time.monotonic() - t0
+    finally:
+        await fake.close()
+
+    # 통계 수집기 반영 대기
+    after = {}
+    if database_url:
+        await asyncio.sleep(1.0)
+        after = await _table_stats(database_url)
+
+    st = fake.stats()
+    lat = fake.setup_latencies()
+
+    print()
+    print("=== call storm ===")
+    print(f"profile          rate={args.rate}/s duration={args.duration}s "
+          f"answer={args.answer_delay} talk={args.talk_time} no_answer={args.no_answer_ratio}")
+    print(f"calls offered    {offered} ({offered / storm_elapsed:.1f}/s)")
+    print(f"calls bridged    {st['calls_bridged']} ({st['calls_bridged'] / storm_elapsed:.1f}/s sustained)")
+    print(f"calls ended      {st['calls_ended']} / unanswered {st['calls_unanswered']}")
+    print(f"leftover         channels={st['live_channels']} bridges={st['live_bridges']} "
+          f"(after {total_elapsed:.1f}s)")
+    print(f"setup latency    p50={_fmt_ms(percentile(lat, 50))} p90={_fmt_ms(percentile(lat, 90))} "
+          f"p99={_fmt_ms(percentile(lat, 99))} max={_fmt_ms(lat[-1] if lat else None)}")
+    print(f"events sent      {st['events_sent']}")
+    print("ARI requests")
+    for route, n in sorted(st["requests"].items()):
+        print(f"  {route:<40} {n}")
+
+    if before and after:
+        print("DB writes (pg_stat_user_tables delta)")
+        started = max(st["calls_started"], 1)
+        for t in _TABLES:
+            b, a = before.get(t), after.get(t)
+            if not b or not a:
+                continue
+            ins, upd = a["ins"] - b["ins"], a["upd"] - b["upd"]
+            print(f"  {t:<12} insert={ins} update={upd} ({(ins + upd) / started:.2f} writes/call)")
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
+    ap = argparse.ArgumentParser(description="ari-worker call storm load test")
+    add_profile_args(ap)
+    ap.add_argument("--duration", type=float, default=60.0, help="콜 발생 시간(초)")
+    ap.add_argument("--grace", type=float, default=60.0, help="발생 종료 후 잔여 콜 정리 최대 대기(초)")
+    ap.add_argument("--database-url", default="", help="쓰기량 측정용 DB (기본: DATABASE_URL)")
+    try:
+        asyncio.run(_main(ap.parse_args()))
+    except KeyboardInterrupt:
+        pass
@@ -0,0 +1,170 @@
+"""
+다중 워커 파티션 소유권 로컬 테스트
+
+fake ARI 하나에 워커 여러 개(같은 프로세스)를 붙이고 콜을 발생시키면서
+워커 합류(재분배 -> 파티션 넘겨주기)와 이탈(소유자 없는 구간)을 일으킨 뒤,
+각 콜의 caller StasisStart를 몇 개의 워커가 처리했는지 센다.
+- lost: 어떤 워커도 처리하지 않은 콜
+- duplicated: 둘 이상의 워커가 처리한 콜
+
+파티션 소유권은 실제 Postgres advisory lock을 쓰므로 DB가 필요하다 (테이블은 필요 없음).
+콜 상태는 DB에 쓰지 않는다 (NullRecorder).
+
+    # 워커 A 시작 -> 10초 뒤 B 합류 -> 25초 뒤 A 이탈
+    python -m tools.cluster_local --database-url postgresql+asyncpg://... \\
+        --partitions 64 --rate 5 --duration 40 --join-after 10 --leave-after 25
+
+진행 중인 콜이 있는 파티션은 넘겨주지 않으므로, 파티션당 동시 콜이 많으면(--rate 대비
+--partitions가 작으면) 합류 후 균형까지 오래 걸린다.
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import logging
+import os
+import time
+from collections import Counter
+from typing import Any, Optional
+
+import websockets
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from app.ari.client import AriClient
+from app.ari.parser import EventType, decode_frame, parse_event
+from app.services.call_service import CallService
+from app.services.dispatcher import EventDispatcher
+from app.services.ownership import PartitionOwnership, partition_of
+from tools.fake_ari import FakeAri, add_profile_args, profile_from_args
+from tools.replay import NullRecorder
+
+logger = logging.getLogger("cluster_local")
+
+
+class LocalWorker:
+    """main.run()의 수신 루프 + 파티션 소유권만 떼어 낸 워커"""
+
+    def __init__(self, name: str, database_url: str, port: int, partitions: int, rebalance: float, handled: Counter):
+        self.name = name
+        self.engine = create_async_engine(database_url)
+        self.ari = AriClient(ari_base=f"http://127.0.0.1:{port}/ari", ari_app="pbx", api_key="x:x")
+        self.service = CallService(ari=self.ari, recorder=NullRecorder())
+        self.dispatcher = EventDispatcher(handler=self.service.handle_event, key_func=self.service.routing_key, shards=8)
+        self.ownership = PartitionOwnership(
+            self.engine,
+            partitions=partitions,
+            rebalance_interval=rebalance,
+            is_busy=lambda p: self.service.has_calls_in_partition(p, partitions),
+            on_acquired=lambda parts: self.service.rehydrate(
+                owns=lambda key: partition_of(key, partitions) in parts,
+            ),
+        )
+        self._ws_url = f"ws://127.0.0.1:{port}/ari/events?app=pbx&api_key=x:x"
+        self._handled = handled
+        self._task: Optional[asyncio.Task] = None
+
+    async def start(self) -> None:
+        await self.ari.start()
+        self.dispatcher.start()
+        await self.ownership.start()
+        connected = asyncio.Event()
+        self._task = asyncio.create_task(self._consume(connected), name=f"worker-{self.name}")
+        await connected.wait()
+        logger.info(f"worker {self.name} started (owned={len(self.ownership.owned)})")
+
+    async def _consume(self, connected: asyncio.Event) -> None:
+        async with websockets.connect(self._ws_url) as ws:
+            connected.set()
+            async for message in ws:
+                ev = parse_event(decode_frame(message), raw_text=message)
+                if not self.ownership.accept(self.service.routing_key(ev)):
+                    continue
+                if ev.etype == EventType.STASIS_START and ev.channel_id and (ev.app_args or [""])[0] != "callee":
+                    self._handled[ev.channel_id] += 1
+                await self.dispatcher.dispatch(ev)
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+        await self.ownership.close()
+        await self.dispatcher.close()
+        await self.ari.close()
+        await self.engine.dispose()
+        logger.info(f"worker {self.name} stopped: {self.ownership.stats()}")
+
+
+async def _watch_balance(workers: list[LocalWorker], partitions: int, since: float) -> Optional[float]:
+    """살아 있는 워커들이 파티션을 빠짐없이 고르게 나눠 가질 때까지 걸린 시간"""
+    while True:
+        live = [w for w in workers if w.ownership.enabled and w._task is not None and not w._task.done()]
+        owned = [len(w.ownership.owned) for w in live]
+        if live and sum(owned) == partitions and max(owned) - min(owned) <= 1:
+            return time.monotonic() - since
+        await asyncio.sleep(0.05)
+
+
+async def run(args: argparse.Namespace) -> None:
+    fake = FakeAri(profile=profile_from_args(args), seed=args.seed)
+    await fake.start("127.0.0.1", args.port)
+    handled: Counter[str] = Counter()
+    workers = [
+        LocalWorker(name, args.database_url, args.port, args.partitions, args.rebalance, handled)
+        for name in ("A", "B")
+    ]
+    a, b = workers
+    timeline: dict[str, Any] = {}
+
+    async def scenario() -> None:
+        await asyncio.sleep(args.join_after)
+        t = time.monotonic()
+        await b.start()
+        timeline["join_balanced_sec"] = await _watch_balance([a, b], args.partitions, t)
+        logger.info(f"balanced after join: A={len(a.ownership.owned)} B={len(b.ownership.owned)}")
+        if args.leave_after > args.join_after:
+            await asyncio.sleep(args.leave_after - args.join_after - timeline["join_balanced_sec"])
+            t = time.monotonic()
+            await a.stop()
+            timeline["leave_takeover_sec"] = await _watch_balance([b], args.partitions, t)
+            logger.info(f"takeover after leave: B={len(b.ownership.owned)}")
+
+    try:
+        await a.start()
+        storm = asyncio.create_task(fake.run_storm(args.duration))
+        await scenario()
+        offered = await storm
+        await asyncio.sleep(args.grace)
+    finally:
+        for w in workers:
+            if w._task is not None and not w._task.done():
+                await w.stop()
+        await fake.close()
+
+    callers = list(fake.calls)
+    lost = [c for c in callers if handled[c] == 0]
+    duplicated = [c for c in callers if handled[c] > 1]
+    stats = fake.stats()
+    print(f"\noffered={offered} bridged={stats['calls_bridged']} unanswered={stats['calls_unanswered']}")
+    print(f"lost={len(lost)} duplicated={len(duplicated)}")
+    for w in workers:
+        print(f"worker {w.name}: calls_started={w.service.calls_started} ownership={w.ownership.stats()}")
+    for k, v in timeline.items():
+        print(f"{k}: {v:.2f}")
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(name)s - %(message)s")
+    ap = argparse.ArgumentParser(description="Two ari-workers sharing partitions against the fake ARI")
+    add_profile_args(ap)
+    ap.set_defaults(port=18089, rate=5.0, talk_time=(1.0, 3.0), answer_delay=(0.2, 0.5))
+    ap.add_argument("--database-url", default=os.getenv("DATABASE_URL"))
+    ap.add_argument("--partitions", type=int, default=64)
+    ap.add_argument("--rebalance", type=float, default=2.0, help="재분배 주기(초)")
+    ap.add_argument("--duration", type=float, default=30.0)
+    ap.add_argument("--join-after", type=float, default=8.0, help="워커 B 합류 시점(초)")
+    ap.add_argument("--leave-after", type=float, default=20.0, help="워커 A 이탈 시점(초, join 이전이면 이탈 없음)")
+    ap.add_argument("--grace", type=float, default=8.0)
+    a = ap.parse_args()
+    if not a.database_url:
+        raise SystemExit("--database-url or DATABASE_URL is required (advisory locks)")
+    asyncio.run(run(a))
@@ -0,0 +1,138 @@
+"""
+EventDispatcher 샤드 수별 처리량/지연 벤치마크
+
+합성 이벤트(콜당 caller/callee 채널 이벤트 여러 개)를 EventDispatcher에 넣고,
+핸들러는 DB/ARI 왕복을 흉내 내는 await(--io-ms) + 약간의 CPU 작업(--cpu-us)만 한다.
+샤드 수마다 두 가지를 잰다.
+- 최대 처리량: 이벤트를 한꺼번에 넣었을 때 events/sec
+- 지연: --rate 로 일정하게 넣었을 때 dispatch -> 핸들러 완료 p50/p99
+같은 콜의 이벤트 순서가 유지되는지도 확인한다 (order_violations).
+
+    python -m tools.dispatch_bench --shards 1,8,64 --calls 1000 --io-ms 2 --rate 3000
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import logging
+import time
+from typing import Any, Optional
+
+from app.ari.parser import ParsedEvent, parse_event
+from app.services.call_service import CallService, callee_channel_id_for
+from app.services.dispatcher import EventDispatcher
+from tools.call_storm import percentile
+from tools.replay import NullRecorder, RecordingAri
+
+logger = logging.getLogger("dispatch_bench")
+
+_TYPES = ("ChannelStateChange", "ChannelVarset", "ChannelDialplan", "ChannelStateChange", "ChannelVarset")
+
+
+def synthetic_events(calls: int, per_call: int) -> list[ParsedEvent]:
+    """콜 단위로 번갈아 섞인 이벤트 (raw["seq"]: 콜 안에서의 순서)"""
+    per_call_events: list[list[ParsedEvent]] = []
+    for c in range(calls):
+        caller = f"bench-{c}"
+        channels = (caller, callee_channel_id_for(caller))
+        evs = []
+        for i in range(per_call):
+            raw = {
+                "type": _TYPES[i % len(_TYPES)],
+                "timestamp": "2024-05-01T10:00:00.000+0900",
+                "channel": {"id": channels[i % 2], "name": f"PJSIP/1000-{c:08x}", "state": "Up"},
+                "seq": i,
+            }
+            evs.append(parse_event(raw))
+        per_call_events.append(evs)
+    # 콜 사이를 번갈아 가며 (실제 수신 순서처럼) 하나의 스트림으로
+    return [evs[i] for i in range(per_call) for evs in per_call_events]
+
+
+class _Handler:
+    def __init__(self, io_ms: float, cpu_us: float):
+        self.io = io_ms / 1000.0
+        self.cpu = cpu_us / 1_000_000.0
+        self.sent_at: dict[int, float] = {}
+        self.latencies: list[float] = []
+        self.last_seq: dict[str, int] = {}
+        self.order_violations = 0
+
+    async def __call__(self, ev: ParsedEvent) -> None:
+        if self.cpu:
+            end = time.perf_counter() + self.cpu
+            while time.perf_counter() < end:
+                pass
+        if self.io:
+            await asyncio.sleep(self.io)
+        call = ev.channel_name or ""
+        seq = ev.raw["seq"]
+        if seq < self.last_seq.get(call, -1):
+            self.order_violations += 1
+        self.last_seq[call] = seq
+        t0 = self.sent_at.pop(id(ev), None)
+        if t0 is not None:
+            self.latencies.append(time.perf_counter() - t0)
+
+
+async def _run_once(events: list[ParsedEvent], shards: int, io_ms: float, cpu_us: float, rate: Optional[float]) -> dict[str, Any]:
+    handler = _Handler(io_ms, cpu_us)
+    service = CallService(ari=RecordingAri(), recorder=NullRecorder())
+    dispatcher = EventDispatcher(handler, service.routing_key, shards=shards, mailbox_size=1000)
+    dispatcher.start()
+
+    interval = 1.0 / rate if rate else 0.0
+    t_start = time.perf_counter()
+    for n, ev in enumerate(events):
+        if interval:
+            # 일정 도착률: 늦어진 만큼은 몰아서 보낸다 (도착 시각 기준 지연 측정)
+            due = t_start + n * interval
+            delay = due - time.perf_counter()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            handler.sent_at[id(ev)] = due if delay <= 0 else time.perf_counter()
+        else:
+            handler.sent_at[id(ev)] = time.perf_counter()
+        await dispatcher.dispatch(ev)
+    await dispatcher.drain()
+    elapsed = time.perf_counter() - t_start
+    await dispatcher.close()
+
+    lat = sorted(handler.latencies)
+    return {
+        "events_per_sec": len(events) / elapsed,
+        "p50": percentile(lat, 50),
+        "p99": percentile(lat, 99),
+        "order_violations": handler.order_violations,
+        "errors": dispatcher.stats()["errors"],
+    }
+
+
+def _ms(v: Optional[float]) -> str:
+    return "-" if v is None else f"{v * 1000:.1f}ms"
+
+
+async def bench(shard_counts: list[int], calls: int, per_call: int, io_ms: float, cpu_us: float, rate: float) -> None:
+    events = synthetic_events(calls, per_call)
+    print(f"{len(events)} events ({calls} calls x {per_call}), handler io={io_ms}ms cpu={cpu_us}us, paced rate={rate:.0f}/s")
+    print(f"{'shards':>6}  {'max events/s':>12}  {'p50@max':>9}  {'p99@max':>9}  {'p50@rate':>9}  {'p99@rate':>9}  order_violations")
+    for shards in shard_counts:
+        burst = await _run_once(events, shards, io_ms, cpu_us, None)
+        paced = await _run_once(events, shards, io_ms, cpu_us, rate)
+        print(
+            f"{shards:>6}  {burst['events_per_sec']:>12.0f}  {_ms(burst['p50']):>9}  {_ms(burst['p99']):>9}  "
+            f"{_ms(paced['p50']):>9}  {_ms(paced['p99']):>9}  {burst['order_violations'] + paced['order_violations']}"
+        )
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.WARNING, format="%(asctime)s - %(levelname)s - %(message)s")
+    ap = argparse.ArgumentParser(description="EventDispatcher shard throughput/latency benchmark")
+    ap.add_argument("--shards", default="1,8,64", help="콤마 구분 샤드 수")
+    ap.add_argument("--calls", type=int, default=1000)
+    ap.add_argument("--per-call", type=int, default=10, help="콜당 이벤트 수")
+    ap.add_argument("--io-ms", type=float, default=2.0, help="이벤트당 I/O 대기 흉내(ms)")
+    ap.add_argument("--cpu-us", type=float, default=20.0, help="이벤트당 CPU 작업(us)")
+    ap.add_argument("--rate", type=float, default=3000.0, help="지연 측정용 도착률(events/s)")
+    a = ap.parse_args()
+    asyncio.run(bench([int(s) for s in a.shards.split(",")], a.calls, a.per_call, a.io_ms, a.cpu_us, a.rate))
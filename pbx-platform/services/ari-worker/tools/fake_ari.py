@@ -0,0 +1,481 @@
+"""
+Asterisk ARI 대역 서버 (부하 테스트용)
+
+실제 Asterisk 없이 ari-worker를 띄워볼 수 있도록, 워커가 사용하는 범위만 흉내낸다.
+- WebSocket: /ari/events (ARI 이벤트 push)
+- REST: GET/POST /ari/channels, GET /ari/bridges, POST /ari/bridges[/{id}],
+        POST /ari/bridges/{id}/addChannel, DELETE /ari/channels/{id}, DELETE /ari/bridges/{id}
+
+REST와 WebSocket이 같은 포트를 써야 하므로(워커 설정이 ARI_HOST/ARI_PORT 하나)
+HTTP 파싱과 WebSocket 핸드셰이크/프레이밍을 asyncio 위에 직접 구현했다.
+
+단독 실행:
+    python -m tools.fake_ari --port 8088 --rate 20 --duration 60
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import base64
+import hashlib
+import itertools
+import json
+import logging
+import random
+import struct
+import time
+from collections import Counter
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Optional
+from urllib.parse import parse_qs, urlsplit
+
+logger = logging.getLogger("fake_ari")
+
+_WS_GUID = "258EAFA5-E914-47DA-95CA-C5AB0DC85B11"
+
+_REASONS = {200: "OK", 204: "No Content", 400: "Bad Request", 404: "Not Found", 422: "Unprocessable Entity"}
+
+# Q.850 cause
+CAUSE_NORMAL = 16
+CAUSE_NO_ANSWER = 19
+
+
+def ari_timestamp() -> str:
+    """ARI 형식: 2024-01-01T12:00:00.000+0900"""
+    now = datetime.now().astimezone()
+    return now.strftime("%Y-%m-%dT%H:%M:%S.") + f"{now.microsecond // 1000:03d}" + now.strftime("%z")
+
+
+@dataclass
+class StormProfile:
+    rate: float = 10.0                          # 초당 신규 콜 (포아송 도착)
+    answer_delay: tuple[float, float] = (0.5, 2.0)
+    talk_time: tuple[float, float] = (5.0, 30.0)
+    no_answer_ratio: float = 0.1                # 착신 측이 받지 않는 비율
+    ring_timeout: float = 5.0                   # 미응답 콜이 끊기기까지의 시간
+    caller_hangup_ratio: float = 0.5            # 통화 종료 시 발신 측이 먼저 끊는 비율
+    extens: tuple[int, int] = (1000, 1999)
+
+
+@dataclass
+class _CallTrace:
+    started: float
+    bridged: Optional[float] = None
+    ended: Optional[float] = None
+
+
+class _WsPeer:
+    def __init__(self, writer: asyncio.StreamWriter):
+        self.writer = writer
+
+    def send_text(self, text: str) -> None:
+        payload = text.encode("utf-8")
+        n = len(payload)
+        if n < 126:
+            header = struct.pack("!BB", 0x81, n)
+        elif n < (1 << 16):
+            header = struct.pack("!BBH", 0x81, 126, n)
+        else:
+            header = struct.pack("!BBQ", 0x81, 127, n)
+        self.writer.write(header + payload)
+
+    def send_control(self, opcode: int, payload: bytes = b"") -> None:
+        self.writer.write(struct.pack("!BB", 0x80 | opcode, len(payload)) + payload)
+
+
+class FakeAri:
+    def __init__(
+            self,
+            app: str = "pbx",
+            profile: Optional[StormProfile] = None,
+            seed: Optional[int] = None,
+            rest_delay: float = 0.0,
+    ):
+        self.app = app
+        self.profile = profile or StormProfile()
+        # REST 응답 전 지연(초): 실제 Asterisk 왕복 시간 흉내
+        self.rest_delay = rest_delay
+        self._rng = random.Random(seed)
+        self._ids = itertools.count(1)
+
+        self.channels: dict[str, dict[str, Any]] = {}
+        self.bridges: dict[str, dict[str, Any]] = {}
+        self._peers: set[_WsPeer] = set()
+        self._server: Optional[asyncio.base_events.Server] = None
+        self._tasks: set[asyncio.Task] = set()
+        self._connected = asyncio.Event()
+
+        # 통계
+        self.calls: dict[str, _CallTrace] = {}      # caller 채널 ID -> trace
+        self.events_sent = 0
+        self.requests: Counter[str] = Counter()
+        self.unanswered = 0
+
+    # ------------------------------------------------------------------ 서버
+
+    async def start(self, host: str = "127.0.0.1", port: int = 8088) -> None:
+        self._server = await asyncio.start_server(self._handle_conn, host, port)
+        logger.info(f"Fake ARI listening on http://{host}:{port}/ari (app={self.app})")
+
+    async def close(self) -> None:
+        for t in list(self._tasks):
+            t.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        for p in list(self._peers):
+            p.send_control(0x8)
+            p.writer.close()
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+
+    async def wait_for_client(self) -> None:
+        await self._connected.wait()
+
+    def _spawn(self, coro) -> None:
+        t = asyncio.create_task(coro)
+        self._tasks.add(t)
+        t.add_done_callback(self._tasks.discard)
+
+    async def _handle_conn(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    return
+                method, target, _ = line.decode("latin-1").split(" ", 2)
+                headers: dict[str, str] = {}
+                while True:
+                    h = await reader.readline()
+                    if h in (b"\r\n", b"\n", b""):
+                        break
+                    k, _, v = h.decode("latin-1").partition(":")
+                    headers[k.strip().lower()] = v.strip()
+                length = int(headers.get("content-length") or 0)
+                if length:
+                    await reader.readexactly(length)
+
+                url = urlsplit(target)
+                if headers.get("upgrade", "").lower() == "websocket":
+                    await self._serve_ws(reader, writer, headers)
+                    return
+
+                params = {k: v[-1] for k, v in parse_qs(url.query).items()}
+                if self.rest_delay:
+                    await asyncio.sleep(self.rest_delay)
+                status, body = self._route(method, url.path, params)
+                data = json.dumps(body).encode("utf-8") if body is not None else b""
+                writer.write(
+                    f"HTTP/1.1 {status} {_REASONS.get(status, '')}\r\n"
+                    f"Content-Type: application/json\r\nContent-Length: {len(data)}\r\n\r\n".encode("latin-1")
+                    + data
+                )
+                await writer.drain()
+        except (ConnectionError, asyncio.IncompleteReadError, asyncio.CancelledError, ValueError):
+            pass
+        finally:
+            writer.close()
+
+    async def _serve_ws(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter, headers: dict[str, str]) -> None:
+        accept = base64.b64encode(
+            hashlib.sha1((headers.get("sec-websocket-key", "") + _WS_GUID).encode()).digest()
+        ).decode()
+        writer.write(
+            "HTTP/1.1 101 Switching Protocols\r\nUpgrade: websocket\r\nConnection: Upgrade\r\n"
+            f"Sec-WebSocket-Accept: {accept}\r\n\r\n".encode("latin-1")
+        )
+        # 101 응답을 보내기 전에 등록 (클라이언트가 연결 직후 보내는 REST 요청이 앱을 찾도록)
+        peer = _WsPeer(writer)
+        self._peers.add(peer)
+        await writer.drain()
+        self._connected.set()
+        logger.info("WebSocket client connected")
+        try:
+            # 클라이언트 프레임: ping -> pong, close -> 종료 (이벤트 push는 다른 task에서)
+            while True:
+                b1, b2 = await reader.readexactly(2)
+                opcode = b1 & 0x0F
+                n = b2 & 0x7F
+                if n == 126:
+                    (n,) = struct.unpack("!H", await reader.readexactly(2))
+                elif n == 127:
+                    (n,) = struct.unpack("!Q", await reader.readexactly(8))
+                mask = await reader.readexactly(4) if b2 & 0x80 else b"\0\0\0\0"
+                payload = bytes(b ^ mask[i % 4] for i, b in enumerate(await reader.readexactly(n)))
+                if opcode == 0x8:
+                    peer.send_control(0x8, payload[:2])
+                    return
+                if opcode == 0x9:
+                    peer.send_control(0xA, payload)
+                    await writer.drain()
+        finally:
+            self._peers.discard(peer)
+            logger.info("WebSocket client disconnected")
+
+    def _emit(self, etype: str, **body: Any) -> None:
+        text = json.dumps({"type": etype, "application": self.app, "timestamp": ari_timestamp(), **body})
+        self.events_sent += 1
+        for p in list(self._peers):
+            p.send_text(text)
+
+    # ------------------------------------------------------------------ REST
+
+    def _route(self, method: str, path: str, params: dict[str, str]) -> tuple[int, Any]:
+        parts = [p for p in path.split("/") if p]
+        if parts[:1] != ["ari"]:
+            return 404, {"message": "Not found"}
+        parts = parts[1:]
+        route = "/" + "/".join(
+            "{id}" if i == 1 and len(parts) > 1 else p for i, p in enumerate(parts)
+        )
+        self.requests[f"{method} {route}"] += 1
+
+        if parts == ["channels"]:
+            if method == "GET":
+                return 200, list(self.channels.values())
+            if method == "POST":
+                return self._originate(params)
+        if parts == ["bridges"]:
+            if method == "GET":
+                return 200, [self._bridge_json(b) for b in self.bridges.values()]
+            if method == "POST":
+                return self._create_bridge(params.get("bridgeId") or f"bridge-{next(self._ids)}", params)
+        if len(parts) == 2 and parts[0] == "channels" and method == "DELETE":
+            if parts[1] not in self.channels:
+                return 404, {"message": "Channel not found"}
+            self._destroy_channel(parts[1], CAUSE_NORMAL)
+            return 204, None
+        if len(parts) == 2 and parts[0] == "bridges":
+            if method == "POST":
+                return self._create_bridge(parts[1], params)
+            if method == "DELETE":
+                b = self.bridges.pop(parts[1], None)
+                if b is None:
+                    return 404, {"message": "Bridge not found"}
+                self._emit("BridgeDestroyed", bridge=self._bridge_json(b))
+                return 204, None
+        if len(parts) == 3 and parts[0] == "bridges" and parts[2] == "addChannel" and method == "POST":
+            return self._add_channels(parts[1], (params.get("channel") or "").split(","))
+        if len(parts) == 3 and parts[0] == "applications" and parts[2] == "eventFilter":
+            # 실제 Asterisk처럼 WebSocket이 연결된 앱만 등록되어 있다
+            if parts[1] != self.app or not self._peers:
+                return 404, {"message": "Application not found"}
+            return 200, {"name": parts[1]}
+        return 404, {"message": "Not implemented in fake ARI"}
+
+    def _new_channel(self, channel_id: str, name: str, exten: str, state: str) -> dict[str, Any]:
+        ch = {
+            "id": channel_id,
+            "name": name,
+            "state": state,
+            "caller": {"name": "", "number": exten},
+            "connected": {"name": "", "number": ""},
+            "dialplan": {"context": "from-internal", "exten": exten, "priority": 1},
+            "creationtime": ari_timestamp(),
+            "language": "ko",
+        }
+        self.channels[channel_id] = ch
+        return ch
+
+    def _originate(self, params: dict[str, str]) -> tuple[int, Any]:
+        endpoint = params.get("endpoint", "")
+        exten = endpoint.split("/", 1)[-1]
+        channel_id = params.get("channelId") or f"fake-{next(self._ids)}"
+        if channel_id in self.channels:
+            return 400, {"message": "Channel with given unique ID already exists"}
+
+        ch = self._new_channel(channel_id, f"{endpoint}-{next(self._ids):08x}", exten, "Down")
+        self._emit("ChannelCreated", channel=ch)
+        ch["state"] = "Ring"
+        self._emit("ChannelStateChange", channel=ch)
+        app_args = [a for a in (params.get("appArgs") or "").split(",") if a]
+        self._spawn(self._callee_answers(channel_id, app_args))
+        return 200, ch
+
+    def _create_bridge(self, bridge_id: str, params: dict[str, str]) -> tuple[int, Any]:
+        b = self.bridges.get(bridge_id)
+        if b is None:
+            b = {"id": bridge_id, "name": params.get("name", ""), "bridge_type": "mixing", "channels": []}
+            self.bridges[bridge_id] = b
+            self._emit("BridgeCreated", bridge=self._bridge_json(b))
+        return 200, self._bridge_json(b)
+
+    def _bridge_json(self, b: dict[str, Any]) -> dict[str, Any]:
+        return {
+            "id": b["id"],
+            "technology": "simple_bridge",
+            "bridge_type": b["bridge_type"],
+            "bridge_class": "stasis",
+            "name": b["name"],
+            "channels": list(b["channels"]),
+        }
+
+    def _add_channels(self, bridge_id: str, channel_ids: list[str]) -> tuple[int, Any]:
+        b = self.bridges.get(bridge_id)
+        if b is None:
+            return 404, {"message": "Bridge not found"}
+        if any(c not in self.channels for c in channel_ids):
+            return 422, {"message": "Channel not in Stasis application"}
+
+        for cid in channel_ids:
+            if cid in b["channels"]:
+                continue
+            ch = self.channels[cid]
+            ch["bridge_id"] = bridge_id
+            b["channels"].append(cid)
+            if ch["state"] != "Up":
+                ch["state"] = "Up"
+                self._emit("ChannelStateChange", channel=ch)
+            self._emit("ChannelEnteredBridge", bridge=self._bridge_json(b), channel=ch)
+
+        # 브릿지에 콜의 caller가 들어왔고 두 채널이 모였으면 셋업 완료
+        if len(b["channels"]) >= 2:
+            for cid in b["channels"]:
+                trace = self.calls.get(cid)
+                if trace is not None and trace.bridged is None:
+                    trace.bridged = time.monotonic()
+                    others = [c for c in b["channels"] if c != cid]
+                    self._spawn(self._talk_then_hangup(cid, others[0]))
+        return 204, None
+
+    def _destroy_channel(self, channel_id: str, cause: int, cause_txt: str = "Normal Clearing") -> None:
+        ch = self.channels.pop(channel_id, None)
+        if ch is None:
+            return
+        b = self.bridges.get(ch.get("bridge_id") or "")
+        if b is not None and channel_id in b["channels"]:
+            b["channels"].remove(channel_id)
+            self._emit("ChannelLeftBridge", bridge=self._bridge_json(b), channel=ch)
+        self._emit("StasisEnd", channel=ch)
+        ch["state"] = "Down"
+        self._emit("ChannelDestroyed", channel=ch, cause=cause, cause_txt=cause_txt)
+
+        trace = self.calls.get(channel_id)
+        if trace is not None and trace.ended is None:
+            trace.ended = time.monotonic()
+
+    # ------------------------------------------------------------------ 시나리오
+
+    async def run_storm(self, duration: float) -> int:
+        """duration 초 동안 포아송 도착으로 콜을 발생시키고, 발생시킨 콜 수를 반환"""
+        loop = asyncio.get_running_loop()
+        end = loop.time() + duration
+        offered = 0
+        while True:
+            await asyncio.sleep(self._rng.expovariate(self.profile.rate))
+            if loop.time() >= end:
+                return offered
+            offered += 1
+            self._caller_arrives(offered)
+
+    def _caller_arrives(self, n: int) -> None:
+        lo, hi = self.profile.extens
+        caller_ext = str(self._rng.randint(lo, hi))
+        target = str(self._rng.randint(lo, hi))
+        channel_id = f"storm-{n}-{self._rng.getrandbits(32):08x}"
+
+        ch = self._new_channel(channel_id, f"PJSIP/{caller_ext}-{n:08x}", target, "Ring")
+        ch["caller"]["number"] = caller_ext
+        ch["dialplan"].update({"app_name": "Stasis", "app_data": f"{self.app},{target}"})
+        self.calls[channel_id] = _CallTrace(started=time.monotonic())
+        self._emit("ChannelCreated", channel=ch)
+        self._emit("StasisStart", channel=ch, args=[target])
+
+    async def _callee_answers(self, channel_id: str, app_args: list[str]) -> None:
+        p = self.profile
+        if self._rng.random() < p.no_answer_ratio:
+            await asyncio.sleep(p.ring_timeout)
+            if channel_id in self.channels:
+                self.unanswered += 1
+                self._destroy_channel(channel_id, CAUSE_NO_ANSWER, "No answer")
+            return
+
+        await asyncio.sleep(self._rng.uniform(*p.answer_delay))
+        ch = self.channels.get(channel_id)
+        if ch is None:
+            return
+        ch["state"] = "Up"
+        self._emit("ChannelStateChange", channel=ch)
+        self._emit("StasisStart", channel=ch, args=app_args)
+
+    async def _talk_then_hangup(self, caller_id: str, callee_id: str) -> None:
+        await asyncio.sleep(self._rng.uniform(*self.profile.talk_time))
+        party = caller_id if self._rng.random() < self.profile.caller_hangup_ratio else callee_id
+        ch = self.channels.get(party)
+        if ch is None:
+            return
+        self._emit("ChannelHangupRequest", channel=ch, cause=CAUSE_NORMAL)
+        self._destroy_channel(party, CAUSE_NORMAL)
+
+    # ------------------------------------------------------------------ 통계
+
+    def stats(self) -> dict[str, Any]:
+        traces = list(self.calls.values())
+        return {
+            "calls_started": len(traces),
+            "calls_bridged": sum(1 for t in traces if t.bridged is not None),
+            "calls_ended": sum(1 for t in traces if t.ended is not None),
+            "calls_unanswered": self.unanswered,
+            "live_channels": len(self.channels),
+            "live_bridges": len(self.bridges),
+            "events_sent": self.events_sent,
+            "requests": dict(self.requests),
+        }
+
+    def setup_latencies(self) -> list[float]:
+        return sorted(t.bridged - t.started for t in self.calls.values() if t.bridged is not None)
+
+
+def _parse_range(v: str) -> tuple[float, float]:
+    lo, _, hi = v.partition(",")
+    return float(lo), float(hi or lo)
+
+
+def add_profile_args(ap: argparse.ArgumentParser) -> None:
+    ap.add_argument("--app", default="pbx", help="ARI app 이름 (워커의 ARI_APP)")
+    ap.add_argument("--host", default="127.0.0.1")
+    ap.add_argument("--port", type=int, default=8088)
+    ap.add_argument("--rate", type=float, default=10.0, help="초당 신규 콜")
+    ap.add_argument("--answer-delay", type=_parse_range, default=(0.5, 2.0), help="착신 응답 지연 범위(초) 예: 0.5,2")
+    ap.add_argument("--talk-time", type=_parse_range, default=(5.0, 30.0), help="통화 시간 범위(초) 예: 5,30")
+    ap.add_argument("--no-answer-ratio", type=float, default=0.1)
+    ap.add_argument("--ring-timeout", type=float, default=5.0)
+    ap.add_argument("--caller-hangup-ratio", type=float, default=0.5)
+    ap.add_argument("--seed", type=int, default=None)
+
+
+def profile_from_args(args: argparse.Namespace) -> StormProfile:
+    return StormProfile(
+        rate=args.rate,
+        answer_delay=args.answer_delay,
+        talk_time=args.talk_time,
+        no_answer_ratio=args.no_answer_ratio,
+        ring_timeout=args.ring_timeout,
+        caller_hangup_ratio=args.caller_hangup_ratio,
+    )
+
+
+async def _main(args: argparse.Namespace) -> None:
+    fake = FakeAri(app=args.app, profile=profile_from_args(args), seed=args.seed)
+    await fake.start(args.host, args.port)
+    try:
+        logger.info("Waiting for ari-worker WebSocket connection...")
+        await fake.wait_for_client()
+        offered = await fake.run_storm(args.duration)
+        logger.info(f"Storm finished: offered={offered}")
+        await asyncio.sleep(args.grace)
+        logger.info(f"Stats: {fake.stats()}")
+    finally:
+        await fake.close()
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
+    ap = argparse.ArgumentParser(description="Fake Asterisk ARI server")
+    add_profile_args(ap)
+    ap.add_argument("--duration", type=float, default=60.0, help="콜 발생 시간(초)")
+    ap.add_argument("--grace", type=float, default=40.0, help="발생 종료 후 잔여 콜 정리 대기(초)")
+    try:
+        asyncio.run(_main(ap.parse_args()))
+    except KeyboardInterrupt:
+        pass
@@ -0,0 +1,218 @@
+"""
+ARI 프레임 디코딩/파싱 마이크로벤치마크 (이전 parse_event vs 현재 decoder)
+
+- old: json.loads + 이전 parse_event(frozen dataclass) + handle_event에서 하던 timestamp 변환
+- new(json): json.loads + 현재 parse_event (stdlib json일 때)
+- new: decode_frame(orjson 있으면 사용) + 현재 parse_event(raw_text 포함)
+
+프레임은 --frames 파일(한 줄에 원본 프레임 하나)을 읽거나, 없으면 fake ARI가 콜 흐름
+(ChannelCreated/StasisStart/originate/브릿지/hangup)대로 내보내는 프레임을 기록해 쓴다.
+기록 프레임의 timestamp는 --events-per-sec 기준 가상 시계로 찍는다 (timestamp 캐시 적중률이 실제와 비슷하도록).
+
+    python -m tools.parse_bench --calls 5000 --reps 7
+    # 저장된 이벤트로: psql -At -c "SELECT raw FROM call_events WHERE ts >= ..." > frames.jsonl
+    python -m tools.parse_bench --frames frames.jsonl
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import logging
+import statistics
+import time
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Any, Callable, Optional
+
+from app.ari import parser
+from app.ari.parser import decode_frame, parse_ari_timestamp, parse_event
+from app.services.call_service import bridge_id_for, callee_channel_id_for
+from tools.fake_ari import CAUSE_NORMAL, FakeAri
+
+logger = logging.getLogger("parse_bench")
+
+
+# ---------------------------------------------------------------- 이전 parser (비교 기준)
+
+@dataclass(frozen=True)
+class _LegacyParsedEvent:
+    etype: str
+    timestamp: Optional[str]
+    channel_id: Optional[str]
+    channel_name: Optional[str]
+    app_name: Optional[str]
+    app_args: list[str]
+    raw: dict[str, Any]
+
+
+def _legacy_split_app_data(app_data: Optional[str]) -> tuple[Optional[str], list[str]]:
+    if not isinstance(app_data, str) or not app_data.strip():
+        return None, []
+    parts = [p.strip() for p in app_data.split(",") if p.strip()]
+    if not parts:
+        return None, []
+    return parts[0], parts[1:]
+
+
+def _legacy_parse_event(event: dict[str, Any]) -> _LegacyParsedEvent:
+    etype = event.get("type")
+    ts = event.get("timestamp")
+
+    channel = event.get("channel") or {}
+    chan_id = channel.get("id")
+    chan_name = channel.get("name")
+
+    app_name = event.get("application")
+    app_args = event.get("args")
+
+    if not app_args or not isinstance(app_args, list):
+        dialplan = channel.get("dialplan") or {}
+        parsed_name, parsed_args = _legacy_split_app_data(dialplan.get("app_data"))
+        if not app_name:
+            app_name = parsed_name
+        if not app_args:
+            app_args = parsed_args
+
+    return _LegacyParsedEvent(
+        etype=etype,
+        timestamp=ts,
+        channel_id=chan_id,
+        channel_name=chan_name,
+        app_name=app_name,
+        app_args=app_args or [],
+        raw=event,
+    )
+
+
+def _legacy_ts(t: Optional[str]) -> Optional[datetime]:
+    """이전 handle_event의 이벤트마다 하던 timestamp 변환"""
+    if not t:
+        return None
+    if len(t) >= 5 and (t[-5] in ("+", "-")) and t[-2:].isdigit():
+        t = t[:-5] + t[-5:-2] + ":" + t[-2:]
+    try:
+        return datetime.fromisoformat(t)
+    except Exception:
+        return None
+
+
+def _old(frame: str) -> Any:
+    ev = _legacy_parse_event(json.loads(frame))
+    return ev, _legacy_ts(ev.timestamp)
+
+
+def _new_stdlib(frame: str) -> Any:
+    return parse_event(json.loads(frame), raw_text=frame)
+
+
+def _new(frame: str) -> Any:
+    return parse_event(decode_frame(frame), raw_text=frame)
+
+
+# ---------------------------------------------------------------- 프레임 기록
+
+class _RecordingFakeAri(FakeAri):
+    """내보내는 프레임을 기록만 하는 fake ARI (WebSocket/타이머 없음)"""
+
+    def __init__(self, events_per_sec: float, seed: int):
+        super().__init__(seed=seed)
+        self.frames: list[str] = []
+        self._clock = datetime.now().astimezone()
+        self._step = timedelta(seconds=1.0 / events_per_sec)
+
+    def _emit(self, etype: str, **body: Any) -> None:
+        self._clock += self._step
+        ts = self._clock.strftime("%Y-%m-%dT%H:%M:%S.") + f"{self._clock.microsecond // 1000:03d}" + self._clock.strftime("%z")
+        self.frames.append(json.dumps({"type": etype, "application": self.app, "timestamp": ts, **body}))
+
+    def _spawn(self, coro) -> None:
+        coro.close()
+
+
+def record_frames(calls: int, events_per_sec: float, seed: int = 1) -> list[str]:
+    """워커가 응답 콜 하나를 처리할 때 fake ARI가 보내는 프레임 순서 그대로 기록"""
+    fake = _RecordingFakeAri(events_per_sec, seed)
+    for n in range(1, calls + 1):
+        fake._caller_arrives(n)
+        caller = next(reversed(fake.calls))
+        target = fake.channels[caller]["dialplan"]["exten"]
+        callee = callee_channel_id_for(caller)
+        fake._originate({"endpoint": f"PJSIP/{target}", "channelId": callee, "appArgs": f"callee,{target},{n}"})
+        ch = fake.channels[callee]
+        ch["state"] = "Up"
+        fake._emit("ChannelStateChange", channel=ch)
+        fake._emit("StasisStart", channel=ch, args=["callee", target, str(n)])
+        bridge = bridge_id_for(caller)
+        fake._create_bridge(bridge, {})
+        fake._add_channels(bridge, [caller, callee])
+        fake._emit("ChannelHangupRequest", channel=fake.channels[caller], cause=CAUSE_NORMAL)
+        fake._destroy_channel(caller, CAUSE_NORMAL)
+        fake._destroy_channel(callee, CAUSE_NORMAL)
+        fake.bridges.pop(bridge, None)
+    return fake.frames
+
+
+# ---------------------------------------------------------------- 측정
+
+def _check(frames: list[str]) -> int:
+    """old/new 결과(타입, 채널, app 인자, 시각)가 같은지 확인하고 다른 프레임 수를 반환"""
+    diff = 0
+    for f in frames:
+        old, old_ts = _old(f)
+        new = _new(f)
+        same = (old.etype, old.channel_id, old.timestamp, old_ts) == (new.etype, new.channel_id, new.timestamp, new.ts)
+        # 현재 parser는 app 인자를 StasisStart에서만 뽑는다
+        if new.etype == "StasisStart":
+            same = same and (old.app_name, old.app_args) == (new.app_name, new.app_args)
+        diff += not same
+    return diff
+
+
+def _time(fn: Callable[[str], Any], frames: list[str], reps: int) -> list[float]:
+    """반복별 프레임당 소요 시간(초)"""
+    out = []
+    for _ in range(reps):
+        # 캐시는 반복마다 비운다 (첫 반복의 미적중 비용이 매번 포함되도록)
+        parse_ari_timestamp.cache_clear()
+        t0 = time.perf_counter()
+        for f in frames:
+            fn(f)
+        out.append((time.perf_counter() - t0) / len(frames))
+    return out
+
+
+def bench(frames: list[str], reps: int) -> None:
+    avg_bytes = sum(len(f) for f in frames) / len(frames)
+    print(f"{len(frames)} frames (avg {avg_bytes:.0f} bytes), json backend={parser.JSON_BACKEND}, reps={reps}")
+    print(f"mismatches old vs new: {_check(frames)}")
+
+    results = {}
+    for name, fn in (("old", _old), ("new(json)", _new_stdlib), ("new", _new)):
+        per_frame = _time(fn, frames, reps)
+        results[name] = statistics.median(per_frame)
+        print(
+            f"{name:>10}: median {results[name] * 1e6:6.2f}us/frame  best {min(per_frame) * 1e6:6.2f}us  "
+            f"({1 / results[name]:,.0f} frames/s)"
+        )
+    print(f"speedup new vs old: {results['old'] / results['new']:.2f}x  (stdlib json only: {results['old'] / results['new(json)']:.2f}x)")
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.WARNING, format="%(asctime)s - %(levelname)s - %(message)s")
+    ap = argparse.ArgumentParser(description="Microbenchmark: legacy parse_event vs the current ARI frame decoder")
+    ap.add_argument("--frames", help="원본 프레임 파일 (한 줄에 하나)")
+    ap.add_argument("--calls", type=int, default=5000, help="--frames가 없을 때 기록할 콜 수")
+    ap.add_argument("--events-per-sec", type=float, default=600.0, help="기록 프레임의 가상 이벤트 도착률")
+    ap.add_argument("--save", help="기록한 프레임을 파일로 저장")
+    ap.add_argument("--reps", type=int, default=7)
+    a = ap.parse_args()
+
+    if a.frames:
+        with open(a.frames, encoding="utf-8") as fp:
+            recorded = [line.rstrip("\n") for line in fp if line.strip()]
+    else:
+        recorded = record_frames(a.calls, a.events_per_sec)
+    if a.save:
+        with open(a.save, "w", encoding="utf-8") as fp:
+            fp.write("\n".join(recorded) + "\n")
+    bench(recorded, a.reps)
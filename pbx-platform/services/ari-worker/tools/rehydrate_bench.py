@@ -0,0 +1,162 @@
+"""
+상태 복구(rehydrate) 소요 시간 측정
+
+fake ARI에 진행 중인 콜(caller/callee 채널 + 브릿지)을 미리 채워 두고,
+같은 콜의 미종료 calls 행을 돌려주는 recorder 대역으로 CallService.rehydrate()를 실행한다.
+ARI 조회는 실제 HTTP(AriClient -> fake ARI)로 하고, DB 조회는 메모리 목록으로 대신한다.
+
+    # 통화 중 2500콜(채널 5000개) + 끊긴 사이 종료된 콜 100 + 한쪽만 남은 콜 100
+    python -m tools.rehydrate_bench --calls 2500 --orphans 100 --half-dead 100
+
+    # 복구 도중 이벤트 처리 중인(스냅샷 이후) 울리는 콜 200개는 종료되지 않아야 한다
+    python -m tools.rehydrate_bench --calls 2500 --ringing 200
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import logging
+import statistics
+import time
+import uuid
+from typing import Any
+
+from pbx_common.models import Call
+
+from app.ari.client import AriClient
+from app.ari.parser import parse_event
+from app.services.call_service import CallService, bridge_id_for, callee_channel_id_for
+from tools.fake_ari import FakeAri
+from tools.replay import NullRecorder
+
+logger = logging.getLogger("rehydrate_bench")
+
+
+class OpenCallsRecorder(NullRecorder):
+    """load_open_calls가 미리 만든 calls 행 목록을 돌려주는 recorder 대역"""
+
+    def __init__(self, rows: list[Call]):
+        super().__init__()
+        self.rows = rows
+        self.closed = 0
+
+    async def load_open_calls(self, *args: Any, **kwargs: Any) -> list[Call]:
+        return list(self.rows)
+
+    async def close_orphans(self, call_ids: list[uuid.UUID], reason: str) -> int:
+        self.closed += len(call_ids)
+        return len(call_ids)
+
+
+def _populate(fake: FakeAri, calls: int, orphans: int, half_dead: int) -> list[Call]:
+    rows: list[Call] = []
+    for i in range(calls + orphans + half_dead):
+        caller = f"live-{i}"
+        callee = callee_channel_id_for(caller)
+        bridge = bridge_id_for(caller)
+        rows.append(Call(
+            id=uuid.uuid4(),
+            caller_exten="1000",
+            callee_exten="2000",
+            caller_channel_id=caller,
+            callee_channel_id=callee,
+            bridge_id=bridge,
+            status="up",
+        ))
+        if i >= calls + orphans:
+            # 한쪽 채널만 남은 콜 (callee hangup 유실)
+            fake._new_channel(caller, f"PJSIP/1000-{i:08x}", "2000", "Up")
+            continue
+        if i >= calls:
+            # 두 채널 모두 사라진 콜 (끊긴 사이 종료)
+            continue
+        fake._new_channel(caller, f"PJSIP/1000-{i:08x}", "2000", "Up")
+        fake._new_channel(callee, f"PJSIP/2000-{i:08x}", "2000", "Up")
+        fake.bridges[bridge] = {"id": bridge, "name": "", "bridge_type": "mixing", "channels": [caller, callee]}
+    return rows
+
+
+async def _start_ringing(service: CallService, n: int) -> None:
+    """스냅샷 이후 시작된 콜 흉내: caller StasisStart만 받은 상태 (callee 채널은 아직 없음)"""
+    for i in range(n):
+        raw = {
+            "type": "StasisStart",
+            "timestamp": "2024-05-01T10:00:00.000+0900",
+            "channel": {"id": f"ringing-{i}", "name": f"PJSIP/1000-r{i:07x}"},
+            "args": ["2000"],
+        }
+        await service.handle_event(parse_event(raw))
+
+
+async def bench(calls: int, orphans: int, half_dead: int, ringing: int, reps: int, port: int) -> None:
+    fake = FakeAri()
+    await fake.start("127.0.0.1", port)
+    rows = _populate(fake, calls, orphans, half_dead)
+    ari = AriClient(ari_base=f"http://127.0.0.1:{port}/ari", ari_app="pbx", api_key="x:x")
+    await ari.start()
+
+    times: list[float] = []
+    try:
+        for rep in range(reps):
+            recorder = OpenCallsRecorder(rows)
+            service = CallService(ari=ari, recorder=recorder)
+            # 스냅샷 직후에 시작되는 콜: list_channels 응답을 기다리는 동안 이벤트 처리
+            list_channels = ari.list_channels
+            racing = [0.0]
+
+            async def racing_list_channels():
+                result = await list_channels()
+                t = time.perf_counter()
+                await _start_ringing(service, ringing)
+                racing[0] = time.perf_counter() - t
+                return result
+
+            service.ari = _Proxy(ari, list_channels=racing_list_channels)
+
+            t0 = time.perf_counter()
+            result = await service.rehydrate()
+            # 끼워 넣은 콜 처리 시간은 복구 시간에서 뺀다
+            elapsed = time.perf_counter() - t0 - racing[0]
+            times.append(elapsed)
+            ringing_left = sum(1 for s in service.sessions.values() if s.caller_channel_id.startswith("ringing-"))
+            print(
+                f"rep {rep + 1}: {elapsed * 1000:.1f}ms  channels={result['channels']} bridges={result['bridges']} "
+                f"open_rows={result['open_rows']} restored={result['restored']} "
+                f"orphans_closed={result['orphans_closed']} terminated={result['terminated']} "
+                f"ringing_kept={ringing_left}/{ringing}"
+            )
+            # 다음 반복을 위해 half-dead 콜 정리로 지워진 채널을 되살린다
+            fake.channels.clear()
+            fake.bridges.clear()
+            _populate(fake, calls, orphans, half_dead)
+    finally:
+        await ari.close()
+        await fake.close()
+
+    if times:
+        print(f"\nrehydrate {calls} calls ({calls * 2} channels): "
+              f"median {statistics.median(times) * 1000:.1f}ms  max {max(times) * 1000:.1f}ms")
+
+
+class _Proxy:
+    """AriClient의 일부 메서드만 바꿔 끼운 대역"""
+
+    def __init__(self, target: Any, **overrides: Any):
+        self._target = target
+        self.__dict__.update(overrides)
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._target, name)
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.WARNING, format="%(asctime)s - %(levelname)s - %(message)s")
+    ap = argparse.ArgumentParser(description="Benchmark CallService.rehydrate against the fake ARI")
+    ap.add_argument("--calls", type=int, default=2500, help="통화 중인 콜 수 (채널은 2배)")
+    ap.add_argument("--orphans", type=int, default=100, help="두 채널 모두 사라진 미종료 행")
+    ap.add_argument("--half-dead", type=int, default=100, help="한쪽 채널만 남은 콜")
+    ap.add_argument("--ringing", type=int, default=0, help="복구 도중 시작되는 울리는 콜")
+    ap.add_argument("--reps", type=int, default=5)
+    ap.add_argument("--port", type=int, default=18088)
+    a = ap.parse_args()
+    asyncio.run(bench(a.calls, a.orphans, a.half_dead, a.ringing, a.reps, a.port))
@@ -0,0 +1,256 @@
+"""
+call_events 오프라인 재생 도구
+
+저장된 call_events.raw를 시간 순서대로 server-side cursor로 스트리밍하여
+parse_event -> CallService.handle_event 경로에 다시 흘려 넣는다.
+ARI 호출은 실제로 보내지 않고 기록만 하며(RecordingAri),
+DB 기록은 기본적으로 하지 않는다(NullRecorder). --target-url을 주면 해당 DB에 실제로 기록한다.
+
+    # 장애 구간을 실시간 10배속으로 재현
+    python -m tools.replay --from 2024-05-01T10:00:00+09:00 --to 2024-05-01T10:30:00+09:00 --speed 10
+
+    # 하루치를 최대 속도로 재생 (핸들러 벤치마크)
+    python -m tools.replay --from 2024-05-01T00:00:00+09:00 --to 2024-05-02T00:00:00+09:00 --speed 0
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import itertools
+import logging
+import os
+import time
+import uuid
+from collections import Counter
+from datetime import datetime
+from typing import Any, Optional
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from pbx_common.models import CallEvent
+
+from app.ari.parser import parse_event
+from app.services.call_recorder import CallRecorder
+from app.services.call_service import CallService
+from app.services.dispatcher import EventDispatcher
+from app.services.event_writer import EventWriter, created_at_floor
+
+logger = logging.getLogger("replay")
+
+
+class RecordingAri:
+    """AriClient 대역: 요청을 보내지 않고 호출 내역만 기록"""
+
+    def __init__(self, log_calls: bool = False):
+        self.calls: Counter[str] = Counter()
+        self._log = log_calls
+        self._ids = itertools.count(1)
+
+    def _record(self, op: str, **kwargs: Any) -> None:
+        self.calls[op] += 1
+        if self._log:
+            logger.info(f"ari.{op} {kwargs}")
+
+    async def originate(self, endpoint: str, app_args: str, caller_id: str = "ARI",
+                        timeout: int = 30, channel_id: Optional[str] = None) -> str:
+        self._record("originate", endpoint=endpoint, app_args=app_args, channel_id=channel_id)
+        return channel_id or f"replay-{next(self._ids)}"
+
+    async def list_channels(self) -> list[dict[str, Any]]:
+        self._record("list_channels")
+        return []
+
+    async def list_bridges(self) -> list[dict[str, Any]]:
+        self._record("list_bridges")
+        return []
+
+    async def create_bridge(self, name: str, bridge_type: str = "mixing", bridge_id: Optional[str] = None) -> str:
+        self._record("create_bridge", name=name, bridge_id=bridge_id)
+        return bridge_id or f"replay-bridge-{next(self._ids)}"
+
+    async def add_channels_to_bridge(self, bridge_id: str, channel_ids: list[str]) -> None:
+        self._record("add_channels_to_bridge", bridge_id=bridge_id, channels=channel_ids)
+
+    async def add_channel_to_bridge(self, bridge_id: str, channel_id: str) -> None:
+        await self.add_channels_to_bridge(bridge_id, [channel_id])
+
+    async def destroy_bridge(self, bridge_id: str) -> None:
+        self._record("destroy_bridge", bridge_id=bridge_id)
+
+    async def hangup_channel(self, channel_id: str) -> None:
+        self._record("hangup_channel", channel_id=channel_id)
+
+
+class NullRecorder:
+    """CallRecorder 대역: DB에 쓰지 않고 호출 횟수만 센다"""
+
+    def __init__(self):
+        self.calls: Counter[str] = Counter()
+
+    async def ensure_call_row(self, call_id: uuid.UUID, *args: Any, **kwargs: Any) -> None:
+        self.calls["ensure_call_row"] += 1
+
+    async def add_event(self, *args: Any, **kwargs: Any) -> None:
+        self.calls["add_event"] += 1
+
+    async def mark_failed(self, *args: Any, **kwargs: Any) -> None:
+        self.calls["mark_failed"] += 1
+
+    async def mark_ended(self, *args: Any, **kwargs: Any) -> None:
+        self.calls["mark_ended"] += 1
+
+    async def mark_bridged(self, *args: Any, **kwargs: Any) -> None:
+        self.calls["mark_bridged"] += 1
+
+    async def set_customer(self, *args: Any, **kwargs: Any) -> None:
+        self.calls["set_customer"] += 1
+
+    async def load_open_calls(self, *args: Any, **kwargs: Any) -> list:
+        return []
+
+    def adopt(self, call: Any, *args: Any, **kwargs: Any) -> None:
+        pass
+
+    async def close_orphans(self, call_ids: list[uuid.UUID], reason: str) -> int:
+        return 0
+
+    def stats(self) -> dict[str, Any]:
+        return dict(self.calls)
+
+
+class Pacer:
+    """이벤트 timestamp 간격을 speed 배속으로 재현 (speed <= 0 이면 대기 없음)"""
+
+    def __init__(self, speed: float):
+        self.speed = speed
+        self._origin: Optional[tuple[datetime, float]] = None
+
+    async def wait(self, ts: Optional[datetime]) -> None:
+        if self.speed <= 0 or ts is None:
+            return
+        if self._origin is None:
+            self._origin = (ts, time.monotonic())
+            return
+        ts0, wall0 = self._origin
+        delay = wall0 + (ts - ts0).total_seconds() / self.speed - time.monotonic()
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+
+async def replay(
+        source_url: str,
+        start: datetime,
+        end: datetime,
+        speed: float = 0.0,
+        shards: int = 1,
+        fetch_size: int = 1000,
+        target_url: Optional[str] = None,
+        log_ari: bool = False,
+) -> dict[str, Any]:
+    source = create_async_engine(source_url)
+
+    target = None
+    writer = None
+    if target_url:
+        target = create_async_engine(target_url)
+        SessionLocal = async_sessionmaker(bind=target, expire_on_commit=False)
+        writer = EventWriter(SessionLocal)
+        writer.start()
+        recorder: Any = CallRecorder(SessionLocal, event_writer=writer)
+    else:
+        recorder = NullRecorder()
+
+    ari = RecordingAri(log_calls=log_ari)
+    service = CallService(ari=ari, recorder=recorder)
+    dispatcher = EventDispatcher(service.handle_event, service.routing_key, shards=shards)
+    dispatcher.start()
+    pacer = Pacer(speed)
+    background = asyncio.all_tasks()
+
+    # 같은 ts 안에서는 적재 순서(id)를 유지
+    # created_at 하한: start 이전 달 파티션은 읽지 않는다
+    stmt = (
+        select(CallEvent.ts, CallEvent.raw)
+        .where(CallEvent.ts >= start, CallEvent.ts < end, CallEvent.created_at >= created_at_floor(start))
+        .order_by(CallEvent.ts, CallEvent.id)
+        .execution_options(yield_per=fetch_size)
+    )
+
+    events = 0
+    by_type: Counter[str] = Counter()
+    t0 = time.perf_counter()
+    try:
+        async with source.connect() as conn:
+            # yield_per -> server-side cursor로 fetch_size씩만 메모리에 올린다
+            result = await conn.stream(stmt)
+            async for ts, raw in result:
+                await pacer.wait(ts)
+                ev = parse_event(raw)
+                by_type[ev.etype or "unknown"] += 1
+                await dispatcher.dispatch(ev)
+                events += 1
+                if events % 50000 == 0:
+                    logger.info(f"replayed {events} events ({ts})")
+        await dispatcher.close()
+        # 핸들러가 띄운 후속 작업(브릿지 task 등)이 끝날 때까지 대기
+        spawned = asyncio.all_tasks() - background - {asyncio.current_task()}
+        await asyncio.gather(*spawned, return_exceptions=True)
+    finally:
+        if writer is not None:
+            await writer.close()
+        await source.dispose()
+        if target is not None:
+            await target.dispose()
+
+    elapsed = time.perf_counter() - t0
+    return {
+        "events": events,
+        "elapsed_sec": round(elapsed, 2),
+        "events_per_sec": round(events / elapsed, 1) if elapsed > 0 else None,
+        "by_type": dict(by_type.most_common()),
+        "dispatcher": dispatcher.stats(),
+        "service": service.stats(),
+        "ari_calls": dict(ari.calls),
+        "recorder": recorder.stats(),
+    }
+
+
+def _parse_dt(v: str) -> datetime:
+    return datetime.fromisoformat(v)
+
+
+async def _main(args: argparse.Namespace) -> None:
+    source_url = args.database_url or os.getenv("DATABASE_URL", "")
+    if not source_url:
+        raise SystemExit("Missing DATABASE_URL (or --database-url)")
+
+    report = await replay(
+        source_url,
+        args.start,
+        args.end,
+        speed=args.speed,
+        shards=args.shards,
+        fetch_size=args.fetch_size,
+        target_url=args.target_url or None,
+        log_ari=args.log_ari,
+    )
+    for k, v in report.items():
+        print(f"{k:<16} {v}")
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
+    ap = argparse.ArgumentParser(description="Replay stored call_events through CallService")
+    ap.add_argument("--from", dest="start", type=_parse_dt, required=True, help="시작 시각 (ISO 8601, 포함)")
+    ap.add_argument("--to", dest="end", type=_parse_dt, required=True, help="종료 시각 (ISO 8601, 미포함)")
+    ap.add_argument("--speed", type=float, default=0.0, help="실시간 배속 (0: 최대 속도)")
+    ap.add_argument("--shards", type=int, default=1, help="디스패처 샤드 수 (1: 완전 순차)")
+    ap.add_argument("--fetch-size", type=int, default=1000, help="cursor fetch 단위")
+    ap.add_argument("--database-url", default="", help="원본 DB (기본: DATABASE_URL)")
+    ap.add_argument("--target-url", default="", help="지정 시 재생 결과를 이 DB에 실제로 기록")
+    ap.add_argument("--log-ari", action="store_true", help="ARI 호출 내역을 로그로 출력")
+    try:
+        asyncio.run(_main(ap.parse_args()))
+    except KeyboardInterrupt:
+        pass
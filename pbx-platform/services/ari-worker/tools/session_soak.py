@@ -0,0 +1,151 @@
+"""
+콜 세션 저장소 soak 도구
+
+합성 콜(StasisStart caller/callee -> hangup)을 CallService에 직접 흘려 넣고,
+일부 콜은 hangup을 일부러 빠뜨려 SessionSweeper가 정리하는지,
+그 동안 세션 수/메모리가 일정하게 유지되는지 확인한다.
+ARI/DB는 replay 도구의 대역(RecordingAri, NullRecorder)을 사용한다.
+
+    # 100만 콜, 5%는 hangup 유실, 1초 TTL
+    python -m tools.session_soak --calls 1000000 --miss-ratio 0.05 --ttl 1
+
+    # tracemalloc으로 파이썬 힙 사용량까지 확인 (느림)
+    python -m tools.session_soak --calls 200000 --tracemalloc
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import logging
+import os
+import random
+import time
+import tracemalloc
+from typing import Any
+
+from app.ari.parser import parse_event
+from app.services.call_service import CallService, callee_channel_id_for
+from app.services.session_store import SessionSweeper
+from tools.replay import NullRecorder, RecordingAri
+
+logger = logging.getLogger("session_soak")
+
+
+def _rss_mb() -> float:
+    try:
+        with open("/proc/self/statm") as f:
+            pages = int(f.read().split()[1])
+        return pages * os.sysconf("SC_PAGE_SIZE") / (1024 * 1024)
+    except (OSError, ValueError):
+        import resource
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def _event(etype: str, channel_id: str, **extra: Any):
+    raw = {
+        "type": etype,
+        "timestamp": "2024-05-01T10:00:00.000+0900",
+        "application": "soak",
+        "channel": {"id": channel_id, "name": f"PJSIP/100-{channel_id}", "state": "Up"},
+        **extra,
+    }
+    return parse_event(raw)
+
+
+async def soak(
+        calls: int,
+        miss_ratio: float = 0.05,
+        ttl: float = 1.0,
+        sweep_every: int = 10000,
+        report_every: int = 100000,
+        seed: int = 1,
+        trace: bool = False,
+) -> list[dict[str, Any]]:
+    rng = random.Random(seed)
+    service = CallService(ari=RecordingAri(), recorder=NullRecorder())
+    # 살아 있는 채널이 없는 ARI -> 오래된 세션은 모두 정리 대상
+    sweeper = SessionSweeper(service.sessions, service.ari.list_channels, service.expire_session, ttl=ttl)
+
+    if trace:
+        tracemalloc.start()
+    background = asyncio.all_tasks()
+    reports: list[dict[str, Any]] = []
+    missed = 0
+    t0 = time.perf_counter()
+
+    for i in range(1, calls + 1):
+        caller = f"soak-{i}"
+        callee = callee_channel_id_for(caller)
+        await service.handle_event(_event("StasisStart", caller, args=["200"]))
+        await service.handle_event(_event("StasisStart", callee, args=["callee", "200"]))
+        await service.handle_event(_event("ChannelEnteredBridge", caller))
+
+        if rng.random() < miss_ratio:
+            missed += 1
+        else:
+            await service.handle_event(_event("ChannelHangupRequest", caller, cause=16, cause_txt="Normal Clearing"))
+
+        if i % sweep_every == 0:
+            # 브릿지 task를 마무리한 뒤 TTL이 지난 세션 정리
+            spawned = asyncio.all_tasks() - background - {asyncio.current_task()}
+            await asyncio.gather(*spawned, return_exceptions=True)
+            await asyncio.sleep(0)
+            await sweeper.sweep()
+
+        if i % report_every == 0 or i == calls:
+            st = service.sessions.stats()
+            r = {
+                "calls": i,
+                "missed_hangups": missed,
+                "sessions": st["calls"],
+                "channel_to_call": st["channel_to_call"],
+                "channel_to_bridge": st["channel_to_bridge"],
+                "evicted": sweeper.evicted,
+                "rss_mb": round(_rss_mb(), 1),
+                "calls_per_sec": round(i / (time.perf_counter() - t0)),
+            }
+            if trace:
+                r["heap_mb"] = round(tracemalloc.get_traced_memory()[0] / (1024 * 1024), 1)
+            reports.append(r)
+            logger.info(r)
+
+        # TTL 경과를 실제 시간으로 기다리지 않도록 sweep 직전 세션의 시계를 되돌린다
+        if i % sweep_every == sweep_every - 1:
+            for sess in service.sessions.values():
+                sess.last_event -= ttl
+
+    if trace:
+        tracemalloc.stop()
+    return reports
+
+
+async def _main(args: argparse.Namespace) -> None:
+    reports = await soak(
+        args.calls,
+        miss_ratio=args.miss_ratio,
+        ttl=args.ttl,
+        sweep_every=args.sweep_every,
+        report_every=args.report_every,
+        seed=args.seed,
+        trace=args.tracemalloc,
+    )
+    for r in reports:
+        print("  ".join(f"{k}={v}" for k, v in r.items()))
+    first, last = reports[0], reports[-1]
+    print(f"sessions {first['sessions']} -> {last['sessions']}  rss_mb {first['rss_mb']} -> {last['rss_mb']}  "
+          f"evicted {last['evicted']} / missed {last['missed_hangups']}")
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
+    # 콜마다 남는 서비스 INFO 로그(originate/bridge)는 측정을 왜곡하므로 끈다
+    logging.getLogger("app").setLevel(logging.WARNING)
+    ap = argparse.ArgumentParser(description="Soak the call session store with synthetic calls")
+    ap.add_argument("--calls", type=int, default=1_000_000)
+    ap.add_argument("--miss-ratio", type=float, default=0.05, help="hangup 이벤트를 빠뜨릴 콜 비율")
+    ap.add_argument("--ttl", type=float, default=1.0, help="세션 TTL (초)")
+    ap.add_argument("--sweep-every", type=int, default=10000, help="N콜마다 sweep")
+    ap.add_argument("--report-every", type=int, default=100000)
+    ap.add_argument("--seed", type=int, default=1)
+    ap.add_argument("--tracemalloc", action="store_true")
+    asyncio.run(_main(ap.parse_args()))
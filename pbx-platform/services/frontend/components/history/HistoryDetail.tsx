@@ -1,9 +1,15 @@
 "use client";
 
 import { PhoneOff } from "lucide-react";
-import { formatDateTime, calcDuration } from "@/lib/utils/date";
+import { formatDateTime, calcDuration, formatSeconds } from "@/lib/utils/date";
 import type { CallRecord } from "@/lib/api/calls";
 
+const HANGUP_PARTY_LABEL: Record<string, string> = {
+    caller: "발신자",
+    callee: "수신자",
+    system: "시스템",
+};
+
 interface HistoryDetailProps {
     selectedCall: CallRecord | null;
     directionLabel: (d: string) => string;
@@ -68,9 +74,27 @@ export default function HistoryDetail({
                         <div className="detail-meta-row">
                             <span className="detail-meta-label">통화시간</span>
                             <span className="detail-meta-value">
-                                {calcDuration(selectedCall.answered_at, selectedCall.ended_at)}
+                                {selectedCall.talk_ms != null
+                                    ? formatSeconds(Math.floor(selectedCall.talk_ms / 1000))
+                                    : calcDuration(selectedCall.answered_at, selectedCall.ended_at)}
                             </span>
                         </div>
+                        {selectedCall.ring_ms != null && (
+                            <div className="detail-meta-row">
+                                <span className="detail-meta-label">대기시간</span>
+                                <span className="detail-meta-value">
+                                    {formatSeconds(Math.floor(selectedCall.ring_ms / 1000))}
+                                </span>
+                            </div>
+                        )}
+                        {selectedCall.hangup_party && (
+                            <div className="detail-meta-row">
+                                <span className="detail-meta-label">종료 주체</span>
+                                <span className="detail-meta-value">
+                                    {HANGUP_PARTY_LABEL[selectedCall.hangup_party] ?? selectedCall.hangup_party}
+                                </span>
+                            </div>
+                        )}
                         {selectedCall.hangup_reason && (
                             <div className="detail-meta-row">
                                 <span className="detail-meta-label">종료 원인</span>
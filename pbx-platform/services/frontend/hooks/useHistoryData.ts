@@ -52,8 +52,8 @@ export function useHistoryData() {
             search: f.search || undefined,
         };
         try {
-            const data = await fetchCalls(token, callFilter);
-            setCalls(data);
+            const page = await fetchCalls(token, callFilter);
+            setCalls(page.items);
         } catch (e: unknown) {
             const msg = e instanceof Error ? e.message : "unknown";
             setError("데이터 로드 실패: " + msg);
@@ -1,6 +1,7 @@
 import apiClient from "./client";
 import { API_URL } from "@/lib/config";
 import { CallRecord } from "@/types/call";
+import type { Page } from "@/types/page";
 
 export type { CallRecord };
 
@@ -15,10 +16,12 @@ export interface CallFilter {
 export const fetchCalls = async (
     token: string,
     filter: CallFilter = {},
-    skip: number = 0,
+    cursor?: string | null,
     limit: number = 100
-): Promise<CallRecord[]> => {
-    const params: Record<string, string | number> = { skip, limit };
+): Promise<Page<CallRecord>> => {
+    const params: Record<string, string | number> = { limit };
+
+    if (cursor) params.cursor = cursor;
 
     if (filter.dateFrom) params.date_from = filter.dateFrom;
     if (filter.dateTo) params.date_to = filter.dateTo;
@@ -26,7 +29,7 @@ export const fetchCalls = async (
     if (filter.status) params.status = filter.status;
     if (filter.search) params.search = filter.search;
 
-    const response = await apiClient.get<CallRecord[]>(`${API_URL}/api/v1/calls/`, {
+    const response = await apiClient.get<Page<CallRecord>>(`${API_URL}/api/v1/calls`, {
         headers: { Authorization: `Bearer ${token}` },
         params,
     });
@@ -1,9 +1,10 @@
 import apiClient from "./client";
 import { API_URL } from "@/lib/config";
 import type { Consultation, ConsultCategory } from "@/types/consult";
+import type { Page } from "@/types/page";
 
 export interface ConsultFilter {
-    skip?: number;
+    cursor?: string;
     limit?: number;
     date_from?: string;
     date_to?: string;
@@ -30,16 +31,16 @@ export interface ConsultUpdate {
     ended_at?: string | null;
 }
 
-export const fetchConsultations = async(token: string, f: ConsultFilter = {}): Promise<Consultation[]> => {
+export const fetchConsultations = async(token: string, f: ConsultFilter = {}): Promise<Page<Consultation>> => {
     const params = new URLSearchParams();
-    if (f.skip !== undefined) params.set("skip", String(f.skip));
+    if (f.cursor) params.set("cursor", f.cursor);
     if (f.limit !== undefined) params.set("limit", String(f.limit));
     if (f.date_from) params.set("date_from", f.date_from);
     if (f.date_to) params.set("date_to", f.date_to);
     if (f.agent_id) params.set("agent_id", String(f.agent_id));
     if (f.company_id) params.set("company_id", String(f.company_id));
     if (f.status) params.set("status", f.status);
-    const res = await apiClient.get<Consultation[]>(`${API_URL}/api/v1/consults?${params}`, {
+    const res = await apiClient.get<Page<Consultation>>(`${API_URL}/api/v1/consults?${params}`, {
         headers: { Authorization: `Bearer ${token}` }
     });
     return res.data;
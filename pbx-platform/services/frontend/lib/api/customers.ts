@@ -1,6 +1,8 @@
+import axios from "axios";
 import apiClient from "./client";
 import { API_URL } from "@/lib/config";
 import type { Customer } from "@/types/customer";
+import type { Page } from "@/types/page";
 
 export interface CustomerCreate {
     name: string;
@@ -21,17 +23,24 @@ export interface CustomerUpdate {
 }
 
 export const fetchCustomers = async (token: string): Promise<Customer[]> => {
-    const res = await apiClient.get<Customer[]>(`${API_URL}/api/v1/customers`, {
+    const res = await apiClient.get<Page<Customer>>(`${API_URL}/api/v1/customers`, {
         headers: { Authorization: `Bearer ${token}` },
     });
-    return res.data;
+    return res.data.items;
 };
 
+// 정규화 번호로 고객 1건 조회 (표기가 달라도 같은 번호면 찾음, 없으면 null)
 export const fetchCustomerByPhone = async (token: string, phone: string): Promise<Customer | null> => {
-    const res = await apiClient.get<Customer[]>(`${API_URL}/api/v1/customers?search=${encodeURIComponent(phone)}`, {
-        headers: { Authorization: `Bearer ${token}` },
-    });
-    return res.data.find(c => c.phone === phone) ?? null;
+    try {
+        const res = await apiClient.get<Customer>(`${API_URL}/api/v1/customers/lookup`, {
+            params: { phone },
+            headers: { Authorization: `Bearer ${token}` },
+        });
+        return res.data;
+    } catch (error) {
+        if (axios.isAxiosError(error) && error.response?.status === 404) return null;
+        throw error;
+    }
 };
 
 export const createCustomer = async (token: string, data: CustomerCreate): Promise<Customer> => {
@@ -1,9 +1,10 @@
 import apiClient from "./client";
 import { API_URL } from "@/lib/config";
 import type { User, UserCreateRequest, UserUpdateRequest } from "@/types/user";
+import type { Page } from "@/types/page";
 
 /**
- * 사용자 목록 조회
+ * 사용자 목록 조회 (다음 페이지 커서를 따라 전체를 모은다)
  * @param token - JWT 토큰
  * @param companyId - 업체 ID (선택적, 시스템 관리자만 사용)
  */
@@ -16,11 +17,17 @@ export const fetchUsers = async (
         params.company_id = companyId;
     }
 
-    const response = await apiClient.get<User[]>(`${API_URL}/api/v1/users`, {
-        headers: { Authorization: `Bearer ${token}` },
-        params
-    });
-    return response.data;
+    const users: User[] = [];
+    let cursor: string | null = null;
+    do {
+        const response: { data: Page<User> } = await apiClient.get<Page<User>>(`${API_URL}/api/v1/users`, {
+            headers: { Authorization: `Bearer ${token}` },
+            params: cursor ? { ...params, cursor } : params
+        });
+        users.push(...response.data.items);
+        cursor = response.data.next_cursor;
+    } while (cursor);
+    return users;
 };
 
 /**
@@ -6,8 +6,12 @@ export interface CallRecord {
     ended_at: string | null;
     caller_exten: string | null;
     callee_exten: string | null;
+    customer_id: number | null;
     direction: string;
     status: string;
     hangup_reason: string | null;
     hangup_cause: number | null;
+    ring_ms: number | null;
+    talk_ms: number | null;
+    hangup_party: "caller" | "callee" | "system" | null;
 }
\ No newline at end of file
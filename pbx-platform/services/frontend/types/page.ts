@@ -0,0 +1,5 @@
+// 목록 API 공통 응답 (keyset 페이지네이션)
+export interface Page<T> {
+    items: T[];
+    next_cursor: string | null; // 다음 페이지 요청 시 cursor로 전달 (마지막 페이지면 null)
+}